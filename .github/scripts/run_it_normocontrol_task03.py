@@ -7,8 +7,10 @@ It:
 - Maps GitHub username -> student directory via `students/students.csv`.
 - Ensures the PR changes include the target file:
     `students/<Student>/task_03/Пояснительная_записка.docx`
-- Runs `scripts/standards_verification/check_it_docx.py` for that single file.
-- Collects generated markdown reports from `normocontrol_reports/`.
+- Checks that file in-process via `check_it_docx_api` from
+  `scripts/standards_verification/check_it_docx.py` (results are replayed from
+  `.normocontrol_cache/` when the .docx is unchanged; pass `--no-cache` to force
+  a full check) and saves each markdown report to `normocontrol_reports/`.
 - Writes a ready-to-post PR comment body to `.github/it_normocontrol_comment.md`.
 - Writes a machine-readable result to `.github/it_normocontrol_result.json`.
 
@@ -19,12 +21,12 @@ Exit codes:
 
 from __future__ import annotations
 
+import argparse
 import csv
 import json
 import os
-import re
-import subprocess
 import sys
+import traceback
 import urllib.request
 from dataclasses import dataclass
 from pathlib import Path
@@ -208,57 +210,45 @@ def _truncate_for_comment(text: str, limit: int) -> str:
     return truncated
 
 
-def _detect_new_report(before: set[Path], after: set[Path]) -> Path | None:
-    """Return the newest report file created between two snapshots."""
-
-    new_files = [p for p in after - before if p.is_file()]
-    if not new_files:
-        return None
-
-    return max(new_files, key=lambda p: p.stat().st_mtime)
+def _load_checker(root: Path):
+    """Import `check_it_docx` from the checkout (once per process)."""
 
+    checker_dir = str(root / "scripts" / "standards_verification")
+    if checker_dir not in sys.path:
+        sys.path.insert(0, checker_dir)
 
-def _run_checker(root: Path, docx_path: Path) -> CheckRun:
-    """Run the checker script for a given .docx file."""
-
-    checker = root / "scripts" / "standards_verification" / "check_it_docx.py"
-    reports_dir = root / "normocontrol_reports"
-    reports_dir.mkdir(parents=True, exist_ok=True)
+    import check_it_docx
 
-    before = set(reports_dir.glob("it_normocontrol_report_*.md"))
+    return check_it_docx
 
-    proc = subprocess.run(
-        [sys.executable, str(checker), str(docx_path)],
-        cwd=str(root),
-        text=True,
-        capture_output=True,
-    )
 
-    after = set(reports_dir.glob("it_normocontrol_report_*.md"))
-    report_path = _detect_new_report(before, after)
+def _run_checker(root: Path, docx_path: Path, use_cache: bool = True) -> CheckRun:
+    """Check a .docx file in-process and save its markdown report."""
 
-    report_text = ""
-    if report_path and report_path.exists():
-        report_text = _read_text(report_path)
+    checker = _load_checker(root)
+    reports_dir = root / "normocontrol_reports"
 
-    # Fallback: try to parse report path from stdout
-    if not report_text:
-        match = re.search(r"Report:\s*(.+?it_normocontrol_report_\d{8}_\d{6}\.md)", proc.stdout, flags=re.DOTALL)
-        if match:
-            guessed = Path(match.group(1).strip())
-            if not guessed.is_absolute():
-                guessed = (root / guessed).resolve()
-            if guessed.exists():
-                report_path = guessed
-                report_text = _read_text(guessed)
+    try:
+        result = checker.check_it_docx_api(docx_path, use_cache=use_cache)
+        report_path = result.write_markdown(reports_dir)
+    except Exception:  # noqa: BLE001 - reported in the PR comment instead of crashing the job
+        return CheckRun(
+            docx_path=docx_path,
+            exit_code=1,
+            report_path=None,
+            report_text="",
+            stdout="",
+            stderr=traceback.format_exc(),
+        )
 
+    summary = result.summary
     return CheckRun(
         docx_path=docx_path,
-        exit_code=int(proc.returncode),
+        exit_code=result.exit_code,
         report_path=report_path,
-        report_text=report_text,
-        stdout=proc.stdout,
-        stderr=proc.stderr,
+        report_text=result.markdown,
+        stdout=f"Issues: {summary['total_issues']} (errors={summary['errors']}, warnings={summary['warnings']})",
+        stderr="",
     )
 
 
@@ -373,9 +363,13 @@ def _load_pr_context(root: Path) -> tuple[str | None, str | None, list[str], str
     return author, allowed_dir, changed_files_norm, changed_files_error
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     """Entrypoint for GitHub Actions."""
 
+    parser = argparse.ArgumentParser(description="Run IT normocontrol for task_03 and prepare a PR comment")
+    parser.add_argument("--no-cache", action="store_true", help="Do not replay results from the result cache")
+    args = parser.parse_args(argv)
+
     root = _repo_root()
 
     author, allowed_dir, changed_files, changed_files_error = _load_pr_context(root)
@@ -443,7 +437,7 @@ def main() -> int:
         )
         return 1
 
-    runs.append(_run_checker(root, target))
+    runs.append(_run_checker(root, target, use_cache=not args.no_cache))
 
     comment_body, exit_code = _format_comment_with_warnings(runs, warnings)
 
@@ -1,12 +1,21 @@
 """CLI checker for IT normocontrol requirements (short checklist).
 
 This script is intended as a lightweight alternative to running pytest.
-It validates a single .docx file using the hybrid approach:
-- OOXML (ZIP + XML) for strict page setup and low-level formatting checks
-- python-docx for high-level structure checks
+It validates a single .docx file with OOXML (ZIP + XML, lxml) only:
+- page setup and low-level formatting are checked in one body pass
+- the same pass builds a `ParagraphTable` (texts, styles, outline levels)
+  that the structure, reference and caption checks read from
+
+The archive is opened once into a `DocumentModel`; every check reads the
+already parsed parts from it. python-docx is not imported.
 
 Default target: tests/ПЗ.docx
 
+Batch mode (`check_it_docx.py batch [PATH|DIR|GLOB ...]`) checks many
+documents in a process pool and writes one aggregate report.
+`check_it_docx.py compile-config` validates the checklist up front and
+writes the compiled config used by all later runs.
+
 Exit codes:
 - 0: no errors (warnings allowed)
 - 1: at least one error
@@ -14,14 +23,26 @@ Exit codes:
 
 from __future__ import annotations
 
+import argparse
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
 import re
+import signal
 import sys
-from dataclasses import dataclass
+import time
+from bisect import bisect_right
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
-from docx import Document
-
 
 @dataclass(frozen=True)
 class ItNormocontrolConfig:
@@ -46,13 +67,22 @@ class ItNormocontrolConfig:
     first_line_indent_cm: float
     line_spacing_expected: float
 
-    required_sections_in_order: list[str]
+    required_sections_in_order: tuple[str, ...]
+
+    # Limits of the abstract from "Реферат (500–800 знаков; 5–15 ключевых слов)";
+    # None when the checklist entry gives no limit.
+    abstract_chars_min: int | None = None
+    abstract_chars_max: int | None = None
+    abstract_keywords_min: int | None = None
+    abstract_keywords_max: int | None = None
 
 
-def _read_text_file(path: Path) -> str:
-    """Read a UTF-8 text file."""
+# Bump when ItNormocontrolConfig fields or their parsing change.
+CONFIG_SCHEMA_VERSION = 2
 
-    return path.read_text(encoding="utf-8")
+# "500–800 знаков", "5-15 ключевых слов" inside a checklist entry
+_ABSTRACT_CHARS_RE = re.compile(r"(\d+)\s*[–—-]\s*(\d+)\s*знак", re.IGNORECASE)
+_ABSTRACT_KEYWORDS_RE = re.compile(r"(\d+)\s*[–—-]\s*(\d+)\s*ключев", re.IGNORECASE)
 
 
 def _parse_float_ru(value: str) -> float:
@@ -61,14 +91,11 @@ def _parse_float_ru(value: str) -> float:
     return float(value.strip().replace(",", "."))
 
 
-def load_it_normocontrol_config(standards_md_path: Path) -> ItNormocontrolConfig:
-    """Load IT normocontrol requirements from the markdown checklist.
-
-    The repository contains multiple standards; for the IT profile we treat
-    `standars_control_it_short.md` as the single source of truth.
+def parse_it_normocontrol_config(text: str) -> ItNormocontrolConfig:
+    """Parse IT normocontrol requirements from the markdown checklist text.
 
     Args:
-        standards_md_path: Path to `standars_control_it_short.md`.
+        text: Contents of `standars_control_it_short.md`.
 
     Returns:
         Parsed configuration.
@@ -77,8 +104,6 @@ def load_it_normocontrol_config(standards_md_path: Path) -> ItNormocontrolConfig
         ValueError: If required values cannot be parsed.
     """
 
-    text = _read_text_file(standards_md_path)
-
     # 1) Margins
     # Example: "Поля (мм): левое 23, правое 10, верхнее 20, нижнее 15."
     margins_match = re.search(
@@ -155,6 +180,14 @@ def load_it_normocontrol_config(standards_md_path: Path) -> ItNormocontrolConfig
     if not required_sections_in_order:
         raise ValueError("Не удалось распарсить список разделов (порядок)")
 
+    # 6) Abstract limits, written as a remark of the structure entry
+    # Example: "3) Реферат (500–800 знаков; 5–15 ключевых слов)"
+    abstract_entry = next(
+        (title for title in required_sections_in_order if title.lower().startswith("реферат")), ""
+    )
+    chars_match = _ABSTRACT_CHARS_RE.search(abstract_entry)
+    keywords_match = _ABSTRACT_KEYWORDS_RE.search(abstract_entry)
+
     # Page size is implied by "Формат: A4".
     # Keep it explicit in config for checks.
     return ItNormocontrolConfig(
@@ -169,10 +202,151 @@ def load_it_normocontrol_config(standards_md_path: Path) -> ItNormocontrolConfig
         inline_objects_font_size_pt=inline_objects_font_size_pt,
         first_line_indent_cm=first_line_indent_cm,
         line_spacing_expected=line_spacing_expected,
-        required_sections_in_order=required_sections_in_order,
+        required_sections_in_order=tuple(required_sections_in_order),
+        abstract_chars_min=int(chars_match.group(1)) if chars_match else None,
+        abstract_chars_max=int(chars_match.group(2)) if chars_match else None,
+        abstract_keywords_min=int(keywords_match.group(1)) if keywords_match else None,
+        abstract_keywords_max=int(keywords_match.group(2)) if keywords_match else None,
     )
 
 
+def validate_it_normocontrol_config(config: ItNormocontrolConfig) -> list[str]:
+    """Check parsed values for plausibility.
+
+    Returns:
+        Human-readable problems (empty list if the config is usable).
+    """
+
+    problems: list[str] = []
+
+    for name in ("margins_left_mm", "margins_right_mm", "margins_top_mm", "margins_bottom_mm"):
+        value = getattr(config, name)
+        if not 0 < value < 100:
+            problems.append(f"{name}: ожидается 0–100 мм, получено {value}")
+
+    for name in ("main_font_size_pt", "inline_objects_font_size_pt"):
+        value = getattr(config, name)
+        if not 6 <= value <= 72:
+            problems.append(f"{name}: ожидается 6–72 pt, получено {value}")
+
+    if not config.main_font_name.strip():
+        problems.append("main_font_name: пустое имя шрифта")
+
+    if not 0 <= config.first_line_indent_cm <= 5:
+        problems.append(f"first_line_indent_cm: ожидается 0–5 см, получено {config.first_line_indent_cm}")
+
+    if not 0.5 <= config.line_spacing_expected <= 3:
+        problems.append(f"line_spacing_expected: ожидается 0.5–3, получено {config.line_spacing_expected}")
+
+    sections = config.required_sections_in_order
+    duplicates = sorted({title for title in sections if sections.count(title) > 1})
+    if duplicates:
+        problems.append(f"required_sections_in_order: повторяются {', '.join(duplicates)}")
+
+    for prefix in ("abstract_chars", "abstract_keywords"):
+        low, high = getattr(config, f"{prefix}_min"), getattr(config, f"{prefix}_max")
+        if low is not None and not 0 < low <= high:
+            problems.append(f"{prefix}_min/{prefix}_max: ожидается 0 < min ≤ max, получено {low}–{high}")
+
+    return problems
+
+
+def compiled_config_path(standards_md_path: Path) -> Path:
+    """Path of the compiled config artifact stored next to the checklist."""
+
+    return standards_md_path.with_name(f"{standards_md_path.stem}.compiled.json")
+
+
+def _config_to_json(config: ItNormocontrolConfig, source_sha256: str) -> str:
+    """Serialize a config into the compiled artifact format."""
+
+    payload = {
+        "schema_version": CONFIG_SCHEMA_VERSION,
+        "source_sha256": source_sha256,
+        "config": asdict(config),
+    }
+    return json.dumps(payload, ensure_ascii=False, indent=2) + "\n"
+
+
+def _config_from_json(text: str, source_sha256: str) -> ItNormocontrolConfig | None:
+    """Deserialize a compiled artifact; None if it is stale or malformed."""
+
+    try:
+        payload = json.loads(text)
+        if payload.get("schema_version") != CONFIG_SCHEMA_VERSION:
+            return None
+        if payload.get("source_sha256") != source_sha256:
+            return None
+        values = payload["config"]
+        kwargs = {field.name: values[field.name] for field in fields(ItNormocontrolConfig)}
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+    kwargs["required_sections_in_order"] = tuple(kwargs["required_sections_in_order"])
+    return ItNormocontrolConfig(**kwargs)
+
+
+def compile_it_normocontrol_config(standards_md_path: Path) -> ItNormocontrolConfig:
+    """Parse and validate the checklist, then write the compiled artifact.
+
+    Raises:
+        ValueError: If the checklist cannot be parsed or a value is implausible.
+    """
+
+    raw = standards_md_path.read_bytes()
+    config = parse_it_normocontrol_config(raw.decode("utf-8"))
+
+    problems = validate_it_normocontrol_config(config)
+    if problems:
+        raise ValueError("Некорректные значения в чек-листе: " + "; ".join(problems))
+
+    source_sha256 = hashlib.sha256(raw).hexdigest()
+    compiled_config_path(standards_md_path).write_text(_config_to_json(config, source_sha256), encoding="utf-8")
+    return config
+
+
+def load_it_normocontrol_config(standards_md_path: Path, use_compiled: bool = True) -> ItNormocontrolConfig:
+    """Load IT normocontrol requirements from the markdown checklist.
+
+    The repository contains multiple standards; for the IT profile we treat
+    `standars_control_it_short.md` as the single source of truth.
+
+    Loading never writes: a compiled JSON artifact next to the checklist
+    (see `compiled_config_path`, written by `compile-config`) is used only
+    while its recorded SHA-256 matches the markdown; without it, or after
+    the checklist was edited, the markdown is parsed.
+
+    Args:
+        standards_md_path: Path to `standars_control_it_short.md`.
+        use_compiled: Read the compiled artifact if it is up to date.
+
+    Returns:
+        Parsed configuration.
+
+    Raises:
+        ValueError: If required values cannot be parsed.
+    """
+
+    raw = standards_md_path.read_bytes()
+    source_sha256 = hashlib.sha256(raw).hexdigest()
+    artifact = compiled_config_path(standards_md_path)
+
+    if use_compiled and artifact.exists():
+        config = _config_from_json(artifact.read_text(encoding="utf-8"), source_sha256)
+        if config is not None:
+            return config
+
+    config = parse_it_normocontrol_config(raw.decode("utf-8"))
+    problems = validate_it_normocontrol_config(config)
+    if problems:
+        raise ValueError("Некорректные значения в чек-листе: " + "; ".join(problems))
+    return config
+
+
+# document.xml larger than this (uncompressed) is checked in streaming mode by default.
+STREAMING_THRESHOLD_BYTES = 16 * 1024 * 1024
+
+
 def _ensure_tests_helpers_on_syspath(repo_root: Path) -> None:
     """Ensure the repository root is on sys.path.
 
@@ -192,42 +366,108 @@ def _resolve_repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
-def _extract_all_text(doc: Document) -> str:
-    """Extract joined plain text from a Word document."""
+# Alternative headings accepted for a section (keys: lower-case base titles).
+SECTION_SYNONYMS: dict[str, tuple[str, ...]] = {
+    "оглавление": ("содержание",),
+    "приложения": ("приложение",),
+    "список использованных источников": (
+        "список использованной литературы",
+        "список литературы",
+        "список источников",
+        "библиографический список",
+    ),
+    "условные обозначения и сокращения": (
+        "перечень условных обозначений и сокращений",
+        "перечень сокращений и обозначений",
+        "обозначения и сокращения",
+        "перечень сокращений",
+        "список сокращений",
+        "сокращения",
+    ),
+}
+
+# Checklist sections that have no heading of their own in the document.
+SECTIONS_WITHOUT_HEADING = frozenset({"титульный лист", "основная часть"})
+
+_OPTIONAL_SECTION_MARK = "при необходимости"
+_SECTION_REMARK_RE = re.compile(r"\s*\([^)]*\)")
+# "1 ", "2.3. " before a heading title; after it only punctuation or an appendix letter.
+_HEADING_NUMBER_RE = re.compile(r"\s*(?:\d+(?:\.\d+)*\.?\s+)?")
+_HEADING_TAIL_RE = re.compile(r"[ .:]*(?:[a-zа-яё][ .:]*)?")
+
+
+def _section_base_title(title: str) -> str:
+    """Checklist entry without remarks: "Реферат (500–800 знаков; ...)" -> "Реферат"."""
+
+    return _SECTION_REMARK_RE.sub("", title).strip()
+
 
-    return "\n".join(p.text for p in doc.paragraphs)
+def _is_optional_section(title: str) -> bool:
+    return _OPTIONAL_SECTION_MARK in title.lower()
 
 
-def _find_section_positions(text: str, section_titles: list[str]) -> dict[str, int]:
-    """Find first occurrence positions of section titles in text.
+@lru_cache(maxsize=8)
+def _section_automaton(section_titles: tuple[str, ...]):
+    """Aho–Corasick automaton over all titles and synonyms (built once per profile)."""
+
+    from tests.helpers.text_search import AhoCorasick
+
+    patterns = []
+    for title in section_titles:
+        base = _section_base_title(title).lower()
+        for name in (base, *SECTION_SYNONYMS.get(base, ())):
+            patterns.append((name, title))
+    return AhoCorasick(patterns)
+
+
+def _find_section_positions(paragraphs, section_titles: list[str]) -> dict[str, int]:
+    """Find the heading paragraph of each section title.
+
+    All titles and synonyms are matched in one scan of the heading-like
+    paragraphs (`ParagraphTable.is_heading_like`), so the same words in the
+    table of contents or inside a sentence are not taken for the heading.
+    A heading matches when it is the title itself, optionally numbered
+    ("1 Введение") and followed by punctuation or a letter ("Приложение А").
 
     Returns:
-        A dict of title -> index in text (0-based). Missing titles are omitted.
+        A dict of title -> paragraph row (see `ParagraphTable`). Missing titles are omitted.
     """
 
-    lower_text = text.lower()
+    automaton = _section_automaton(tuple(section_titles))
     positions: dict[str, int] = {}
 
-    for title in section_titles:
-        index = lower_text.find(title.lower())
-        if index != -1:
-            positions[title] = index
+    for row in paragraphs.heading_rows():
+        text = paragraphs.lowered[row]
+        content_start = _HEADING_NUMBER_RE.match(text).end()
+        for start, end, title in automaton.iter_matches(text):
+            if start == content_start and title not in positions and _HEADING_TAIL_RE.fullmatch(text, end):
+                positions[title] = row
 
     return positions
 
 
-def _check_page_setup(doc_name: str, doc_xml, report, config: ItNormocontrolConfig) -> None:
-    """Check page size and margins using OOXML."""
+def _section_location(section, sections_total: int) -> str:
+    """Location prefix of a section ("" for a single-section document)."""
 
-    from tests.helpers.ooxml_utils import (
-        get_page_margins,
-        get_page_size,
-        mm_to_twips,
-        twips_to_mm,
+    if sections_total < 2:
+        return ""
+    orientation = "альбомная" if section.orientation == "landscape" else "книжная"
+    return (
+        f"Раздел {section.index + 1} из {sections_total} "
+        f"(абзацы {section.first_row + 1}–{section.last_row + 1}, {orientation}) → "
     )
 
-    margins = get_page_margins(doc_xml)
-    if not margins:
+
+def _check_page_setup(doc_name: str, sections, report, config: ItNormocontrolConfig) -> None:
+    """Check page size and margins of every section using OOXML.
+
+    `sections` is the `SectionInfo` list of the document (empty when it has
+    no section properties at all). Landscape sections (wide tables) are
+    judged as A4 turned sideways; their margins may stay as set or rotate
+    with the page.
+    """
+
+    if not sections:
         report.add_issue(
             doc_name,
             "page_setup",
@@ -237,6 +477,36 @@ def _check_page_setup(doc_name: str, doc_xml, report, config: ItNormocontrolConf
             actual="Поля отсутствуют",
             location="Разметка страницы → Поля",
         )
+        report.add_issue(
+            doc_name,
+            "page_setup",
+            "warning",
+            "Размер страницы не найден",
+            expected="A4 (210×297 мм)",
+            actual="не найден",
+        )
+        return
+
+    for section in sections:
+        _check_section_setup(doc_name, section, _section_location(section, len(sections)), report, config)
+
+
+def _check_section_setup(doc_name: str, section, prefix: str, report, config: ItNormocontrolConfig) -> None:
+    """Check page size and margins of one section."""
+
+    from tests.helpers.ooxml_utils import mm_to_twips, twips_to_mm
+
+    margins = section.margins
+    if not margins:
+        report.add_issue(
+            doc_name,
+            "page_setup",
+            "error",
+            "Поля страницы не найдены",
+            expected="Поля должны быть заданы",
+            actual="Поля отсутствуют",
+            location=prefix + "Разметка страницы → Поля",
+        )
     else:
         expected = {
             "left": config.margins_left_mm,
@@ -247,6 +517,23 @@ def _check_page_setup(doc_name: str, doc_xml, report, config: ItNormocontrolConf
         tolerance_mm = 1.5
         tolerance_twips = mm_to_twips(tolerance_mm)
 
+        if section.orientation == "landscape":
+            # Word rotates margins together with the page; accept either direction.
+            rotations = [
+                expected,
+                {"top": expected["left"], "right": expected["top"],
+                 "bottom": expected["right"], "left": expected["bottom"]},
+                {"top": expected["right"], "right": expected["bottom"],
+                 "bottom": expected["left"], "left": expected["top"]},
+            ]
+            for candidate in rotations[1:]:
+                if all(
+                    key in margins and abs(margins[key] - mm_to_twips(mm)) <= tolerance_twips
+                    for key, mm in candidate.items()
+                ):
+                    expected = candidate
+                    break
+
         for key, expected_mm in expected.items():
             if key not in margins:
                 report.add_issue(
@@ -256,7 +543,7 @@ def _check_page_setup(doc_name: str, doc_xml, report, config: ItNormocontrolConf
                     f"Поле '{key}' не задано",
                     expected=f"{expected_mm} мм",
                     actual="не задано",
-                    location="Разметка страницы → Поля",
+                    location=prefix + "Разметка страницы → Поля",
                 )
                 continue
 
@@ -272,10 +559,10 @@ def _check_page_setup(doc_name: str, doc_xml, report, config: ItNormocontrolConf
                     f"Некорректное поле '{key}'",
                     expected=f"{expected_mm} мм",
                     actual=f"{twips_to_mm(actual_twips):.1f} мм",
-                    location="Разметка страницы → Поля → Настраиваемые поля",
+                    location=prefix + "Разметка страницы → Поля → Настраиваемые поля",
                 )
 
-    page_size = get_page_size(doc_xml)
+    page_size = section.page_size
     if not page_size:
         report.add_issue(
             doc_name,
@@ -284,14 +571,18 @@ def _check_page_setup(doc_name: str, doc_xml, report, config: ItNormocontrolConf
             "Размер страницы не найден",
             expected="A4 (210×297 мм)",
             actual="не найден",
+            location=prefix.rstrip(" →"),
         )
     else:
         a4_width_twips = mm_to_twips(config.page_width_mm)
         a4_height_twips = mm_to_twips(config.page_height_mm)
         tolerance = mm_to_twips(5)
 
-        width_diff = abs(page_size["width"] - a4_width_twips)
-        height_diff = abs(page_size["height"] - a4_height_twips)
+        width, height = page_size["width"], page_size["height"]
+        if section.orientation == "landscape":
+            width, height = height, width
+        width_diff = abs(width - a4_width_twips)
+        height_diff = abs(height - a4_height_twips)
 
         if width_diff > tolerance or height_diff > tolerance:
             report.add_issue(
@@ -301,163 +592,407 @@ def _check_page_setup(doc_name: str, doc_xml, report, config: ItNormocontrolConf
                 "Размер страницы не соответствует A4",
                 expected="210×297 мм",
                 actual=f"{twips_to_mm(page_size['width']):.0f}×{twips_to_mm(page_size['height']):.0f} мм",
+                location=prefix.rstrip(" →"),
             )
 
 
-def _check_paragraph_formatting(doc_name: str, doc_xml, report, config: ItNormocontrolConfig) -> None:
-    """Check indentation and line spacing using OOXML (best-effort)."""
+# Styles of paragraphs that are not body text ("Heading1", "Caption", "TOC2", "Заголовок 1")
+_NON_BODY_STYLE_RE = re.compile(r"^(?:heading|title|subtitle|caption|toc|заголовок|название|оглавление)",
+                                re.IGNORECASE)
 
-    from tests.helpers.ooxml_utils import (
-        NS,
-        cm_to_twips,
-        get_paragraph_properties,
-        twips_to_cm,
-    )
 
-    paragraphs = doc_xml.xpath(".//w:p", namespaces=NS)
+class _ParagraphFormattingRule:
+    """Body rule: indentation and line spacing (best-effort).
 
-    # Indent: 12.5 mm (1.25 cm)
-    expected_indent = cm_to_twips(config.first_line_indent_cm)
-    tolerance = cm_to_twips(0.1)  # 1mm
+    Values are resolved through styles.xml (`StyleResolver`), so a paragraph
+    that takes its indent or spacing from its style is judged like one with
+    direct formatting. Only body text is judged: paragraphs in table cells,
+    headings (outline level or heading style), captions and TOC entries have
+    their own layout and are skipped.
 
-    invalid_indents: list[float] = []
-    for p in paragraphs:
-        props = get_paragraph_properties(p)
-        first_line_raw = props.get("ind", {}).get("firstLine")
-        if not first_line_raw:
-            continue
+    Paragraphs are fed one by one by `BodyWalker`, so the same logic serves
+    both the in-memory tree and the streaming (iterparse) pass.
+    """
 
-        try:
-            first_line = int(round(float(first_line_raw)))
-        except (TypeError, ValueError):
-            continue
+    def __init__(self, config: ItNormocontrolConfig, resolver) -> None:
+        from tests.helpers.ooxml_utils import cm_to_twips
 
-        if abs(first_line - expected_indent) > tolerance:
-            invalid_indents.append(twips_to_cm(first_line))
+        self.resolver = resolver
 
-    if invalid_indents:
-        examples = ", ".join(f"{cm:.2f} см" for cm in invalid_indents[:5])
-        report.add_issue(
-            doc_name,
-            "paragraphs",
-            "warning",
-            f"Найдены некорректные отступы первой строки ({len(invalid_indents)} шт.)",
-            expected=f"{config.first_line_indent_cm:.2f} см",
-            actual=examples,
-        )
+        # Indent: 12.5 mm (1.25 cm)
+        self.expected_indent = cm_to_twips(config.first_line_indent_cm)
+        self.tolerance = cm_to_twips(0.1)  # 1mm
 
-    # Line spacing: 1.0 usually corresponds to w:spacing line=240 with lineRule=auto
-    paragraphs_with_spacing = doc_xml.xpath(".//w:p[w:pPr/w:spacing]", namespaces=NS)
+        # (paragraph row, first line indent in cm)
+        self.invalid_indents: list[tuple[int, float]] = []
+        self.paragraphs_with_spacing = 0
+        self.invalid_spacing = 0
 
-    invalid_spacing = 0
-    for p in paragraphs_with_spacing:
-        props = get_paragraph_properties(p)
-        spacing = props.get("spacing")
-        if not spacing:
-            continue
+    def on_paragraph(self, p, ctx) -> None:
+        """Account a single w:p element (effective, style-inherited values)."""
 
-        line = spacing.get("line")
-        line_rule = spacing.get("lineRule")
-        if not line or line_rule != "auto":
-            continue
+        from tests.helpers.ooxml_utils import twips_to_cm
+
+        if ctx.in_table:
+            return
+        props = self.resolver.paragraph_properties(p)
+        style_id = props.get("style")
+        if (style_id and _NON_BODY_STYLE_RE.match(style_id)) or self.resolver.outline_level(p) is not None:
+            return
 
+        first_line_raw = props.get("ind", {}).get("firstLine")
+        if first_line_raw:
+            try:
+                first_line = int(round(float(first_line_raw)))
+            except (TypeError, ValueError):
+                first_line = None
+            if first_line is not None and abs(first_line - self.expected_indent) > self.tolerance:
+                self.invalid_indents.append((ctx.paragraph_index, twips_to_cm(first_line)))
+
+        # Line spacing: 1.0 usually corresponds to w:spacing line=240 with lineRule=auto.
+        # Only paragraphs with a proportional line spacing count.
+        spacing = props.get("spacing") or {}
+        if spacing.get("lineRule") != "auto":
+            return
         try:
-            line_val = int(line)
+            line_val = int(spacing.get("line"))
         except (TypeError, ValueError):
-            continue
+            return
+        self.paragraphs_with_spacing += 1
 
         # 240 = single, 360 = 1.5, 480 = double
         if not (220 <= line_val <= 260):
-            invalid_spacing += 1
+            self.invalid_spacing += 1
 
-    if paragraphs_with_spacing:
-        ratio = invalid_spacing / len(paragraphs_with_spacing)
-        if ratio > 0.8:
+    def add_issues(self, doc_name: str, report, config: ItNormocontrolConfig, locator) -> None:
+        """Report accumulated problems."""
+
+        if self.invalid_indents:
+            examples = ", ".join(f"{cm:.2f} см" for _, cm in self.invalid_indents[:5])
             report.add_issue(
                 doc_name,
                 "paragraphs",
                 "warning",
-                "Много параграфов с явно заданным некорректным интервалом",
-                expected="1.0 (одинарный)",
-                actual=f"{invalid_spacing} из {len(paragraphs_with_spacing)}",
+                f"Найдены некорректные отступы первой строки ({len(self.invalid_indents)} шт.)",
+                expected=f"{config.first_line_indent_cm:.2f} см",
+                actual=examples,
+                location=locator.describe_rows([row for row, _ in self.invalid_indents]),
             )
 
+        if self.paragraphs_with_spacing:
+            ratio = self.invalid_spacing / self.paragraphs_with_spacing
+            if ratio > 0.8:
+                report.add_issue(
+                    doc_name,
+                    "paragraphs",
+                    "warning",
+                    "Много параграфов с некорректным межстрочным интервалом",
+                    expected="1.0 (одинарный)",
+                    actual=f"{self.invalid_spacing} из {self.paragraphs_with_spacing}",
+                )
 
-def _check_fonts(doc_name: str, doc_xml, report, config: ItNormocontrolConfig) -> None:
-    """Check that explicit font settings use Times New Roman and sizes 14/12pt."""
-
-    from tests.helpers.ooxml_utils import (
-        NS,
-        get_run_properties,
-        pt_to_half_points,
-    )
-
-    runs = doc_xml.xpath(".//w:r", namespaces=NS)
-    fonts_used: set[str] = set()
-    sizes: list[int] = []
 
-    for run in runs[:250]:
-        props = get_run_properties(run)
+class _FontRule:
+    """Body rule: effective font names and sizes of runs.
 
-        r_fonts = props.get("rFonts")
-        if r_fonts:
-            for key in ("ascii", "hAnsi", "cs"):
-                font_name = r_fonts.get(key)
-                if font_name:
-                    fonts_used.add(font_name)
+    Fonts and sizes inherited from docDefaults, the paragraph/character style
+    chain and the theme count the same as direct formatting. Every run of the
+    document is accounted in one pass: text length is accumulated per
+    (font, size) pair in a Counter, so shares reflect how much text actually
+    uses each font rather than a prefix of the document.
 
-        if "sz" in props:
-            sizes.append(int(props["sz"]))
+    Runs inside tables are tagged with their table (`WalkContext.table_index`)
+    and judged separately: the body text against the main size, every table
+    against the table size, so 12 pt tables do not count as nonstandard body
+    text and 14 pt tables are reported on their own.
+    """
 
-    if fonts_used and config.main_font_name not in fonts_used:
-        report.add_issue(
-            doc_name,
-            "fonts",
-            "error",
-            "Times New Roman не найден среди явно заданных шрифтов",
-            expected=config.main_font_name,
-            actual=", ".join(sorted(fonts_used))[:200],
-        )
+    # Rows shown in the histogram issue.
+    histogram_rows = 8
+
+    def __init__(self, resolver) -> None:
+        from tests.helpers.ooxml_utils import W
+
+        self.resolver = resolver
+        self._t = W + "t"
+        # (font, size in half-points) -> characters of text
+        self.histogram: Counter[tuple[str | None, int | None]] = Counter()
+        # Characters of table text per size, and per table and size
+        self.table_sizes: Counter[int | None] = Counter()
+        self.sizes_by_table: dict[int, Counter[int | None]] = {}
+        # Table index -> paragraph row of its first text
+        self.table_rows: dict[int, int] = {}
+
+    def on_run(self, run, ctx) -> None:
+        """Account a single w:r element."""
+
+        length = 0
+        for t in run.iterchildren(self._t):
+            if t.text:
+                length += len(t.text)
+        if not length:
+            return
+
+        props = self.resolver.run_properties(run, ctx.paragraph)
+        r_fonts = props.get("rFonts", {})
+        font = r_fonts.get("hAnsi") or r_fonts.get("ascii") or r_fonts.get("cs")
+        size = props.get("sz")
+        self.histogram[font, size] += length
+        if ctx.tables:
+            self.table_sizes[size] += length
+            sizes = self.sizes_by_table.get(ctx.table_index)
+            if sizes is None:
+                sizes = self.sizes_by_table[ctx.table_index] = Counter()
+                self.table_rows[ctx.table_index] = ctx.paragraph_index
+            sizes[size] += length
+
+    def font_shares(self) -> Counter[str | None]:
+        """Characters of text per font name."""
+
+        fonts: Counter[str | None] = Counter()
+        for (font, _), length in self.histogram.items():
+            fonts[font] += length
+        return fonts
+
+    def body_sizes(self) -> Counter[int | None]:
+        """Characters of text outside tables per size."""
+
+        sizes: Counter[int | None] = Counter()
+        for (_, size), length in self.histogram.items():
+            sizes[size] += length
+        sizes.subtract(self.table_sizes)
+        return +sizes
+
+    def add_issues(self, doc_name: str, report, config: ItNormocontrolConfig, locator) -> None:
+        """Report accumulated problems and the (font, size) histogram."""
+
+        from tests.helpers.ooxml_utils import half_points_to_pt, pt_to_half_points
+
+        total = sum(self.histogram.values())
+        if not total:
+            return
+
+        fonts = self.font_shares()
+        known_fonts = [font for font in fonts if font]
+        if known_fonts and config.main_font_name not in fonts:
+            report.add_issue(
+                doc_name,
+                "fonts",
+                "error",
+                "Times New Roman не найден среди шрифтов текста",
+                expected=config.main_font_name,
+                actual=", ".join(sorted(known_fonts))[:200],
+            )
 
-    if sizes:
         size_main = pt_to_half_points(config.main_font_size_pt)
         size_table = pt_to_half_points(config.inline_objects_font_size_pt)
-
+        # Body text: main size, or the smaller one for captions and text on figures
         allowed = {size_main, size_table}
-        nonstandard = [s for s in sizes if s not in allowed]
-        ratio = len(nonstandard) / len(sizes)
+        sized = {size: length for size, length in self.body_sizes().items() if size is not None}
+        sized_total = sum(sized.values())
+        nonstandard = Counter({size: length for size, length in sized.items() if size not in allowed})
+        nonstandard_total = sum(nonstandard.values())
 
-        if ratio > 0.5:
+        if sized_total and nonstandard_total / sized_total > 0.5:
+            examples = ", ".join(f"{half_points_to_pt(size):g}pt" for size, _ in nonstandard.most_common(5))
             report.add_issue(
                 doc_name,
                 "fonts",
                 "warning",
-                "Много runs с нестандартным явно заданным размером шрифта",
+                "Много текста с нестандартным размером шрифта",
                 expected=(
                     f"{int(config.main_font_size_pt)}pt (основной) или "
-                    f"{int(config.inline_objects_font_size_pt)}pt (таблицы/подписи/рисунки)"
+                    f"{int(config.inline_objects_font_size_pt)}pt (подписи/рисунки)"
                 ),
-                actual=f"{len(nonstandard)} из {len(sizes)} (пример: {nonstandard[:5]})",
+                actual=f"{nonstandard_total} из {sized_total} символов вне таблиц (пример: {examples})",
+            )
+
+        # Tables: judged by the size of most of their text
+        wrong_tables = []
+        for table_index, sizes in self.sizes_by_table.items():
+            known = [(size, length) for size, length in sizes.most_common() if size is not None]
+            if known and known[0][0] != size_table:
+                wrong_tables.append((table_index, known[0][0]))
+        if wrong_tables:
+            examples = ", ".join(
+                f"таблица {table_index + 1}: {half_points_to_pt(size):g}pt" for table_index, size in wrong_tables[:5]
             )
+            report.add_issue(
+                doc_name,
+                "tables",
+                "warning",
+                f"Кегль текста в таблицах не {config.inline_objects_font_size_pt:g} pt ({len(wrong_tables)} шт.)",
+                expected=f"{config.inline_objects_font_size_pt:g}pt внутри таблиц",
+                actual=examples,
+                location=locator.describe_rows([self.table_rows[table_index] for table_index, _ in wrong_tables]),
+            )
+
+        rows = []
+        for (font, size), length in self.histogram.most_common(self.histogram_rows):
+            size_text = f"{half_points_to_pt(size):g}pt" if size is not None else "?pt"
+            rows.append(f"{font or '?'} {size_text} — {length / total:.1%}")
+        rest = len(self.histogram) - len(rows)
+        if rest > 0:
+            rows.append(f"ещё {rest}")
+        report.add_issue(
+            doc_name,
+            "fonts",
+            "info",
+            f"Распределение шрифтов по объёму текста ({total} символов)",
+            actual="; ".join(rows),
+        )
+
 
+@dataclass(frozen=True)
+class _BodyIndex:
+    """What the single body walk collected, shared by the later checks."""
+
+    # Paragraph table (`locator.table`) with section/paragraph locations
+    locator: object
+    # `SectionInfo` of every w:sectPr
+    sections: list
+    # Every field (`tests.helpers.fields.Field`) in document order
+    fields: list
+    # Names of all bookmarks
+    bookmarks: frozenset
+    # Figures and tables with their captions and first mentions
+    objects: object
+    # `TableInfo` of every top-level table (head cells, size)
+    tables: list
+    # Display formulas with their numbers and explanations
+    formulas: object
+    # Pages of Word's last layout (`tests.helpers.toc.RenderedPageCollector`)
+    pages: object
+    # Sorted rows that start a page (page breaks, pageBreakBefore, section breaks)
+    page_starts: list
+
+
+def _check_body(
+    doc_name: str,
+    model,
+    report,
+    config: ItNormocontrolConfig,
+    stream: bool = False,
+) -> _BodyIndex:
+    """Run all body rules in a single traversal of document.xml.
 
-def _check_page_numbering(docx_path: Path, doc_name: str, report) -> None:
-    """Check presence of PAGE field in any header XML (best-effort, no render)."""
+    Args:
+        stream: Walk a constant-memory iterparse stream instead of the
+            in-memory tree.
 
-    import zipfile
+    Returns:
+        The indexes built during the walk, read by the remaining checks.
+    """
 
-    has_page_field = False
+    from tests.helpers.appendices import PageBreakCollector
+    from tests.helpers.fields import FieldCollector
+    from tests.helpers.formulas import FormulaCollector, build_formula_index
+    from tests.helpers.locations import ParagraphLocator
+    from tests.helpers.numbering import NumberingResolver
+    from tests.helpers.objects import ObjectAnchorCollector, build_object_index
+    from tests.helpers.ooxml_utils import get_body_elements, iter_body_elements
+    from tests.helpers.paragraphs import ParagraphTableBuilder
+    from tests.helpers.rules import BodyWalker
+    from tests.helpers.sections import SectionIndexBuilder
+    from tests.helpers.styles import StyleResolver
+    from tests.helpers.tables import TableIndexBuilder
+    from tests.helpers.toc import RenderedPageCollector
+
+    resolver = StyleResolver.from_model(model)
+    section_rule = SectionIndexBuilder()
+    paragraph_rule = _ParagraphFormattingRule(config, resolver)
+    font_rule = _FontRule(resolver)
+    table_builder = ParagraphTableBuilder(resolver, NumberingResolver.from_model(model))
+    field_rule = FieldCollector()
+    anchor_rule = ObjectAnchorCollector()
+    table_rule = TableIndexBuilder()
+    formula_rule = FormulaCollector(resolver)
+    page_rule = RenderedPageCollector()
+    break_rule = PageBreakCollector(resolver)
+    rules: list = [
+        section_rule, paragraph_rule, font_rule, table_builder, field_rule, anchor_rule, table_rule, formula_rule,
+        page_rule, break_rule,
+    ]
+
+    body_elements = iter_body_elements(model) if stream else get_body_elements(model)
+    BodyWalker(rules).walk(body_elements)
+
+    locator = ParagraphLocator(table_builder.table)
+    _check_page_setup(doc_name, section_rule.sections, report, config)
+    paragraph_rule.add_issues(doc_name, report, config, locator)
+    font_rule.add_issues(doc_name, report, config, locator)
+    return _BodyIndex(
+        locator=locator,
+        sections=section_rule.sections,
+        fields=field_rule.fields,
+        bookmarks=frozenset(field_rule.bookmarks),
+        objects=build_object_index(table_builder.table, anchor_rule),
+        tables=table_rule.tables,
+        formulas=build_formula_index(table_builder.table, formula_rule, anchor_rule.table_rows),
+        pages=page_rule,
+        page_starts=break_rule.page_starts(section_rule.sections),
+    )
 
-    with zipfile.ZipFile(docx_path, "r") as archive:
-        header_files = [name for name in archive.namelist() if name.startswith("word/header") and name.endswith(".xml")]
-        for header in header_files:
-            content = archive.read(header)
-            # A robust XML parse is possible, but this heuristic is enough for a quick check.
-            # PAGE field usually appears as instrText containing 'PAGE'.
-            if b"PAGE" in content.upper():
-                has_page_field = True
-                break
 
+def _used_parts(model, sections, kind: str) -> list[str]:
+    """Header or footer parts referenced by the sections (all of them if none is)."""
+
+    names = model.header_names if kind == "header" else model.footer_names
+    referenced: list[str] = []
+    for section in sections:
+        refs = section.header_refs if kind == "header" else section.footer_refs
+        for rel_id in refs.values():
+            target = model.relationship_target(rel_id)
+            if target in names and target not in referenced:
+                referenced.append(target)
+    return referenced or names
+
+
+_ALIGNMENT_NAMES = {
+    "left": "по левому краю",
+    "start": "по левому краю",
+    "center": "по центру",
+    "right": "по правому краю",
+    "end": "по правому краю",
+    "both": "по ширине",
+}
+
+
+def _field_alignment(paragraph, field, resolver) -> str:
+    """Horizontal position of a field inside its paragraph (jc value).
+
+    A field moved by tabs takes the alignment of the tab stop it lands on;
+    a right-aligned w:ptab puts it at the right margin.
+    """
+
+    from tests.helpers.ooxml_utils import W
+
+    props = resolver.paragraph_properties(paragraph)
+    jc = props.get("jc") or "left"
+    before = field.preceding_text
+    if before.strip(" \t") or "\t" not in before:
+        return jc
+    if any(ptab.get(W + "alignment") == "right" for ptab in paragraph.iter(W + "ptab")):
+        return "right"
+    stops = props.get("tabs", ())
+    tab_count = before.count("\t")
+    if tab_count <= len(stops):
+        return stops[tab_count - 1][1] or jc
+    return jc
+
+
+def _check_page_numbering(doc_name: str, model, report, sections=()) -> None:
+    """Check the PAGE field: present in a header and right-aligned (no render).
+
+    Fields are parsed properly (w:fldSimple and w:fldChar sequences), so
+    "PAGES", NUMPAGES or the word "Page" in header text do not count.
+    """
+
+    from tests.helpers.fields import collect_fields
+    from tests.helpers.ooxml_utils import W
+    from tests.helpers.styles import StyleResolver
+
+    header_files = _used_parts(model, sections, "header")
     if not header_files:
         report.add_issue(
             doc_name,
@@ -467,21 +1002,148 @@ def _check_page_numbering(docx_path: Path, doc_name: str, report) -> None:
         )
         return
 
-    if not has_page_field:
+    resolver = StyleResolver.from_model(model)
+    misplaced: list[tuple[str, str]] = []
+    for header in header_files:
+        header_xml = model.part(header)
+        if header_xml is None:
+            continue
+        page_fields = [field for field in collect_fields(header_xml) if field.name == "PAGE"]
+        if not page_fields:
+            continue
+        paragraphs = list(header_xml.iter(W + "p"))
+        for field in page_fields:
+            alignment = _field_alignment(paragraphs[field.paragraph_index], field, resolver)
+            if alignment in ("right", "end"):
+                return
+            misplaced.append((header, alignment))
+
+    if misplaced:
+        header, alignment = misplaced[0]
         report.add_issue(
             doc_name,
             "pagination",
             "warning",
-            "Не найдено поле PAGE в колонтитулах (не удалось подтвердить нумерацию страниц)",
+            "Номер страницы не выровнен по правому краю",
             expected="Поле PAGE в правом верхнем углу",
-            actual="PAGE не найден",
+            actual=_ALIGNMENT_NAMES.get(alignment, alignment),
+            location=header,
+        )
+        return
+
+    in_footer = any(
+        field.name == "PAGE"
+        for footer in _used_parts(model, sections, "footer")
+        if model.part(footer) is not None
+        for field in collect_fields(model.part(footer))
+    )
+    report.add_issue(
+        doc_name,
+        "pagination",
+        "warning",
+        "Не найдено поле PAGE в колонтитулах (не удалось подтвердить нумерацию страниц)",
+        expected="Поле PAGE в правом верхнем углу",
+        actual="PAGE только в нижнем колонтитуле" if in_footer else "PAGE не найден",
+    )
+
+
+_CAPTION_NUMBER_RE = re.compile(r"^(рисунок|таблица)\s+\d")
+# Report category by the first letters of a SEQ identifier
+_SEQ_CATEGORIES = {"рис": "figures", "таб": "tables"}
+# Fields whose first argument names a bookmark
+_BOOKMARK_FIELDS = {"REF", "PAGEREF", "NOTEREF"}
+
+
+def _check_fields(doc_name: str, index: _BodyIndex, report) -> None:
+    """Check SEQ numbering of captions and REF cross-references."""
+
+    from tests.helpers.fields import is_broken_reference
+
+    locator = index.locator
+    paragraphs = locator.table
+
+    # SEQ: numbers of each identifier go 1, 2, 3... (restarts allowed with \s / \r)
+    last_number: dict[str, int] = {}
+    broken_sequences: list[tuple[str, int, int, int]] = []
+    seq_rows: set[int] = set()
+    for field in index.fields:
+        if field.name != "SEQ" or not field.argument:
+            continue
+        seq_rows.add(field.paragraph_index)
+        identifier = field.argument
+        result = field.result.strip()
+        if not result.isdigit():
+            continue
+        number = int(result)
+        previous = last_number.get(identifier.lower(), 0)
+        switches = field.switches
+        expected_ok = (
+            number == previous + 1
+            or "\\r" in switches  # explicit reset
+            or ("\\s" in switches and number == 1)  # restart at each heading
+            or ("\\c" in switches and number == previous)  # repeat the last number
+        )
+        if not expected_ok:
+            broken_sequences.append((identifier, previous, number, field.paragraph_index))
+        last_number[identifier.lower()] = number
+
+    for identifier, previous, number, row in broken_sequences:
+        report.add_issue(
+            doc_name,
+            _SEQ_CATEGORIES.get(identifier.lower()[:3], "fields"),
+            "warning",
+            f"Нарушена нумерация поля SEQ «{identifier}»",
+            expected=f"{previous + 1}",
+            actual=f"{number}",
+            location=locator.describe(row),
+        )
+
+    manual = [
+        row for row in paragraphs.body_rows()
+        if _CAPTION_NUMBER_RE.match(paragraphs.lowered[row].lstrip()) and row not in seq_rows
+    ]
+    if manual and seq_rows:
+        report.add_issue(
+            doc_name,
+            "fields",
+            "info",
+            "Часть подписей пронумерована вручную, без поля SEQ",
+            expected="Номера рисунков и таблиц — поля SEQ (Вставка названия)",
+            actual=f"подписей без SEQ: {len(manual)}",
+            location=locator.describe_rows(manual),
         )
 
+    # REF/PAGEREF: the bookmark exists and Word did not cache an error text
+    broken_refs = [
+        field for field in index.fields
+        if field.name in _BOOKMARK_FIELDS
+        and ((field.argument and field.argument not in index.bookmarks) or is_broken_reference(field))
+    ]
+    if broken_refs:
+        report.add_issue(
+            doc_name,
+            "fields",
+            "error",
+            "Перекрёстные ссылки указывают на несуществующие закладки",
+            expected="REF/PAGEREF на существующие рисунки, таблицы, разделы",
+            actual=", ".join(field.argument or field.instruction for field in broken_refs[:5]),
+            location=locator.describe_rows([field.paragraph_index for field in broken_refs]),
+        )
+
+
+_FIGURE_CAPTION_RE = re.compile(r"^рисунок\s+\d+(?:\.\d+)?\s*[—–-]\s+.+$")
+_TABLE_CAPTION_RE = re.compile(r"^таблица\s+\d+(?:\.\d+)?\s*[—–-]\s+.+$")
+
+
+def _check_structure(doc_name: str, locator, report) -> dict[str, int]:
+    """Check required sections and their order by their headings.
 
-def _check_structure(doc_name: str, doc: Document, report) -> None:
-    """Check required sections and their order using plain text search.
+    The exact list/order is sourced from the IT checklist markdown. Sections
+    without a heading of their own (title page, main part) are not located;
+    sections marked "при необходимости" may be absent.
 
-    The exact list/order is sourced from the IT checklist markdown.
+    Returns:
+        Heading row of every section found (checklist title -> row).
     """
 
     required_in_order = list(getattr(report, "_required_sections_in_order", []))
@@ -497,127 +1159,658 @@ def _check_structure(doc_name: str, doc: Document, report) -> None:
             "Приложения",
         ]
 
-    text = _extract_all_text(doc)
-    positions = _find_section_positions(text, required_in_order)
+    paragraphs = locator.table
+    searchable = [
+        title for title in required_in_order
+        if _section_base_title(title).lower() not in SECTIONS_WITHOUT_HEADING
+    ]
+    positions = _find_section_positions(paragraphs, searchable)
 
-    missing = [title for title in required_in_order if title not in positions]
+    missing = [title for title in searchable if title not in positions and not _is_optional_section(title)]
     if missing:
+        body_rows = paragraphs.body_rows()
+        details = []
+        for title in missing:
+            name = _section_base_title(title)
+            row = paragraphs.find(name, body_rows)
+            if row is None:
+                details.append(name)
+            else:
+                details.append(f"{name} (есть в тексте: {locator.describe(row)}, но не оформлен как заголовок)")
         report.add_issue(
             doc_name,
             "structure",
             "error",
             "Не найдены обязательные разделы",
-            expected=", ".join(required_in_order),
-            actual=", ".join(missing),
+            expected=", ".join(_section_base_title(title) for title in searchable),
+            actual="; ".join(details),
         )
-        return
+        return positions
 
-    ordered_titles = sorted(positions.items(), key=lambda item: item[1])
-    ordered_names = [name for name, _ in ordered_titles]
-    if ordered_names != required_in_order:
+    expected_order = [title for title in searchable if title in positions]
+    ordered_titles = sorted(positions, key=positions.__getitem__)
+    if ordered_titles != expected_order:
         report.add_issue(
             doc_name,
             "structure",
             "warning",
             "Порядок разделов отличается от рекомендуемого",
-            expected=" → ".join(required_in_order),
-            actual=" → ".join(ordered_names),
+            expected=" → ".join(_section_base_title(title) for title in expected_order),
+            actual=" → ".join(
+                f"{_section_base_title(title)} (абз. {positions[title] + 1})" for title in ordered_titles
+            ),
         )
+    return positions
 
 
-def _check_references(doc_name: str, doc: Document, report) -> None:
-    """Check that bracketed references exist and sources section looks numbered."""
+def _section_body_rows(locator, start: int | None) -> range:
+    """Rows after a section heading up to the next heading (empty if `start` is None)."""
 
-    text = _extract_all_text(doc)
+    if start is None:
+        return range(0)
+    headings = locator.heading_rows
+    position = bisect_right(headings, start)
+    end = headings[position] if position < len(headings) else len(locator.table)
+    return range(start + 1, end)
+
+
+# "Ключевые слова: ..." or a line of keywords typed in capitals (ГОСТ 7.32)
+_KEYWORDS_LABEL_RE = re.compile(r"^\s*ключевые\s+слова\s*[:.–—-]?\s*", re.IGNORECASE)
+_KEYWORD_SPLIT_RE = re.compile(r"\s*[,;]\s*")
+
+
+def _abstract_keywords(text: str) -> list[str] | None:
+    """Keywords of an abstract paragraph, or None if it is not the keyword line."""
+
+    label = _KEYWORDS_LABEL_RE.match(text)
+    if label:
+        text = text[label.end():]
+    elif "," not in text or text != text.upper() or not any(char.isalpha() for char in text):
+        return None
+    return [word for word in _KEYWORD_SPLIT_RE.split(text.strip().rstrip(".")) if word]
 
-    citations = re.findall(r"\[(\d+)\]", text)
-    if not citations:
-        report.add_issue(
-            doc_name,
-            "references",
-            "warning",
-            "Не найдены ссылки вида [N] в тексте",
-            expected="Ссылки в квадратных скобках (например: [8])",
-            actual="не найдено",
-        )
-        return
 
-    max_citation = max(int(n) for n in citations)
+def _check_abstract(doc_name: str, locator, report, config: ItNormocontrolConfig,
+                    positions: dict[str, int]) -> None:
+    """Check the abstract size and its keyword count against the checklist limits.
 
-    # Heuristic: find the sources section and count numbered lines after it.
-    lower_lines = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
-    sources_index = None
-    for i, line in enumerate(lower_lines):
-        if line.lower() == "список использованных источников":
-            sources_index = i
-            break
+    The abstract is the rows between its heading (found by `_check_structure`)
+    and the next heading; characters are counted with spaces, without the
+    heading and the keyword line.
+    """
+
+    title = next((title for title in positions if _section_base_title(title).lower() == "реферат"), None)
+    if title is None:
+        return
 
-    if sources_index is None:
+    paragraphs = locator.table
+    start = positions[title]
+    characters = 0
+    keywords: list[str] | None = None
+    keywords_row = start
+    for row in _section_body_rows(locator, start):
+        text = paragraphs.texts[row].strip()
+        if not text:
+            continue
+        found = _abstract_keywords(text) if keywords is None else None
+        if found is not None:
+            keywords, keywords_row = found, row
+        else:
+            characters += len(text)
+
+    low, high = config.abstract_chars_min, config.abstract_chars_max
+    if low is not None and not low <= characters <= high:
         report.add_issue(
             doc_name,
-            "references",
-            "error",
-            "Есть ссылки [N], но не найден раздел 'Список использованных источников'",
-            expected="Раздел со списком источников",
-            actual="не найден",
+            "abstract",
+            "warning",
+            "Объём реферата не соответствует требованиям",
+            expected=f"{low}–{high} знаков с пробелами",
+            actual=f"{characters} знаков",
+            location=locator.describe(start),
         )
-        return
-
-    sources_lines = lower_lines[sources_index + 1 : sources_index + 80]
-    numbered = [line for line in sources_lines if re.match(r"^\d+\s+", line)]
 
-    if not numbered:
+    low, high = config.abstract_keywords_min, config.abstract_keywords_max
+    if low is None:
+        return
+    if keywords is None:
         report.add_issue(
             doc_name,
-            "references",
+            "abstract",
             "warning",
-            "В разделе источников не найдены строки, начинающиеся с номера",
-            expected="Нумерация арабскими цифрами без точки (например: 1 ...)",
-            actual="не найдено",
+            "В реферате не найдены ключевые слова",
+            expected=f"Строка из {low}–{high} ключевых слов через запятую",
+            actual="нет",
+            location=locator.describe(start),
         )
-        return
-
-    if max_citation > len(numbered):
+    elif not low <= len(keywords) <= high:
         report.add_issue(
             doc_name,
-            "references",
+            "abstract",
             "warning",
-            "Максимальный номер ссылки больше числа найденных источников",
-            expected=f"Источников ≥ {max_citation}",
-            actual=f"Найдено источников (эвристика): {len(numbered)}",
+            "Число ключевых слов реферата не соответствует требованиям",
+            expected=f"{low}–{high} ключевых слов",
+            actual=f"{len(keywords)}: {_format_examples(keywords, separator=', ', limit=_LINT_EXAMPLES)}",
+            location=locator.describe(keywords_row),
         )
 
 
-def _check_captions(doc_name: str, doc: Document, report) -> None:
-    """Check basic caption formats for figures and tables (best-effort)."""
+_TOC_TITLES = frozenset({"оглавление", "содержание"})
 
-    figure_re = re.compile(r"^рисунок\s+\d+(?:\.\d+)?\s*[—–-]\s+.+$", re.IGNORECASE)
-    table_re = re.compile(r"^таблица\s+\d+(?:\.\d+)?\s*[—–-]\s+.+$", re.IGNORECASE)
 
-    bad_figures = 0
-    bad_tables = 0
+def _heading_title(paragraphs, row: int) -> str:
+    return " ".join(paragraphs.texts[row].split())
 
-    for p in doc.paragraphs:
-        line = p.text.strip()
-        if not line:
-            continue
 
-        if line.lower().startswith("рисунок"):
-            if not figure_re.match(line) or line.endswith("."):
-                bad_figures += 1
+def _toc_rows(index: _BodyIndex, positions: dict[str, int]):
+    """Rows of the table of contents, its TOC field and its heading row.
 
-        if line.lower().startswith("таблица"):
-            if not table_re.match(line) or line.endswith("."):
-                bad_tables += 1
+    The rows are the TOC field result or, without a field, the paragraphs of
+    the "Оглавление" section (empty if there is neither).
+    """
 
-    if bad_figures:
+    toc_heading = next(
+        (row for title, row in positions.items() if _section_base_title(title).lower() in _TOC_TITLES), None
+    )
+    field = next((field for field in index.fields if field.name == "TOC" and field.end_paragraph_index >= 0), None)
+    if field is not None:
+        return range(field.paragraph_index, field.end_paragraph_index + 1), field, toc_heading
+    return _section_body_rows(index.locator, toc_heading), None, toc_heading
+
+
+def _check_toc(doc_name: str, index: _BodyIndex, report, positions: dict[str, int]) -> None:
+    """Check the table of contents against the headings of the document.
+
+    Entries are the TOC field result or, without a field, the paragraphs of
+    the "Оглавление" section; they are matched with the headings through
+    dicts (see `tests.helpers.toc`). Page numbers are compared with the
+    pages of Word's last layout when the document carries them.
+    """
+
+    from tests.helpers.toc import compare_toc, parse_toc_entry, split_number, toc_levels
+
+    locator = index.locator
+    paragraphs = locator.table
+    toc_rows, field, toc_heading = _toc_rows(index, positions)
+    if field is None and toc_heading is None:
+        return
+
+    entries = []
+    for row in toc_rows:
+        entry = parse_toc_entry(row, paragraphs.texts[row])
+        if entry is not None:
+            entries.append(entry)
+    if not entries:
         report.add_issue(
             doc_name,
-            "figures",
+            "toc",
+            "error",
+            "Оглавление пустое",
+            expected="Строки оглавления с названиями разделов и номерами страниц",
+            actual="строк нет" if field is None else f"результат поля: «{field.result.strip()[:60]}»",
+            location=locator.describe(toc_rows.start if toc_rows else toc_heading),
+        )
+        return
+
+    levels = toc_levels(field.tokens) if field is not None else max(entry.level for entry in entries) + 1
+    toc_end = toc_rows[-1]
+    known_rows = set(positions.values())
+    heading_rows = [row for row in locator.heading_rows if row not in toc_rows and row != toc_heading]
+    expected_rows = []
+    for row in heading_rows:
+        if row <= toc_end:
+            continue
+        number, _ = split_number(paragraphs.texts[row], paragraphs.labels[row])
+        outline_level = paragraphs.outline_levels[row]
+        if (outline_level is None and number is None and row not in known_rows
+                and not paragraphs.lowered[row].startswith("приложение ")):
+            continue  # short bold line, not necessarily a heading
+        level = outline_level if outline_level is not None else (number.count(".") if number else 0)
+        if level < levels:
+            expected_rows.append(row)
+
+    comparison = compare_toc(paragraphs, entries, heading_rows, expected_rows)
+
+    if comparison.extra:
+        report.add_issue(
+            doc_name,
+            "toc",
+            "error",
+            "В оглавлении есть строки без соответствующего заголовка",
+            expected="Названия разделов как в заголовках документа",
+            actual=_format_examples([f"«{entry.title}»" for entry in comparison.extra]),
+            location=locator.describe_rows([entry.row for entry in comparison.extra]),
+        )
+    if comparison.renamed:
+        report.add_issue(
+            doc_name,
+            "toc",
+            "error",
+            "Названия в оглавлении отличаются от заголовков",
+            expected="Названия разделов как в заголовках документа",
+            actual=_format_examples(
+                [f"«{entry.title}» → «{_heading_title(paragraphs, row)}»" for entry, row in comparison.renamed]
+            ),
+            location=locator.describe_rows([row for _, row in comparison.renamed]),
+        )
+    if comparison.missing:
+        report.add_issue(
+            doc_name,
+            "toc",
+            "error",
+            "Заголовки отсутствуют в оглавлении",
+            expected=f"Все заголовки до {levels}-го уровня включительно",
+            actual=_format_examples([f"«{_heading_title(paragraphs, row)}»" for row in comparison.missing]),
+            location=locator.describe_rows(comparison.missing),
+        )
+
+    # Page numbers: only with Word's layout marks and one page numbering for the whole document
+    sections = index.sections
+    if not index.pages.available or any(section.page_number_start for section in sections[1:]):
+        return
+    first_page = sections[0].page_number_start if sections and sections[0].page_number_start else 1
+    wrong_pages = []
+    for entry, row in comparison.matched:
+        page = index.pages.page_of(row) + first_page - 1
+        if entry.page is not None and entry.page != page:
+            wrong_pages.append((entry, page))
+    if wrong_pages:
+        report.add_issue(
+            doc_name,
+            "toc",
+            "warning",
+            "Номера страниц в оглавлении не совпадают с расположением заголовков",
+            expected="Обновлённое поле оглавления",
+            actual=_format_examples(
+                [f"«{entry.title}»: {entry.page} вместо {page}" for entry, page in wrong_pages]
+            ),
+            location=locator.describe_rows([entry.row for entry, _ in wrong_pages]),
+        )
+
+
+def _text_start_row(positions: dict[str, int], page_starts: list[int]) -> int:
+    """First row of the text proper.
+
+    The abstract or introduction heading, whichever comes first; without
+    them the first page after the title page.
+    """
+
+    rows = [
+        row for title, row in positions.items()
+        if _section_base_title(title).lower() in ("реферат", "введение")
+    ]
+    if rows:
+        return min(rows)
+    return next((row for row in page_starts if row > 0), 0)
+
+
+def _check_appendices(doc_name: str, index: _BodyIndex, report, positions: dict[str, int]) -> None:
+    """Check appendix letters, new-page starts and the order of first references.
+
+    Appendix headings and references come from one pass over the paragraph
+    table (see `tests.helpers.appendices`); the checks are per appendix.
+    """
+
+    from tests.helpers.appendices import build_appendix_index
+
+    locator = index.locator
+    toc_rows, _, _ = _toc_rows(index, positions)
+    appendices = build_appendix_index(
+        locator.table, index.page_starts, toc_rows, _text_start_row(positions, index.page_starts)
+    )
+    if not appendices.appendices and not appendices.first_references:
+        return
+
+    wrong_letters = appendices.letter_errors()
+    if wrong_letters:
+        report.add_issue(
+            doc_name,
+            "appendices",
+            "error",
+            "Нарушена последовательность обозначений приложений",
+            expected="А, Б, В, … (без Ё, З, Й, О, Ч, Ь, Ы, Ъ)",
+            actual=_format_examples(
+                [f"«{appendix.letter}» вместо «{letter}»" for appendix, letter in wrong_letters]
+            ),
+            location=locator.describe_rows([appendix.row for appendix, _ in wrong_letters]),
+        )
+
+    not_on_new_page = [appendix for appendix in appendices.appendices if not appendix.new_page]
+    if not_on_new_page:
+        report.add_issue(
+            doc_name,
+            "appendices",
+            "error",
+            "Приложение начинается не с новой страницы",
+            expected="Разрыв страницы (или раздела) перед «ПРИЛОЖЕНИЕ X»",
+            actual=", ".join(appendix.letter for appendix in not_on_new_page),
+            location=locator.describe_rows([appendix.row for appendix in not_on_new_page]),
+        )
+
+    lower_case = [appendix for appendix in appendices.appendices if not appendix.upper_case]
+    if lower_case:
+        report.add_issue(
+            doc_name,
+            "appendices",
+            "warning",
+            "Слово «ПРИЛОЖЕНИЕ» в заголовке приложения не прописными буквами",
+            expected="ПРИЛОЖЕНИЕ А",
+            actual=_format_examples([_heading_title(locator.table, appendix.row) for appendix in lower_case]),
+            location=locator.describe_rows([appendix.row for appendix in lower_case]),
+        )
+
+    unreferenced = appendices.unreferenced()
+    if unreferenced:
+        report.add_issue(
+            doc_name,
+            "appendices",
+            "warning",
+            "На приложения нет ссылок в тексте",
+            expected="Ссылка в тексте на каждое приложение («приложение А»)",
+            actual=", ".join(appendix.letter for appendix in unreferenced),
+            location=locator.describe_rows([appendix.row for appendix in unreferenced]),
+        )
+
+    dangling = appendices.dangling()
+    if dangling:
+        report.add_issue(
+            doc_name,
+            "appendices",
+            "error",
+            "Ссылки на несуществующие приложения",
+            expected=", ".join(appendix.letter for appendix in appendices.appendices) or "нет приложений",
+            actual=", ".join(letter for letter, _ in dangling),
+            location=locator.describe_rows([row for _, row in dangling]),
+        )
+
+    by_reference, in_document = appendices.reference_order()
+    if by_reference != in_document:
+        report.add_issue(
+            doc_name,
+            "appendices",
+            "warning",
+            "Приложения расположены не в порядке первых ссылок на них",
+            expected=" → ".join(by_reference),
+            actual=" → ".join(in_document),
+            location=locator.describe_rows(
+                [appendix.row for appendix in appendices.appendices if appendix.letter in by_reference]
+            ),
+        )
+
+
+_SOURCES_TITLE = "Список использованных источников"
+
+
+def _sources_section_rows(locator) -> tuple[int | None, int | None]:
+    """Rows of the source list heading and of the first heading after it."""
+
+    paragraphs = locator.table
+    start = _find_section_positions(paragraphs, [_SOURCES_TITLE]).get(_SOURCES_TITLE)
+    if start is None:
+        # Not formatted as a heading: accept a body paragraph with the exact title.
+        for row in paragraphs.body_rows():
+            if paragraphs.lowered[row].strip() == _SOURCES_TITLE.lower():
+                start = row
+                break
+    if start is None:
+        return None, None
+    position = bisect_right(locator.heading_rows, start)
+    end = locator.heading_rows[position] if position < len(locator.heading_rows) else None
+    return start, end
+
+
+def _format_numbers(numbers: list[int], limit: int = 10) -> str:
+    """"[3], [7], [12]" with a count of the rest."""
+
+    text = ", ".join(f"[{number}]" for number in numbers[:limit])
+    if len(numbers) > limit:
+        text += f" (и ещё {len(numbers) - limit})"
+    return text
+
+
+def _format_examples(items: list[str], separator: str = "; ", limit: int = 10) -> str:
+    """First `limit` items joined, with a count of the rest."""
+
+    text = separator.join(items[:limit])
+    if len(items) > limit:
+        text += f" (и ещё {len(items) - limit})"
+    return text
+
+
+# Sections that are never numbered (checklist section 3)
+_UNNUMBERED_SECTIONS = ("Введение", "Заключение", _SOURCES_TITLE, "Приложения")
+
+
+def _expected_heading_numbers(previous: list[int] | None) -> list[list[int]]:
+    """Numbers that may follow `previous`: next sibling at any level or first child."""
+
+    if previous is None:
+        return [[1]]
+    candidates = [[*previous, 1]]
+    for depth in range(len(previous), 0, -1):
+        candidates.append([*previous[: depth - 1], previous[depth - 1] + 1])
+    return candidates
+
+
+def _check_headings(doc_name: str, locator, report) -> None:
+    """Check heading numbering (1 → 1.1 → 1.1.1), bold and trailing dots.
+
+    Numbers come from the list labels computed during the body walk
+    (`ParagraphTable.labels`) or from the heading text, so auto-numbered
+    and typed headings are judged alike.
+    """
+
+    from tests.helpers.numbering import numbered_headings
+
+    paragraphs = locator.table
+    rows = locator.heading_rows
+    numbers = numbered_headings(paragraphs, rows)
+
+    sequence_errors: list[tuple[int, str, str]] = []
+    previous: list[int] | None = None
+    for row, number in numbers.items():
+        parts = [int(part) for part in number.number.split(".")]
+        candidates = _expected_heading_numbers(previous)
+        if parts not in candidates:
+            expected = " или ".join(".".join(map(str, candidate)) for candidate in candidates)
+            sequence_errors.append((row, expected, number.number))
+        previous = parts
+
+    if sequence_errors:
+        row, expected, actual = sequence_errors[0]
+        report.add_issue(
+            doc_name,
+            "headings",
+            "warning",
+            f"Нарушена нумерация заголовков ({len(sequence_errors)} шт.)",
+            expected=f"1 → 1.1 → 1.1.1; после предыдущего: {expected}",
+            actual=actual,
+            location=locator.describe_rows([row for row, _, _ in sequence_errors]),
+        )
+
+    not_bold = [
+        row for row in rows
+        if not paragraphs.bold[row]
+        and (paragraphs.outline_levels[row] is not None or row in numbers)
+    ]
+    if not_bold:
+        report.add_issue(
+            doc_name,
+            "headings",
+            "warning",
+            "Заголовки не выделены полужирным",
+            expected="Полужирный шрифт",
+            actual=f"заголовков: {len(not_bold)}",
+            location=locator.describe_rows(not_bold),
+        )
+
+    trailing_dot = [
+        row for row in rows
+        if paragraphs.texts[row].rstrip().endswith(".") and not paragraphs.texts[row].rstrip().endswith("..")
+    ]
+    if trailing_dot:
+        report.add_issue(
+            doc_name,
+            "headings",
+            "warning",
+            "Точка в конце заголовка",
+            expected="Заголовок без точки в конце",
+            actual=f"заголовков: {len(trailing_dot)}",
+            location=locator.describe_rows(trailing_dot),
+        )
+
+    dotted_numbers = [row for row, number in numbers.items() if number.trailing_dot]
+    if dotted_numbers:
+        report.add_issue(
+            doc_name,
+            "headings",
+            "warning",
+            "Точка после номера заголовка",
+            expected="1 Название, 1.1 Название",
+            actual=f"заголовков: {len(dotted_numbers)}",
+            location=locator.describe_rows(dotted_numbers),
+        )
+
+    positions = _find_section_positions(paragraphs, list(_UNNUMBERED_SECTIONS))
+    numbered_sections = [(title, row) for title, row in positions.items() if row in numbers]
+    if numbered_sections:
+        report.add_issue(
+            doc_name,
+            "headings",
+            "warning",
+            "Разделы, которые не нумеруются, имеют номер",
+            expected="«Введение», «Заключение», «Список использованных источников», «Приложения» — без номера",
+            actual=", ".join(
+                f"{numbers[row].number} {_section_base_title(title)}" for title, row in numbered_sections
+            ),
+            location=locator.describe_rows([row for _, row in numbered_sections]),
+        )
+
+
+def _check_references(doc_name: str, locator, report) -> None:
+    """Check citations [N] against the source list (one pass, see `citations`).
+
+    Every cited source must be listed, every listed source cited, and
+    sources must be numbered in order of their first mention.
+    """
+
+    from tests.helpers.citations import build_citation_index
+
+    sources_start, sources_end = _sources_section_rows(locator)
+    index = build_citation_index(locator.table, sources_start, sources_end)
+
+    if not index.mentions:
+        report.add_issue(
+            doc_name,
+            "references",
+            "warning",
+            "Не найдены ссылки вида [N] в тексте",
+            expected="Ссылки в квадратных скобках (например: [8], [1, 3], [2–5])",
+            actual="не найдено",
+        )
+        return
+
+    if sources_start is None:
+        report.add_issue(
+            doc_name,
+            "references",
+            "error",
+            "Есть ссылки [N], но не найден раздел 'Список использованных источников'",
+            expected="Раздел со списком источников",
+            actual="не найден",
+        )
+        return
+
+    if not index.sources:
+        report.add_issue(
+            doc_name,
+            "references",
+            "warning",
+            "В разделе источников не найдены пронумерованные записи",
+            expected="Нумерация арабскими цифрами без точки (например: 1 ...) или нумерованный список",
+            actual="не найдено",
+            location=locator.describe(sources_start),
+        )
+        return
+
+    dangling = index.dangling()
+    if dangling:
+        report.add_issue(
+            doc_name,
+            "references",
+            "error",
+            "Ссылки на источники, которых нет в списке",
+            expected=f"Источники с номерами до {max(index.sources)}",
+            actual=_format_numbers([number for number, _ in dangling]),
+            location=locator.describe_rows([row for _, row in dangling]),
+        )
+
+    unused = index.unused()
+    if unused:
+        report.add_issue(
+            doc_name,
+            "references",
+            "warning",
+            "В списке есть источники без ссылок в тексте",
+            expected="На каждый источник есть ссылка",
+            actual=_format_numbers([number for number, _ in unused]),
+            location=locator.describe_rows([row for _, row in unused]),
+        )
+
+    out_of_order = index.out_of_order()
+    if out_of_order:
+        number, expected_number, row = out_of_order[0]
+        report.add_issue(
+            doc_name,
+            "references",
+            "warning",
+            "Источники пронумерованы не в порядке первых ссылок",
+            expected=f"Следующая новая ссылка — [{expected_number}]",
+            actual=f"впервые упомянут [{number}] (нарушений: {len(out_of_order)})",
+            location=locator.describe_rows([row for _, _, row in out_of_order]),
+        )
+
+    if index.dotted_entries:
+        report.add_issue(
+            doc_name,
+            "references",
+            "warning",
+            "Номера источников записаны с точкой или скобкой",
+            expected="Нумерация арабскими цифрами без точки (например: 1 ...)",
+            actual=f"записей: {len(index.dotted_entries)}",
+            location=locator.describe_rows(index.dotted_entries),
+        )
+
+
+def _check_captions(doc_name: str, locator, report) -> None:
+    """Check basic caption formats for figures and tables (best-effort).
+
+    Captions are read from the revised text, which keeps SEQ numbers stored
+    in w:fldSimple.
+    """
+
+    paragraphs = locator.table
+    bad_figures: list[int] = []
+    bad_tables: list[int] = []
+
+    for row in paragraphs.body_rows():
+        lowered = paragraphs.revised_lowered[row].strip()
+        if lowered.startswith("рисунок"):
+            if not _FIGURE_CAPTION_RE.match(lowered) or lowered.endswith("."):
+                bad_figures.append(row)
+        elif lowered.startswith("таблица"):
+            if not _TABLE_CAPTION_RE.match(lowered) or lowered.endswith("."):
+                bad_tables.append(row)
+
+    if bad_figures:
+        report.add_issue(
+            doc_name,
+            "figures",
             "warning",
             "Найдены подписи рисунков с нарушением формата",
             expected="Рисунок N – Название (без точки в конце)",
-            actual=f"проблемных подписей: {bad_figures}",
+            actual=f"проблемных подписей: {len(bad_figures)}",
+            location=locator.describe_rows(bad_figures),
         )
 
     if bad_tables:
@@ -627,68 +1820,936 @@ def _check_captions(doc_name: str, doc: Document, report) -> None:
             "warning",
             "Найдены названия таблиц с нарушением формата",
             expected="Таблица N – Название (без точки в конце)",
-            actual=f"проблемных названий: {bad_tables}",
+            actual=f"проблемных названий: {len(bad_tables)}",
+            location=locator.describe_rows(bad_tables),
         )
 
 
-def check_it_docx(docx_path: Path, report_dir: Path) -> int:
-    """Run IT short checklist checks and write a markdown report.
+# kind -> (report category, "рисунок"/"таблица" forms for messages)
+_OBJECT_WORDS = {
+    "figure": ("figures", "Рисунок", "рисунков", "рисунки"),
+    "table": ("tables", "Таблица", "таблиц", "таблицы"),
+}
+
+
+def _check_objects(doc_name: str, index: _BodyIndex, report) -> None:
+    """Check that figures and tables are mentioned, placed after the mention and numbered in order."""
+
+    locator = index.locator
+    objects = index.objects
+
+    for kind, (category, word, genitive, plural) in _OBJECT_WORDS.items():
+        unreferenced = objects.unreferenced(kind)
+        if unreferenced:
+            report.add_issue(
+                doc_name,
+                category,
+                "warning",
+                f"Нет ссылок в тексте на {plural}",
+                expected=f"На каждый объект «{word} N» есть ссылка в тексте",
+                actual=", ".join(obj.number for obj in unreferenced[:10]),
+                location=locator.describe_rows([obj.caption_row for obj in unreferenced]),
+            )
+
+        early = objects.before_first_mention(kind)
+        if early:
+            report.add_issue(
+                doc_name,
+                category,
+                "warning",
+                f"{plural.capitalize()} расположены до первого упоминания в тексте",
+                expected="Объект — сразу после первой ссылки на него",
+                actual=", ".join(
+                    f"{obj.number} (ссылка: {locator.describe(obj.first_mention)})" for obj in early[:3]
+                ),
+                location=locator.describe_rows([obj.object_row for obj in early]),
+            )
+
+        duplicates = objects.duplicates(kind)
+        if duplicates:
+            report.add_issue(
+                doc_name,
+                category,
+                "error",
+                f"Повторяющиеся номера {genitive}",
+                expected="Каждый номер используется один раз",
+                actual=", ".join(obj.number for obj in duplicates[:10]),
+                location=locator.describe_rows([obj.caption_row for obj in duplicates]),
+            )
+
+        gaps = objects.gaps(kind)
+        if gaps:
+            report.add_issue(
+                doc_name,
+                category,
+                "warning",
+                f"Нарушена последовательность номеров {genitive}",
+                expected=", ".join(expected for expected, _ in gaps[:5]),
+                actual=", ".join(obj.number for _, obj in gaps[:5]),
+                location=locator.describe_rows([obj.caption_row for _, obj in gaps]),
+            )
+
+    orphans = objects.orphan_continuations()
+    if orphans:
+        report.add_issue(
+            doc_name,
+            "tables",
+            "warning",
+            "«Продолжение таблицы N» без таблицы N выше",
+            expected="Продолжение ранее начатой таблицы",
+            actual=", ".join(number for number, _ in orphans[:10]),
+            location=locator.describe_rows([row for _, row in orphans]),
+        )
+
+
+# Header cell of a "№ п/п" column: "№", "№ п/п", "№ пп", "№ п.п."
+_ROW_NUMBER_HEADER_RE = re.compile(r"^№\s*(?:п\s*[/.]?\s*п\.?)?$", re.IGNORECASE)
+
+
+def _check_tables(doc_name: str, index: _BodyIndex, report) -> None:
+    """Check table heads: no "№ п/п" column, capitalised column headings, numbered continuations.
+
+    Cell texts come from the per-table cell index built in the body walk
+    (`tests.helpers.tables`), so no table is read twice.
+    """
+
+    from tests.helpers.objects import CAPTION_DISTANCE
+
+    locator = index.locator
+    paragraphs = locator.table
+
+    row_number_columns: list[int] = []
+    lowercase_headings: list[int] = []
+    for info in index.tables:
+        if not info.head:
+            continue
+        for cell, text in zip(info.head[0], info.cell_texts(paragraphs, 0)):
+            if not cell:
+                continue
+            if _ROW_NUMBER_HEADER_RE.match(text):
+                row_number_columns.append(cell[0])
+            elif text[:1].islower():
+                lowercase_headings.append(cell[0])
+
+    if row_number_columns:
+        report.add_issue(
+            doc_name,
+            "tables",
+            "warning",
+            "Столбец «№ п/п» в таблице",
+            expected="Без отдельного столбца «№ п/п» (номера при необходимости — перед наименованием)",
+            actual=f"таблиц: {len(row_number_columns)}",
+            location=locator.describe_rows(row_number_columns),
+        )
+
+    if lowercase_headings:
+        report.add_issue(
+            doc_name,
+            "tables",
+            "warning",
+            "Заголовки граф таблицы начинаются со строчной буквы",
+            expected="Заголовки граф с прописной буквы",
+            actual=f"ячеек: {len(lowercase_headings)}",
+            location=locator.describe_rows(lowercase_headings),
+        )
+
+    # A table continued on the next page numbers its columns, and the continuation
+    # repeats that row of numbers instead of the head.
+    by_first_row = {info.first_row: info for info in index.tables}
+    starts = sorted(by_first_row)
+    captioned = {}
+    for obj in index.objects.tables:
+        if obj.object_row in by_first_row:
+            captioned.setdefault(obj.number, by_first_row[obj.object_row])
+    unnumbered: dict[int, str] = {}
+    for number, row in index.objects.continuations:
+        position = bisect_right(starts, row)
+        if position < len(starts) and starts[position] - row <= CAPTION_DISTANCE:
+            continuation = by_first_row[starts[position]]
+            if continuation.numbered_columns_row(paragraphs) is None:
+                unnumbered.setdefault(continuation.first_row, number)
+        original = captioned.get(number)
+        if original is not None and original.numbered_columns_row(paragraphs) is None:
+            unnumbered.setdefault(original.first_row, number)
+
+    if unnumbered:
+        report.add_issue(
+            doc_name,
+            "tables",
+            "warning",
+            "В перенесённой таблице графы не пронумерованы",
+            expected="Строка с номерами граф 1, 2, 3… в начале таблицы и в «Продолжении таблицы N»",
+            actual=", ".join(dict.fromkeys(unnumbered.values())),
+            location=locator.describe_rows(sorted(unnumbered)),
+        )
+
+
+# Hits listed one by one in a text lint issue; the rest are counted
+_LINT_EXAMPLES = 10
+
+# kind -> (description, expected)
+_LINT_ISSUES = {
+    "unit_spacing": ("Нет пробела между числом и единицей измерения", "«100 кВт», «80 %», «20 °С»"),
+    "math_sign": ("Математические знаки в тексте без числовых значений", "Знаки «>», «<», «=» только между значениями"),
+    "colloquial": ("Разговорные слова и выражения в тексте", "Научно-технический стиль"),
+}
+
+
+def _check_text(doc_name: str, locator, report) -> None:
+    """Lint the main text (before the source list): units, bare math signs, colloquialisms.
+
+    Word lists come from `text_lint.json`; see `tests.helpers.text_lint`.
+    """
+
+    from tests.helpers.text_lint import TextLinter, lint_rows
+
+    lint_path = _text_lint_path()
+    if not lint_path.exists():
+        return
+    linter = TextLinter.from_file(lint_path)
+    sources_start, _ = _sources_section_rows(locator)
+    last_row = sources_start if sources_start is not None else len(locator.table)
+    hits = lint_rows(locator.table, linter, range(last_row))
+
+    for kind, (description, expected) in _LINT_ISSUES.items():
+        kind_hits = [hit for hit in hits if hit.kind == kind]
+        if not kind_hits:
+            continue
+        actual = _format_examples(
+            [f"«{hit.text}» ({locator.describe(hit.row)})" for hit in kind_hits], limit=_LINT_EXAMPLES
+        )
+        report.add_issue(
+            doc_name,
+            "text",
+            "warning",
+            f"{description} ({len(kind_hits)} шт.)",
+            expected=expected,
+            actual=actual,
+            location=locator.describe_rows([hit.row for hit in kind_hits]),
+        )
+
+
+_ABBREVIATIONS_TITLE = "Условные обозначения и сокращения"
+
+
+def _check_abbreviations(doc_name: str, locator, page_starts: list[int], report) -> None:
+    """Check abbreviations of the text against the "Условные обозначения и сокращения" list.
+
+    The text is scanned from the abstract (or the introduction; without them
+    from the page after the title page) up to the source list; the table of contents and the list itself are skipped.
+    Common abbreviations come from `text_lint.json` (see `tests.helpers.abbreviations`).
+    """
+
+    from tests.helpers.abbreviations import build_abbreviation_index, common_abbreviations
+
+    paragraphs = locator.table
+    positions = _find_section_positions(
+        paragraphs, ["Реферат", "Оглавление", "Введение", _ABBREVIATIONS_TITLE]
+    )
+    sources_start, _ = _sources_section_rows(locator)
+
+    list_rows = _section_body_rows(locator, positions.get(_ABBREVIATIONS_TITLE))
+    skipped = set(_section_body_rows(locator, positions.get("Оглавление"))) | set(list_rows)
+    first_row = _text_start_row(positions, page_starts)
+    last_row = sources_start if sources_start is not None else len(paragraphs)
+    text_rows = [row for row in range(first_row, last_row) if row not in skipped]
+
+    index = build_abbreviation_index(
+        paragraphs, text_rows, list_rows, common_abbreviations(_text_lint_path())
+    )
+
+    undeclared = index.undeclared()
+    if undeclared:
+        has_list = _ABBREVIATIONS_TITLE in positions
+        report.add_issue(
+            doc_name,
+            "abbreviations",
+            "warning",
+            "Сокращения не приведены в перечне «Условные обозначения и сокращения»"
+            if has_list else "Сокращения используются без перечня «Условные обозначения и сокращения»",
+            expected="Общеупотребимые сокращения или сокращения из перечня",
+            actual=_format_examples(
+                [f"{token} ({locator.describe(row)})" for token, row in undeclared], limit=_LINT_EXAMPLES
+            ),
+            location=locator.describe_rows([row for _, row in undeclared]),
+        )
+
+    unused = index.unused()
+    if unused:
+        report.add_issue(
+            doc_name,
+            "abbreviations",
+            "warning",
+            "В перечне сокращений есть сокращения, которые не используются в тексте",
+            expected="Только сокращения, которые встречаются в тексте",
+            actual=_format_examples([token for token, _ in unused], separator=", ", limit=_LINT_EXAMPLES),
+            location=locator.describe_rows([row for _, row in unused]),
+        )
+
+
+def _check_formulas(doc_name: str, index: _BodyIndex, report) -> None:
+    """Check display formulas: blank lines around, "(N)" at the right, numbering, "где" line.
+
+    Only the paragraphs around each formula are read (see `formulas`).
+    """
+
+    from tests.helpers.objects import sequence_gaps
+
+    locator = index.locator
+    formulas = index.formulas.formulas
+    if not formulas:
+        return
+
+    not_separated = [f.row for f in formulas if not (f.blank_above and f.blank_below)]
+    if not_separated:
+        report.add_issue(
+            doc_name,
+            "formulas",
+            "warning",
+            "Формулы не отделены от текста пустой строкой",
+            expected="Пустая строка сверху и снизу формулы",
+            actual=f"формул: {len(not_separated)} из {len(formulas)}",
+            location=locator.describe_rows(not_separated),
+        )
+
+    unnumbered = [f.row for f in formulas if f.number is None and f.bad_number is None]
+    if unnumbered:
+        report.add_issue(
+            doc_name,
+            "formulas",
+            "warning",
+            "Формулы без номера",
+            expected="Номер справа в круглых скобках: (1) или (2.1)",
+            actual=f"формул: {len(unnumbered)} из {len(formulas)}",
+            location=locator.describe_rows(unnumbered),
+        )
+
+    bad_numbers = [f for f in formulas if f.bad_number is not None]
+    if bad_numbers:
+        report.add_issue(
+            doc_name,
+            "formulas",
+            "warning",
+            "Номер формулы не в круглых скобках",
+            expected="(N)",
+            actual=", ".join(f.bad_number for f in bad_numbers[:5]),
+            location=locator.describe_rows([f.row for f in bad_numbers]),
+        )
+
+    not_right = [f.row for f in formulas if f.number is not None and not f.number_right]
+    if not_right:
+        report.add_issue(
+            doc_name,
+            "formulas",
+            "warning",
+            "Номер формулы не у правого края",
+            expected="Номер справа (правая табуляция или выравнивание по правому краю)",
+            actual=f"формул: {len(not_right)}",
+            location=locator.describe_rows(not_right),
+        )
+
+    numbered = [f for f in formulas if f.number is not None]
+    gaps = sequence_gaps([f.number for f in numbered])
+    if gaps:
+        report.add_issue(
+            doc_name,
+            "formulas",
+            "warning",
+            "Нарушена последовательность номеров формул",
+            expected=", ".join(expected for expected, _ in gaps[:5]),
+            actual=", ".join(numbered[position].number for _, position in gaps[:5]),
+            location=locator.describe_rows([numbered[position].row for _, position in gaps]),
+        )
+
+    explanations = index.formulas
+    for rows, description, expected in (
+        (explanations.where_colon, "Двоеточие после «где» в расшифровке формулы", "«где» без двоеточия"),
+        (explanations.where_missing, "Расшифровка символов не начинается со слова «где»",
+         "Первая строка расшифровки начинается со слова «где»"),
+        (explanations.where_inline, "Расшифровка формулы не с новой строки",
+         "«где …» с новой строки после формулы"),
+    ):
+        if rows:
+            report.add_issue(
+                doc_name,
+                "formulas",
+                "warning",
+                description,
+                expected=expected,
+                actual=f"формул: {len(rows)}",
+                location=locator.describe_rows(rows),
+            )
+
+
+def _standards_md_path(repo_root: Path) -> Path:
+    """Return path to the IT checklist markdown."""
+
+    return repo_root / "scripts" / "standards_verification" / "standars_control_it_short.md"
+
+
+def _text_lint_path() -> Path:
+    """Word lists of the text lint (units, colloquialisms), next to this script."""
+
+    return Path(__file__).resolve().parent / "text_lint.json"
+
+
+CACHE_DIR_ENV = "IT_NORMOCONTROL_CACHE_DIR"
+
+
+def _default_cache_dir(repo_root: Path) -> Path:
+    """Cache directory (overridable via IT_NORMOCONTROL_CACHE_DIR)."""
+
+    return Path(os.environ.get(CACHE_DIR_ENV) or repo_root / ".normocontrol_cache")
+
+
+def _checker_version(repo_root: Path) -> str:
+    """Version stamp of the checking code: hash of this script, its word lists and tests/helpers."""
+
+    from tests.helpers.result_cache import sha256_files
+
+    sources = [
+        Path(__file__).resolve(),
+        _text_lint_path(),
+        *sorted((repo_root / "tests" / "helpers").glob("*.py")),
+    ]
+    return sha256_files(sources)
+
+
+def _open_result_cache(repo_root: Path, cache_dir: Path | None = None):
+    """Result cache bound to the current checklist and checker version."""
+
+    from tests.helpers.result_cache import ResultCache, sha256_file
+
+    return ResultCache(
+        cache_dir or _default_cache_dir(repo_root),
+        checklist_hash=sha256_file(_standards_md_path(repo_root)),
+        checker_version=_checker_version(repo_root),
+    )
+
+
+def _check_document(
+    docx_path: Path,
+    doc_name: str,
+    report,
+    config: ItNormocontrolConfig,
+    stream: bool | None = None,
+    cache=None,
+) -> None:
+    """Run all checks for one document and add its issues to `report`.
+
+    With a `ResultCache`, issues of an unchanged document (same bytes, same
+    checklist, same checker version) are replayed without opening it.
+    """
+
+    from tests.helpers.ooxml_utils import DocumentModel
+
+    cache_key = cache.key_for(docx_path) if cache is not None else None
+    if cache_key is not None:
+        cached_issues = cache.get(cache_key)
+        if cached_issues is not None:
+            report.add_document(doc_name)
+            for issue in cached_issues:
+                report.add_issue(doc_name, **issue)
+            return
+
+    first_issue = len(report.issues)
+
+    # Pass required sections through the report instance without changing its public API.
+    # (This keeps changes localized to this script.)
+    setattr(report, "_required_sections_in_order", config.required_sections_in_order)
+    report.add_document(doc_name)
+
+    with DocumentModel(docx_path) as model:
+        if stream is None:
+            stream = model.part_size(DocumentModel.DOCUMENT) > STREAMING_THRESHOLD_BYTES
+
+        index = _check_body(doc_name, model, report, config, stream=stream)
+        _check_page_numbering(doc_name, model, report, index.sections)
+        positions = _check_structure(doc_name, index.locator, report)
+        _check_abstract(doc_name, index.locator, report, config, positions)
+        _check_toc(doc_name, index, report, positions)
+        _check_appendices(doc_name, index, report, positions)
+        _check_headings(doc_name, index.locator, report)
+        _check_references(doc_name, index.locator, report)
+        _check_captions(doc_name, index.locator, report)
+        _check_fields(doc_name, index, report)
+        _check_objects(doc_name, index, report)
+        _check_tables(doc_name, index, report)
+        _check_formulas(doc_name, index, report)
+        _check_text(doc_name, index.locator, report)
+        _check_abbreviations(doc_name, index.locator, index.page_starts, report)
+
+    if cache_key is not None:
+        cache.put(cache_key, [asdict(issue) for issue in report.issues[first_issue:]])
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    """Result of checking one document, fully in memory."""
+
+    docx_path: Path
+    exit_code: int
+    issues: list
+    summary: dict
+    markdown: str
+
+    def write_markdown(self, report_dir: Path) -> Path:
+        """Save the markdown report under a name no other run has taken.
+
+        Names are `it_normocontrol_report_YYYYMMDD_HHMMSS.md`; a `_N` suffix
+        is added when another run finished in the same second.
+        """
+
+        report_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = 0
+        while True:
+            name = f"it_normocontrol_report_{timestamp}{f'_{suffix}' if suffix else ''}.md"
+            report_path = report_dir / name
+            try:
+                with open(report_path, "x", encoding="utf-8") as file:
+                    file.write(self.markdown)
+            except FileExistsError:
+                suffix += 1
+                continue
+            return report_path
+
+
+def check_it_docx_api(
+    docx_path: Path,
+    stream: bool | None = None,
+    use_cache: bool = False,
+    config: ItNormocontrolConfig | None = None,
+) -> CheckResult:
+    """Check one document and return issues, summary and markdown in memory.
+
+    Nothing is written except cache entries (with `use_cache`). Calls share
+    no mutable state, so several documents may be checked concurrently.
 
     Args:
         docx_path: Path to a .docx file.
-        report_dir: Directory where a markdown report will be saved.
+        stream: Streaming mode, as in `check_it_docx`.
+        use_cache: Replay/store results in the on-disk result cache.
+        config: Already loaded configuration (default: load the checklist).
 
     Returns:
-        Exit code (0 if no errors, 1 otherwise).
+        `CheckResult` with `exit_code` 1 if any error was found.
     """
 
     repo_root = _resolve_repo_root()
     _ensure_tests_helpers_on_syspath(repo_root)
 
-    from tests.helpers.ooxml_utils import get_document_xml
     from tests.helpers.report import NormocontrolReport
 
-    standards_md = repo_root / "scripts" / "standards_verification" / "standars_control_it_short.md"
-    config = load_it_normocontrol_config(standards_md)
+    docx_path = Path(docx_path)
+    if config is None:
+        config = load_it_normocontrol_config(_standards_md_path(repo_root))
+    cache = _open_result_cache(repo_root) if use_cache else None
 
     report = NormocontrolReport()
-    # Pass required sections through the report instance without changing its public API.
-    # (This keeps changes localized to this script.)
-    setattr(report, "_required_sections_in_order", config.required_sections_in_order)
-    doc_name = docx_path.name
-    report.add_document(doc_name)
+    _check_document(
+        docx_path, docx_path.name, report, config, stream=stream, cache=cache
+    )
+
+    return CheckResult(
+        docx_path=docx_path,
+        exit_code=1 if report.has_errors() else 0,
+        issues=list(report.issues),
+        summary=report.generate_summary(),
+        markdown=report.render_markdown(),
+    )
+
+
+def check_it_docx(
+    docx_path: Path,
+    report_dir: Path,
+    stream: bool | None = None,
+    use_cache: bool = False,
+) -> int:
+    """Run IT short checklist checks and write a markdown report.
+
+    Args:
+        docx_path: Path to a .docx file.
+        report_dir: Directory where a markdown report will be saved.
+        stream: Check document.xml with constant-memory streaming. By default
+            streaming is used for parts larger than `STREAMING_THRESHOLD_BYTES`.
+        use_cache: Replay/store results in the on-disk result cache.
+
+    Returns:
+        Exit code (0 if no errors, 1 otherwise).
+    """
+
+    result = check_it_docx_api(docx_path, stream=stream, use_cache=use_cache)
+    report_path = result.write_markdown(report_dir)
+
+    summary = result.summary
+    print(f"✓ Report: {report_path}")
+    print(f"Checked: {summary['total_documents']} document(s)")
+    print(f"Issues: {summary['total_issues']} (errors={summary['errors']}, warnings={summary['warnings']})")
+
+    return result.exit_code
+
+
+# --- Batch mode -------------------------------------------------------------
+
+DEFAULT_BATCH_PATTERN = "students/*/task_03/Пояснительная_записка.docx"
+DEFAULT_BATCH_TIMEOUT_S = 120.0
+
+# Set once per worker process by `_init_batch_worker`.
+_WORKER_CONFIG: ItNormocontrolConfig | None = None
+_WORKER_CACHE = None
+# Queue on which a worker reports (document, pid) when it starts a document
+_WORKER_STARTED = None
+
+
+def _collect_docx_paths(patterns: list[str], base_dir: Path) -> list[Path]:
+    """Expand files, directories (recursive) and glob patterns into .docx paths.
+
+    Word lock files (`~$*.docx`) are skipped; the result is sorted and unique.
+    """
+
+    found: set[Path] = set()
+    for pattern in patterns:
+        candidate = Path(pattern)
+        if not candidate.is_absolute():
+            candidate = base_dir / candidate
+
+        if glob.has_magic(pattern):
+            matches = [Path(m) for m in glob.glob(str(candidate), recursive=True)]
+        elif candidate.is_dir():
+            matches = list(candidate.rglob("*.docx"))
+        else:
+            matches = [candidate]
+
+        for match in matches:
+            if match.suffix.lower() == ".docx" and not match.name.startswith("~$") and match.is_file():
+                found.add(match.resolve())
+
+    return sorted(found)
+
+
+def _batch_doc_name(docx_path: Path, base_dir: Path) -> str:
+    """Readable unique document name (repository-relative when possible)."""
+
+    try:
+        return docx_path.relative_to(base_dir).as_posix()
+    except ValueError:
+        return docx_path.as_posix()
+
+
+@contextmanager
+def _time_limit(seconds: float | None):
+    """Raise TimeoutError in the current process after `seconds` (POSIX only)."""
+
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def _on_timeout(signum, frame):
+        raise TimeoutError(f"превышено время проверки ({seconds:g} с)")
+
+    previous = signal.signal(signal.SIGALRM, _on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
 
-    doc_xml = get_document_xml(docx_path)
-    doc = Document(docx_path)
+def _init_batch_worker(repo_root: str, config: ItNormocontrolConfig, cache, started=None) -> None:
+    """Process pool initializer: import helpers and share the parsed config."""
 
-    _check_page_setup(doc_name, doc_xml, report, config)
-    _check_paragraph_formatting(doc_name, doc_xml, report, config)
-    _check_fonts(doc_name, doc_xml, report, config)
-    _check_page_numbering(docx_path, doc_name, report)
-    _check_structure(doc_name, doc, report)
-    _check_references(doc_name, doc, report)
-    _check_captions(doc_name, doc, report)
+    global _WORKER_CONFIG, _WORKER_CACHE, _WORKER_STARTED
+    _ensure_tests_helpers_on_syspath(Path(repo_root))
+    _WORKER_CONFIG = config
+    _WORKER_CACHE = cache
+    _WORKER_STARTED = started
+
+
+def _batch_worker(
+    docx_path: str,
+    doc_name: str,
+    stream: bool | None,
+    timeout: float | None,
+) -> list[dict]:
+    """Check one document in a worker process and return serialized issues."""
+
+    from tests.helpers.report import NormocontrolReport
+
+    if _WORKER_STARTED is not None:
+        _WORKER_STARTED.put((docx_path, os.getpid()))
+    report = NormocontrolReport()
+    try:
+        with _time_limit(timeout):
+            _check_document(
+                Path(docx_path),
+                doc_name,
+                report,
+                _WORKER_CONFIG,
+                stream=stream,
+                cache=_WORKER_CACHE,
+            )
+    except TimeoutError as exc:
+        _add_checker_failure(report, doc_name, str(exc))
+    except Exception as exc:  # noqa: BLE001 - one broken file must not stop the sweep
+        _add_checker_failure(report, doc_name, f"{type(exc).__name__}: {exc}")
+
+    return [asdict(issue) for issue in report.issues]
+
+
+def _add_checker_failure(report, doc_name: str, reason: str) -> None:
+    """Record that a document could not be checked."""
+
+    report.add_issue(
+        doc_name,
+        "checker",
+        "error",
+        "Документ не удалось проверить",
+        expected="Проверка завершается без ошибок",
+        actual=reason[:300],
+    )
+
+
+def check_it_docx_batch(
+    docx_paths: list[Path],
+    report_dir: Path,
+    workers: int | None = None,
+    timeout: float | None = DEFAULT_BATCH_TIMEOUT_S,
+    stream: bool | None = None,
+    base_dir: Path | None = None,
+    use_cache: bool = False,
+) -> int:
+    """Check many documents in a process pool and write one aggregate report.
+
+    Args:
+        docx_paths: Documents to check.
+        report_dir: Directory for the aggregate markdown + JSON report.
+        workers: Worker processes (default: CPU count).
+        timeout: Per-document time limit in seconds (None/0 disables it).
+        stream: Streaming mode, as in `check_it_docx`.
+        base_dir: Document names in the report are relative to this directory.
+        use_cache: Replay/store results in the on-disk result cache.
+
+    Returns:
+        Exit code (0 if no errors in any document, 1 otherwise).
+    """
+
+    repo_root = _resolve_repo_root()
+    _ensure_tests_helpers_on_syspath(repo_root)
+
+    from tests.helpers.report import Issue, NormocontrolReport
+
+    config = load_it_normocontrol_config(_standards_md_path(repo_root))
+    cache = _open_result_cache(repo_root) if use_cache else None
+    base_dir = base_dir or repo_root
+    doc_names = {path: _batch_doc_name(path, base_dir) for path in docx_paths}
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    total = len(docx_paths)
+    results: dict[Path, list[dict]] = {}
+    # Parent-side safety net in case the in-worker timer cannot interrupt a call.
+    parent_timeout = timeout * 2 + 5 if timeout else None
+    # Workers report here when they start a document, so deadlines count run time only.
+    started_queue = multiprocessing.SimpleQueue()
+
+    def new_pool() -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(str(repo_root), config, cache, started_queue),
+        )
+
+    def record(path: Path, issues: list[dict]) -> None:
+        results[path] = issues
+        errors = sum(1 for issue in issues if issue["severity"] == "error")
+        warnings = sum(1 for issue in issues if issue["severity"] == "warning")
+        print(
+            f"[{len(results)}/{total}] {doc_names[path]}: errors={errors}, warnings={warnings}",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    def failure(path: Path, reason: str) -> list[dict]:
+        report = NormocontrolReport()
+        _add_checker_failure(report, doc_names[path], reason)
+        return [asdict(issue) for issue in report.issues]
+
+    executor = new_pool()
+    try:
+        pending_paths = deque(docx_paths)
+        in_flight: dict = {}
+        # str(path) -> (worker pid, start time) of documents being checked
+        running: dict[str, tuple[int, float]] = {}
+        while pending_paths or in_flight:
+            while pending_paths and len(in_flight) < workers:
+                path = pending_paths.popleft()
+                future = executor.submit(_batch_worker, str(path), doc_names[path], stream, timeout)
+                in_flight[future] = path
+
+            done, _ = wait(list(in_flight), timeout=1.0, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            while not started_queue.empty():
+                docx_path, pid = started_queue.get()
+                running[docx_path] = (pid, now)
+
+            broken = False
+            for future in done:
+                path = in_flight.pop(future)
+                running.pop(str(path), None)
+                try:
+                    record(path, future.result())
+                except Exception as exc:  # noqa: BLE001 - e.g. a crashed worker
+                    broken = broken or isinstance(exc, BrokenProcessPool)
+                    record(path, failure(path, f"{type(exc).__name__}: {exc}"))
+
+            hung = [
+                future for future, path in in_flight.items()
+                if parent_timeout and str(path) in running and now - running[str(path)][1] > parent_timeout
+            ]
+            for future in hung:
+                path = in_flight.pop(future)
+                pid, _ = running.pop(str(path))
+                try:
+                    os.kill(pid, signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+                except OSError:
+                    pass
+                record(path, failure(path, f"превышено время проверки ({timeout:g} с)"))
+
+            if hung or broken:
+                # A killed or crashed worker breaks the whole pool: check the
+                # documents it still held again in a new one.
+                executor.shutdown(wait=True, cancel_futures=True)
+                pending_paths.extendleft(reversed(list(in_flight.values())))
+                in_flight.clear()
+                running.clear()
+                executor = new_pool()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    report = NormocontrolReport()
+    for path in docx_paths:
+        report.add_document(doc_names[path])
+        for issue in results.get(path, []):
+            report.issues.append(Issue(**issue))
 
     report_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    report_path = report_dir / f"it_normocontrol_report_{timestamp}.md"
-    report.to_markdown(report_path)
+    md_path = report_dir / f"it_normocontrol_batch_{timestamp}.md"
+    json_path = report_dir / f"it_normocontrol_batch_{timestamp}.json"
+    report.to_markdown(md_path)
+    report.to_json(json_path)
 
     summary = report.generate_summary()
-    print(f"✓ Report: {report_path}")
+    print(f"✓ Report: {md_path}")
+    print(f"✓ JSON report: {json_path}")
     print(f"Checked: {summary['total_documents']} document(s)")
     print(f"Issues: {summary['total_issues']} (errors={summary['errors']}, warnings={summary['warnings']})")
 
     return 1 if report.has_errors() else 0
 
 
-def main() -> int:
+def _main_batch(argv: list[str]) -> int:
+    """CLI entrypoint for `batch` mode."""
+
+    repo_root = _resolve_repo_root()
+
+    parser = argparse.ArgumentParser(
+        prog="check_it_docx.py batch",
+        description="Check many .docx files in parallel and write one aggregate report",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[DEFAULT_BATCH_PATTERN],
+        help=f"Files, directories or glob patterns (default: {DEFAULT_BATCH_PATTERN})",
+    )
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_BATCH_TIMEOUT_S,
+        help=f"Per-document time limit in seconds, 0 disables (default: {DEFAULT_BATCH_TIMEOUT_S:g})",
+    )
+    parser.add_argument("--stream", action="store_true", default=None, help="Force streaming mode")
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the on-disk result cache")
+    parser.add_argument(
+        "--report-dir",
+        type=Path,
+        default=repo_root / "normocontrol_reports",
+        help="Directory for the aggregate report",
+    )
+    args = parser.parse_args(argv)
+
+    docx_paths = _collect_docx_paths(args.paths, repo_root)
+    if not docx_paths:
+        print(f"ERROR: No .docx files matched: {', '.join(args.paths)}")
+        return 1
+
+    return check_it_docx_batch(
+        docx_paths,
+        args.report_dir,
+        workers=args.workers,
+        timeout=args.timeout or None,
+        stream=args.stream,
+        use_cache=not args.no_cache,
+    )
+
+
+def _main_compile_config(argv: list[str]) -> int:
+    """CLI entrypoint for `compile-config`: validate the checklist and compile it."""
+
+    repo_root = _resolve_repo_root()
+
+    parser = argparse.ArgumentParser(
+        prog="check_it_docx.py compile-config",
+        description="Validate the IT checklist and write its compiled config next to it",
+    )
+    parser.add_argument(
+        "checklist",
+        nargs="?",
+        type=Path,
+        default=_standards_md_path(repo_root),
+        help="Path to the checklist markdown",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        config = compile_it_normocontrol_config(args.checklist)
+    except (OSError, ValueError) as exc:
+        print(f"ERROR: {exc}")
+        return 1
+
+    for name, value in asdict(config).items():
+        print(f"✓ {name}: {value}")
+    print(f"✓ Compiled: {compiled_config_path(args.checklist)}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
     """CLI entrypoint."""
 
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "batch":
+        return _main_batch(argv[1:])
+    if argv and argv[0] == "compile-config":
+        return _main_compile_config(argv[1:])
+
     repo_root = _resolve_repo_root()
     default_docx = repo_root / "tests" / "ПЗ.docx"
 
-    docx_path = Path(sys.argv[1]) if len(sys.argv) >= 2 else default_docx
+    parser = argparse.ArgumentParser(description="IT normocontrol checker (short checklist)")
+    parser.add_argument("docx", nargs="?", type=Path, default=default_docx, help="Path to a .docx file")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=None,
+        help="Stream document.xml with iterparse (constant memory; auto for large files)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the on-disk result cache")
+    args = parser.parse_args(argv)
+
+    docx_path = args.docx
     report_dir = repo_root / "normocontrol_reports"
 
     if not docx_path.exists():
@@ -699,7 +2760,12 @@ def main() -> int:
         print(f"ERROR: Expected .docx file: {docx_path}")
         return 1
 
-    return check_it_docx(docx_path, report_dir)
+    return check_it_docx(
+        docx_path,
+        report_dir,
+        stream=args.stream,
+        use_cache=not args.no_cache,
+    )
 
 
 if __name__ == "__main__":
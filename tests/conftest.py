@@ -1,6 +1,7 @@
 """
 Pytest configuration and fixtures for normocontrol tests.
 """
+import zipfile
 import pytest
 from pathlib import Path
 from tests.helpers.report import NormocontrolReport
@@ -132,3 +133,60 @@ def all_test_docs():
 def any_docx(request):
     """Parametrized fixture that runs test on each document."""
     return TESTS_DIR / request.param
+
+
+# Minimal OOXML package used to build synthetic documents in unit tests
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+_PACKAGE_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+W_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math"'
+)
+
+
+def build_docx(path: Path, body_xml: str, parts: dict = None) -> Path:
+    """
+    Write a minimal .docx whose w:body contains `body_xml`.
+
+    Args:
+        path: Target file path
+        body_xml: Inner XML of w:body (the `w` prefix is predeclared)
+        parts: Extra archive members, e.g. {"word/styles.xml": "<w:styles ...>"}
+    """
+    document_xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document {W_NAMESPACES}><w:body>{body_xml}</w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES_XML)
+        archive.writestr("_rels/.rels", _PACKAGE_RELS_XML)
+        archive.writestr("word/document.xml", document_xml)
+        for name, content in (parts or {}).items():
+            archive.writestr(name, content)
+    return path
+
+
+@pytest.fixture
+def make_docx(tmp_path):
+    """Factory fixture: make_docx(body_xml, parts=None, name="doc.docx") -> Path."""
+    def _make(body_xml: str, parts: dict = None, name: str = "doc.docx") -> Path:
+        return build_docx(tmp_path / name, body_xml, parts)
+    return _make
@@ -0,0 +1,132 @@
+"""
+Abbreviations used in the text vs. the "Условные обозначения и сокращения" list.
+
+`build_abbreviation_index` reads the revised text of the `ParagraphTable`
+once (tracked insertions and field results included):
+
+- in the text rows, every abbreviation-shaped token is recorded with the
+  row of its first occurrence: all-caps words of 2-10 characters ("СУБД",
+  "API", "HTML5", "IT" in "IT-компания") and Cyrillic mixed-case ones with
+  at least as many capitals as small letters ("ПрО");
+- in the rows of the abbreviations section, the first token of every line
+  ("API – интерфейс ...", "СУБД\tсистема ...") or table cell is a
+  declared abbreviation.
+
+Used and declared abbreviations are dicts keyed by the token, so both
+directions ("used but not declared", "declared but never used") are set
+lookups however long the glossary is. Headings, lines typed in capitals
+(title page, "ПОЯСНИТЕЛЬНАЯ ЗАПИСКА"), paragraphs of one word in capitals
+("УТВЕРЖДАЮ", "ЗАДАНИЕ") and Roman numerals are not counted.
+Abbreviations everybody knows (ГОСТ, РФ, ...) come from the word list file
+and need no declaration.
+"""
+import json
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from tests.helpers.paragraphs import ParagraphTable
+
+
+_TOKEN_RE = re.compile(r"(?<![\w-])[A-ZА-ЯЁ][A-Za-zА-ЯЁа-яё0-9]{1,9}(?!\w)")
+_ROMAN_RE = re.compile(r"^[IVXLCDM]+$")
+# First token of a list line, before a dash, tab, colon or the end of the line
+_DECLARATION_RE = re.compile(r"^\s*(\S+?)\s*(?:[–—:-]|\t|$)")
+# Share of capitals above which a paragraph is text typed in capitals
+_UPPERCASE_SHARE = 0.6
+
+
+def abbreviation_token(word: str) -> bool:
+    """True if `word` looks like an abbreviation ("СУБД", "API", "ПрО")."""
+    upper = sum(1 for char in word if char.isupper())
+    lower = sum(1 for char in word if char.islower())
+    if upper < 2 or _ROMAN_RE.match(word):
+        return False
+    if not lower:
+        return True
+    # Mixed case: Cyrillic only, so product names ("GitHub", "JavaScript") are not abbreviations
+    return upper >= lower and not re.search(r"[A-Za-z]", word)
+
+
+def _mostly_uppercase(text: str) -> bool:
+    letters = [char for char in text if char.isalpha()]
+    if len(letters) < 12:
+        # One word in capitals is a heading ("УТВЕРЖДАЮ"), not an abbreviation
+        words = text.split()
+        return len(words) == 1 and words[0].isupper()
+    return sum(1 for char in letters if char.isupper()) / len(letters) > _UPPERCASE_SHARE
+
+
+@dataclass
+class AbbreviationIndex:
+    """Abbreviations of a document and its abbreviations list."""
+    # Token -> row of its first occurrence in the text
+    used: Dict[str, int] = field(default_factory=dict)
+    # Token -> row of its line in the abbreviations list
+    declared: Dict[str, int] = field(default_factory=dict)
+    # Abbreviations that need no declaration
+    common: FrozenSet[str] = frozenset()
+
+    def undeclared(self) -> List[Tuple[str, int]]:
+        """(token, first row) of used abbreviations missing from the list, in text order."""
+        return [(token, row) for token, row in self.used.items()
+                if token not in self.declared and token not in self.common]
+
+    def unused(self) -> List[Tuple[str, int]]:
+        """(token, list row) of declared abbreviations never used in the text."""
+        return [(token, row) for token, row in self.declared.items() if token not in self.used]
+
+
+def build_abbreviation_index(table: ParagraphTable, text_rows: Iterable[int],
+                             list_rows: Iterable[int] = (),
+                             common: Iterable[str] = ()) -> AbbreviationIndex:
+    """
+    Index abbreviations of the text and of the abbreviations list.
+
+    Args:
+        table: Paragraph table of the document
+        text_rows: Rows of the text to scan (headings are skipped)
+        list_rows: Rows of the abbreviations section (without its heading)
+        common: Abbreviations that need no declaration
+    """
+    index = AbbreviationIndex(common=frozenset(common))
+    texts = table.revised
+
+    for row in list_rows:
+        match = _DECLARATION_RE.match(texts[row])
+        if match:
+            token = match.group(1).strip(".,;")
+            if abbreviation_token(token):
+                index.declared.setdefault(token, row)
+
+    used = index.used
+    # Capitalised words that are not abbreviations ("Таблица"), judged once
+    rejected = set()
+    for row in text_rows:
+        text = texts[row]
+        if not text or table.is_heading_like(row) or _mostly_uppercase(text):
+            continue
+        for match in _TOKEN_RE.finditer(text):
+            token = match.group()
+            if token in used or token in rejected:
+                continue
+            if abbreviation_token(token):
+                used[token] = row
+            else:
+                rejected.add(token)
+    return index
+
+
+@lru_cache(maxsize=4)
+def _load_common(path: str) -> FrozenSet[str]:
+    with open(path, encoding="utf-8") as file:
+        return frozenset(json.load(file).get("common_abbreviations", ()))
+
+
+def common_abbreviations(path: Optional[Path]) -> FrozenSet[str]:
+    """The "common_abbreviations" list of a word list file (cached per file)."""
+    if path is None or not path.exists():
+        return frozenset()
+    return _load_common(str(path))
@@ -0,0 +1,224 @@
+"""
+Appendices: where pages start, appendix headings and references to them.
+
+`PageBreakCollector` is a body rule for the shared `BodyWalker` pass. It
+records the rows that begin a new page without rendering the document:
+
+- w:pageBreakBefore of the paragraph (directly or via its style);
+- w:br w:type="page" before any text of a paragraph (that paragraph starts
+  the page) or after all of it (the next paragraph does);
+- section breaks: the first row of every section whose w:type is not
+  "continuous" (added from the `SectionInfo` list after the walk).
+
+`build_appendix_index` then finds the appendix headings by their first line
+("ПРИЛОЖЕНИЕ А", optionally followed by "(обязательное)" and the title, on
+the same line or after line breaks) and the first reference to every
+appendix in the text before them: "приложение А", "(см. прил. Б)",
+"приложениях В и Г", "приложения Д–Ж". Only body paragraphs from the start
+of the text proper count as references, so the list of appendices in the
+assignment table is not taken for references. Letter sequence, new-page
+starts and reference order are then judged per appendix.
+"""
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lxml import etree
+
+from tests.helpers.ooxml_utils import W
+from tests.helpers.paragraphs import ParagraphTable
+
+
+_T = W + "t"
+_BR = W + "br"
+
+# Appendix letters in order (ГОСТ 2.105: without Ё, З, Й, О, Ч, Ь, Ы, Ъ)
+APPENDIX_LETTERS = "АБВГДЕЖИКЛМНПРСТУФХЦШЩЭЮЯ"
+
+# First line of a heading: "ПРИЛОЖЕНИЕ А", "Приложение Б (обязательное)",
+# "ПРИЛОЖЕНИЕ В Схема данных"; group 2 is the title on the same line
+_HEADING_RE = re.compile(
+    r"^приложение\s+([^\s.()]{1,3})(?![^\s.()])\.?\s*(?:\([^)]*\))?\s*(.*)$", re.IGNORECASE
+)
+_LETTER = r"[А-ЯЁ](?![а-яё])"
+# Reference: "приложение А", "приложении Б", "прил. В", "приложениях А и Б", "приложения А–В"
+_REFERENCE_RE = re.compile(
+    rf"(?<![а-яё])(?i:прил\.|приложени(?:е|я|ю|ем|и|й|ям|ями|ях))\s*"
+    rf"({_LETTER}(?:\s*(?:,|и|[—–-])\s*{_LETTER})*)"
+)
+_REFERENCE_LETTER_RE = re.compile(r"([А-ЯЁ])|([—–-])")
+
+
+class PageBreakCollector:
+    """Body rule recording the rows that start a new page."""
+
+    def __init__(self, resolver):
+        self.resolver = resolver
+        # Rows starting a page because of page breaks, in order
+        self.rows: List[int] = []
+        self._carry = False
+
+    def on_paragraph(self, paragraph: etree._Element, ctx) -> None:
+        row = ctx.paragraph_index
+        starts = self._carry or self.resolver.page_break_before(paragraph)
+        self._carry = False
+        text_seen = after_break = False
+        for node in paragraph.iter(_T, _BR):
+            if node.tag == _T:
+                if node.text:
+                    text_seen, after_break = True, False
+            elif node.get(W + "type") == "page":
+                starts = starts or not text_seen
+                after_break = True
+        if starts:
+            self.rows.append(row)
+        # Nothing after the break: the next paragraph is at the top of a page
+        self._carry = after_break
+
+    def page_starts(self, sections: Iterable = ()) -> List[int]:
+        """Sorted rows starting a page, including rows after section breaks."""
+        rows = set(self.rows)
+        rows.update(
+            section.first_row for section in sections
+            if section.index > 0 and section.start_type != "continuous"
+        )
+        return sorted(rows)
+
+
+@dataclass
+class Appendix:
+    """One appendix heading."""
+    # Paragraph row of the "ПРИЛОЖЕНИЕ X" line
+    row: int
+    # Designation as written ("А", "1"), upper case
+    letter: str
+    # The heading is at the top of a page
+    new_page: bool = True
+    # The word is typed in capitals ("ПРИЛОЖЕНИЕ")
+    upper_case: bool = True
+
+
+@dataclass
+class AppendixIndex:
+    """Appendix headings and references to them."""
+    appendices: List[Appendix] = field(default_factory=list)
+    # Letter -> row of its first reference, in first-reference order
+    first_references: Dict[str, int] = field(default_factory=dict)
+
+    def letter_errors(self) -> List[Tuple[Appendix, str]]:
+        """(appendix, expected letter) for every appendix out of the А, Б, В, ... sequence."""
+        return [
+            (appendix, APPENDIX_LETTERS[position] if position < len(APPENDIX_LETTERS) else "?")
+            for position, appendix in enumerate(self.appendices)
+            if position >= len(APPENDIX_LETTERS) or appendix.letter != APPENDIX_LETTERS[position]
+        ]
+
+    def unreferenced(self) -> List[Appendix]:
+        """Appendices never referenced in the text."""
+        return [appendix for appendix in self.appendices if appendix.letter not in self.first_references]
+
+    def dangling(self) -> List[Tuple[str, int]]:
+        """
+        (letter, row) of references to appendices that do not exist.
+
+        Empty when no appendix heading was recognised at all: then the
+        headings are laid out in a way the index does not know, not missing.
+        """
+        if not self.appendices:
+            return []
+        letters = {appendix.letter for appendix in self.appendices}
+        return [(letter, row) for letter, row in self.first_references.items() if letter not in letters]
+
+    def reference_order(self) -> Tuple[List[str], List[str]]:
+        """
+        Referenced appendices in order of first reference and in document order.
+
+        The two lists differ when appendices do not follow their first references.
+        """
+        letters = [appendix.letter for appendix in self.appendices]
+        present = set(letters)
+        by_reference = [letter for letter in self.first_references if letter in present]
+        referenced = set(by_reference)
+        return by_reference, [letter for letter in letters if letter in referenced]
+
+
+def starts_page(table: ParagraphTable, row: int, page_starts: List[int]) -> bool:
+    """True if only empty paragraphs separate `row` from the last page start."""
+    position = bisect_right(page_starts, row) - 1
+    start = page_starts[position] if position >= 0 else 0
+    texts = table.texts
+    previous = row - 1
+    while previous >= start and not texts[previous].strip():
+        previous -= 1
+    return previous < start
+
+
+def _expand_letters(text: str) -> List[str]:
+    """Letters of one reference tail: "А, В–Д" -> А, В, Г, Д."""
+    letters: List[str] = []
+    pending_range = False
+    for letter, dash in _REFERENCE_LETTER_RE.findall(text):
+        if dash:
+            pending_range = bool(letters)
+            continue
+        if pending_range and letters[-1] in APPENDIX_LETTERS and letter in APPENDIX_LETTERS:
+            first, last = APPENDIX_LETTERS.index(letters[-1]), APPENDIX_LETTERS.index(letter)
+            letters.extend(APPENDIX_LETTERS[first + 1:last + 1])
+        else:
+            letters.append(letter)
+        pending_range = False
+    return letters
+
+
+def _heading_match(table: ParagraphTable, row: int) -> Optional["re.Match"]:
+    """Heading match of `row`; a title on the same line needs a heading-like paragraph."""
+    text = table.texts[row].strip()
+    if "прил" not in text[:4].lower():
+        return None
+    match = _HEADING_RE.match(text.split("\n", 1)[0].strip())
+    if match is None:
+        return None
+    # "Приложение А содержит схему ..." is a sentence, "ПРИЛОЖЕНИЕ А Схема" a heading
+    if match.group(2) and not (table.is_heading_like(row) or text.startswith("ПРИЛОЖЕНИЕ")):
+        return None
+    return match
+
+
+def build_appendix_index(table: ParagraphTable, page_starts: List[int],
+                         skipped_rows: Iterable[int] = (), text_start: int = 0) -> AppendixIndex:
+    """
+    Index appendix headings and the references to them.
+
+    Args:
+        table: Paragraph table of the document
+        page_starts: Sorted rows starting a page (`PageBreakCollector.page_starts`)
+        skipped_rows: Rows that are not text (table of contents)
+        text_start: First row of the text proper; references before it
+            (title page, assignment) are ignored
+    """
+    index = AppendixIndex()
+    skipped = set(skipped_rows)
+    first_appendix: Optional[int] = None
+
+    for row, text in enumerate(table.texts):
+        if row in skipped:
+            continue
+        match = _heading_match(table, row) if table.body_level[row] else None
+        if match:
+            index.appendices.append(Appendix(
+                row=row,
+                letter=match.group(1).upper(),
+                new_page=starts_page(table, row, page_starts),
+                upper_case=text.lstrip().startswith("ПРИЛОЖЕНИЕ"),
+            ))
+            if first_appendix is None:
+                first_appendix = row
+            continue
+        if (first_appendix is not None or row < text_start or not table.body_level[row]
+                or "прил" not in table.lowered[row] or table.is_heading_like(row)):
+            continue
+        for reference in _REFERENCE_RE.finditer(text):
+            for letter in _expand_letters(reference.group(1)):
+                index.first_references.setdefault(letter, row)
+    return index
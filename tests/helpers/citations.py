@@ -0,0 +1,164 @@
+"""
+Citation graph: bracketed references in the text vs. the numbered source list.
+
+`build_citation_index` reads the `ParagraphTable` once, in a single pass
+over the rows:
+
+- citations in square brackets are expanded: [8], [1, 3], [2–5],
+  [3, с. 45; 7] -> 8 | 1, 3 | 2, 3, 4, 5 | 3, 7 (page and section
+  specifiers after a source number are skipped);
+- the first mention of every source is recorded, so "sources are numbered
+  in order of first appearance" is a comparison with 1, 2, 3, ...;
+- entries of the source list are numbered from their text ("12 Иванов...")
+  or, for auto-numbered lists (w:numPr), by their rendered label
+  (`ParagraphTable.labels`) or else their position in the list.
+
+Rows are read from the revised text (`ParagraphTable.revised`), so a
+citation typed with track changes on (w:ins) or kept in a field counts.
+Brackets that do not start with a source number ("[Электронный ресурс]",
+"[0, 1]") are not citations. Everything is linear in the document size.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from tests.helpers.paragraphs import ParagraphTable
+
+
+# Longest bracket content considered a citation
+_BRACKET_RE = re.compile(r"\[([^\[\]\n]{1,80})\]")
+_RANGE_RE = re.compile(r"^(\d+)\s*[-–—]\s*(\d+)$")
+# Source list entry numbered in its text: "12 Иванов", "12. Иванов", "12) Иванов"
+_ENTRY_NUMBER_RE = re.compile(r"^\s*(\d+)([.)]?)\s+\S")
+# Label of an auto-numbered entry: "12", "12.", "12)"
+_LABEL_NUMBER_RE = re.compile(r"^\s*(\d+)([.)]?)\s*$")
+# Ranges longer than this are not expanded (e.g. a year span in brackets)
+MAX_RANGE = 50
+
+
+def parse_citation(content: str) -> Optional[List[int]]:
+    """
+    Source numbers of one bracket content, or None if it is not a citation.
+
+    Groups are separated by ";"; inside a group, "," separates numbers and
+    ranges until a non-numeric specifier ("с. 45", "гл. 2") starts.
+    """
+    numbers: List[int] = []
+    for group in content.split(";"):
+        items = [item.strip() for item in group.split(",")]
+        if not items or not items[0]:
+            return None
+        for position, item in enumerate(items):
+            if item.isdigit():
+                number = int(item)
+                if number < 1:
+                    return None
+                numbers.append(number)
+                continue
+            match = _RANGE_RE.match(item)
+            if match:
+                first, last = int(match.group(1)), int(match.group(2))
+                if first < 1 or last < first or last - first > MAX_RANGE:
+                    return None
+                numbers.extend(range(first, last + 1))
+                continue
+            if position == 0:
+                return None
+            # Page/section specifier: the rest of the group is not a source list.
+            break
+    return numbers or None
+
+
+@dataclass
+class CitationIndex:
+    """Citations, their first mentions and the source list of a document."""
+    # (source number, paragraph row) for every cited number, in text order
+    mentions: List[Tuple[int, int]] = field(default_factory=list)
+    # Source number -> row of its first mention, in first-mention order
+    first_mentions: Dict[int, int] = field(default_factory=dict)
+    # Source number -> row of its entry in the source list
+    sources: Dict[int, int] = field(default_factory=dict)
+    # Rows of entries numbered "N." / "N)" instead of "N"
+    dotted_entries: List[int] = field(default_factory=list)
+
+    def dangling(self) -> List[Tuple[int, int]]:
+        """(number, first row) of cited sources missing from the list."""
+        return [(number, row) for number, row in self.first_mentions.items() if number not in self.sources]
+
+    def unused(self) -> List[Tuple[int, int]]:
+        """(number, entry row) of listed sources that are never cited."""
+        return [(number, row) for number, row in sorted(self.sources.items())
+                if number not in self.first_mentions]
+
+    def out_of_order(self) -> List[Tuple[int, int, int]]:
+        """
+        First mentions that break numbering by appearance.
+
+        Returns (number, expected number, row): the k-th distinct source cited
+        should be number k.
+        """
+        return [
+            (number, position, row)
+            for position, (number, row) in enumerate(self.first_mentions.items(), start=1)
+            if number != position
+        ]
+
+
+def build_citation_index(table: ParagraphTable, sources_start: Optional[int] = None,
+                         sources_end: Optional[int] = None) -> CitationIndex:
+    """
+    Index citations and source entries of a document.
+
+    Args:
+        table: Paragraph table of the document
+        sources_start: Row of the source list heading (None: no list found)
+        sources_end: First row after the source list (default: end of document)
+
+    Returns:
+        CitationIndex; mentions inside the source list itself are ignored
+    """
+    index = CitationIndex()
+    if sources_end is None:
+        sources_end = len(table)
+    list_counters: Dict[str, int] = {}
+
+    for row, text in enumerate(table.revised):
+        in_sources = sources_start is not None and sources_start < row < sources_end
+        if in_sources:
+            if text.strip() and table.body_level[row]:
+                _add_entry(index, table, row, text, list_counters)
+            continue
+        if "[" not in text:
+            continue
+        for match in _BRACKET_RE.finditer(text):
+            numbers = parse_citation(match.group(1))
+            if numbers is None:
+                continue
+            for number in numbers:
+                index.mentions.append((number, row))
+                index.first_mentions.setdefault(number, row)
+    return index
+
+
+def _add_entry(index: CitationIndex, table: ParagraphTable, row: int, text: str,
+               list_counters: Dict[str, int]) -> None:
+    """Number one source list paragraph (text number first, then list position)."""
+    match = _ENTRY_NUMBER_RE.match(text)
+    if match:
+        number = int(match.group(1))
+        if match.group(2):
+            index.dotted_entries.append(row)
+    else:
+        numbering = table.numbering[row]
+        if numbering is None or numbering[1] != 0:
+            return
+        label = _LABEL_NUMBER_RE.match(table.labels[row] or "")
+        if label:
+            # Rendered by numbering.xml, including its start value and punctuation
+            number = int(label.group(1))
+            if label.group(2):
+                index.dotted_entries.append(row)
+        else:
+            number = list_counters.get(numbering[0], 0) + 1
+            list_counters[numbering[0]] = number
+    index.sources.setdefault(number, row)
@@ -0,0 +1,213 @@
+"""
+Field codes (PAGE, TOC, SEQ, REF, ...) of a document part.
+
+Word stores a field either as w:fldSimple (instruction in an attribute,
+cached result in its runs) or as a complex field spread over runs, possibly
+across paragraphs:
+
+    w:fldChar begin → w:instrText... → w:fldChar separate → result runs →
+    w:fldChar end
+
+Complex fields nest (a TOC holds PAGEREF fields). `FieldCollector` is a
+body rule that runs this state machine over the runs of the shared
+`BodyWalker` pass and records every field with its instruction, cached
+result and paragraph row. `collect_fields` does the same for a small part
+such as a header.
+
+Word writes w:fldChar and w:instrText in runs of their own; text in such
+runs is ignored. Bookmarks are collected from paragraphs and from between
+them: Word also puts w:bookmarkStart directly under w:body, w:tbl, w:tr or
+w:tc (around tables and whole paragraphs).
+"""
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+from lxml import etree
+
+from tests.helpers.ooxml_utils import W, _append_run_text
+from tests.helpers.rules import BodyWalker
+
+
+_P = W + "p"
+_R = W + "r"
+_FLD_CHAR = W + "fldChar"
+_INSTR_TEXT = W + "instrText"
+_FLD_SIMPLE = W + "fldSimple"
+_BOOKMARK_START = W + "bookmarkStart"
+
+_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+# Cached results Word shows for a REF whose bookmark is gone
+BROKEN_REFERENCE_MARKERS = (
+    "источник ссылки не найден",
+    "reference source not found",
+)
+
+
+@dataclass
+class Field:
+    """One field occurrence."""
+    # Field code, e.g. 'SEQ Рисунок \\* ARABIC'
+    instruction: str = ""
+    # Cached result text as last updated by Word
+    result: str = ""
+    # Paragraph rows where the field begins and ends (`WalkContext.paragraph_index`)
+    paragraph_index: int = -1
+    end_paragraph_index: int = -1
+    # True for w:fldSimple
+    simple: bool = False
+    # Paragraph text before the field (only collected when requested)
+    preceding_text: str = ""
+
+    @property
+    def tokens(self) -> List[str]:
+        """Instruction split into words; quoted arguments are unquoted."""
+        return [word or quoted for quoted, word in _TOKEN_RE.findall(self.instruction)]
+
+    @property
+    def name(self) -> str:
+        """Field type in upper case ('PAGE', 'SEQ', 'REF', ...)."""
+        tokens = self.tokens
+        return tokens[0].upper() if tokens else ""
+
+    @property
+    def argument(self) -> str:
+        """First argument (SEQ identifier, REF bookmark), '' if none."""
+        tokens = self.tokens
+        if len(tokens) > 1 and not tokens[1].startswith("\\"):
+            return tokens[1]
+        return ""
+
+    @property
+    def switches(self) -> Set[str]:
+        """Switches in lower case ('\\h', '\\r', '\\s', ...)."""
+        return {token.lower() for token in self.tokens[1:] if token.startswith("\\")}
+
+
+class FieldCollector:
+    """
+    Body rule collecting fields and bookmark names.
+
+    Args:
+        track_text: Also record `Field.preceding_text` (costs a text pass
+            over every run; meant for small parts such as headers)
+    """
+
+    def __init__(self, track_text: bool = False):
+        self.track_text = track_text
+        self.fields: List[Field] = []
+        self.bookmarks: Set[str] = set()
+        # Open complex fields, outermost first, and whether each is past "separate"
+        self._open: List[Field] = []
+        self._in_result: List[bool] = []
+        self._texts: List[List[str]] = []
+
+    def on_body_element(self, element: etree._Element, ctx) -> None:
+        # Bookmarks outside paragraphs; those inside are seen by on_paragraph
+        if element.tag == _P:
+            return
+        for node in element.iter(_BOOKMARK_START):
+            if next(node.iterancestors(_P), None) is None:
+                self._add_bookmark(node)
+
+    def _add_bookmark(self, node: etree._Element) -> None:
+        name = node.get(W + "name")
+        if name:
+            self.bookmarks.add(name)
+
+    def on_paragraph(self, paragraph: etree._Element, ctx) -> None:
+        if self.track_text:
+            self._texts.append([])
+        for node in paragraph.iter(_BOOKMARK_START, _FLD_SIMPLE):
+            if node.tag == _BOOKMARK_START:
+                self._add_bookmark(node)
+                continue
+            simple = node
+            if next(simple.iterancestors(_P), None) is not paragraph:
+                continue
+            parts: List[str] = []
+            for run in simple.iter(_R):
+                _append_run_text(run, parts)
+            self.fields.append(Field(
+                instruction=(simple.get(W + "instr") or "").strip(),
+                result="".join(parts),
+                paragraph_index=ctx.paragraph_index,
+                end_paragraph_index=ctx.paragraph_index,
+                simple=True,
+                preceding_text=self._text_before(paragraph, simple) if self.track_text else "",
+            ))
+
+    def on_paragraph_end(self, paragraph: etree._Element, ctx) -> None:
+        if self.track_text:
+            self._texts.pop()
+
+    def on_run(self, run: etree._Element, ctx) -> None:
+        has_field_chars = False
+        for child in run:
+            tag = child.tag
+            if tag == _FLD_CHAR:
+                has_field_chars = True
+                self._on_fld_char(child.get(W + "fldCharType"), ctx)
+            elif tag == _INSTR_TEXT:
+                has_field_chars = True
+                if self._open and not self._in_result[-1]:
+                    self._open[-1].instruction += child.text or ""
+        if has_field_chars:
+            return
+
+        if any(self._in_result):
+            parts: List[str] = []
+            _append_run_text(run, parts)
+            text = "".join(parts)
+            for open_field, in_result in zip(self._open, self._in_result):
+                if in_result:
+                    open_field.result += text
+            if self.track_text and self._texts:
+                self._texts[-1].append(text)
+        elif self.track_text and self._texts:
+            _append_run_text(run, self._texts[-1])
+
+    def _on_fld_char(self, kind: Optional[str], ctx) -> None:
+        if kind == "begin":
+            new = Field(
+                paragraph_index=ctx.paragraph_index,
+                preceding_text="".join(self._texts[-1]) if self.track_text and self._texts else "",
+            )
+            self.fields.append(new)
+            self._open.append(new)
+            self._in_result.append(False)
+        elif kind == "separate" and self._open:
+            self._in_result[-1] = True
+        elif kind == "end" and self._open:
+            closed = self._open.pop()
+            self._in_result.pop()
+            closed.instruction = closed.instruction.strip()
+            closed.end_paragraph_index = ctx.paragraph_index
+
+    def _text_before(self, paragraph: etree._Element, simple: etree._Element) -> str:
+        """Text of the runs of `paragraph` that precede `simple`."""
+        parts: List[str] = []
+        for node in paragraph.iter(_R, _FLD_SIMPLE):
+            if node is simple:
+                break
+            if node.tag == _R and next(node.iterancestors(_FLD_SIMPLE), None) is None:
+                _append_run_text(node, parts)
+        return "".join(parts)
+
+
+def collect_fields(part: etree._Element, track_text: bool = True) -> List[Field]:
+    """
+    Fields of a small in-memory part (header, footer, footnotes).
+
+    Paragraph rows count the w:p elements of the part in document order.
+    """
+    collector = FieldCollector(track_text=track_text)
+    BodyWalker([collector]).walk(list(part))
+    return collector.fields
+
+
+def is_broken_reference(field_: Field) -> bool:
+    """True if the cached result is Word's "reference source not found" text."""
+    result = field_.result.lower()
+    return any(marker in result for marker in BROKEN_REFERENCE_MARKERS)
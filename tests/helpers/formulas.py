@@ -0,0 +1,219 @@
+"""
+Display formulas (OMML) with their numbers and neighbouring paragraphs.
+
+`FormulaCollector` is a body rule for the shared `BodyWalker` pass. A
+formula is a paragraph with an m:oMathPara or m:oMath child; only the
+direct children of w:p are looked at, so the cost is a few `find` calls per
+paragraph. Formulas inside running text ("где x – ...") are skipped: a
+display formula is a paragraph whose own text is empty or only its number.
+
+The rule stores what the later checks need from the element (number
+alignment, spacing before/after) while it is available, which keeps the
+rule usable on streamed documents. `build_formula_index` then reads the
+`ParagraphTable` around every formula only:
+
+- the number "(N)" / "(2.1)" after the formula (a tab usually moves it to
+  the right margin), in the next cell for a formula laid out in a table,
+  or Word's own equation number "#(N)" inside the formula;
+- the paragraphs just above and below (blank line or spacing);
+- the explanation "где x – ..." below the formula.
+
+All of this is O(number of formulas) on top of the walk.
+"""
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from lxml import etree
+
+from tests.helpers.ooxml_utils import W
+from tests.helpers.paragraphs import ParagraphTable
+
+
+M = "{http://schemas.openxmlformats.org/officeDocument/2006/math}"
+
+_O_MATH_PARA = M + "oMathPara"
+_O_MATH = M + "oMath"
+_M_T = M + "t"
+_PTAB = W + "ptab"
+
+# Number after a formula: "(3)", "(2.1)"
+_NUMBER_RE = re.compile(r"^\((\d+(?:\.\d+)?)\)$")
+# Word's equation numbering: "...#(3)" inside the equation
+_EQUATION_NUMBER_RE = re.compile(r"#\s*\((\d+(?:\.\d+)?)\)\s*$")
+# Something meant as a number: "3", "(3).", "[3]", "3)"
+_NUMBER_LIKE_RE = re.compile(r"^[\[(]?\d+(?:\.\d+)?[\])]?\.?$")
+# Explanation line: "где x – ...", "Где: x – ..."
+_WHERE_RE = re.compile(r"^где(?=[\s:,]|$)", re.IGNORECASE)
+_WHERE_COLON_RE = re.compile(r"^где\s*:", re.IGNORECASE)
+# "где" left at the end of the formula paragraph
+_INLINE_WHERE_RE = re.compile(r"(?:^|[\s,])где\s*:?\s*$", re.IGNORECASE)
+# A symbol being explained without "где": "x – скорость, м/с"
+_SYMBOL_LINE_RE = re.compile(r"^\S{1,12}\s+[–—-]\s+\S")
+
+# Spacing (twips) that replaces a blank line: one line of 12 pt
+BLANK_LINE_SPACING = 240
+
+
+@dataclass
+class Formula:
+    """One display formula."""
+    # Paragraph row of the formula
+    row: int
+    # Laid out in a table (formula and number in separate cells)
+    in_table: bool = False
+    # Paragraph alignment and whether a right tab stop / right w:ptab exists
+    jc: str = "left"
+    right_tab: bool = False
+    # w:spacing before/after in twips (0 if not set)
+    space_before: int = 0
+    space_after: int = 0
+    # Number written in the equation itself (Word's "#(N)")
+    equation_number: Optional[str] = None
+    # Filled by `build_formula_index`:
+    # number without brackets ("2.1"); None if there is none
+    number: Optional[str] = None
+    # Text standing where the number should be, if it is not "(N)"
+    bad_number: Optional[str] = None
+    # Number is at the right margin
+    number_right: bool = True
+    # Blank line (or enough spacing) above / below
+    blank_above: bool = True
+    blank_below: bool = True
+    # Row of the explanation paragraph ("где ..."), None if there is none
+    where_row: Optional[int] = None
+
+
+@dataclass
+class FormulaIndex:
+    """Display formulas of a document and problems of their explanations."""
+    formulas: List[Formula] = field(default_factory=list)
+    # Rows of "где:" (colon after "где")
+    where_colon: List[int] = field(default_factory=list)
+    # Rows where the symbols are explained without "где"
+    where_missing: List[int] = field(default_factory=list)
+    # Rows where "где" continues the formula paragraph instead of a new line
+    where_inline: List[int] = field(default_factory=list)
+
+
+def _twips(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class FormulaCollector:
+    """Body rule recording display formula paragraphs."""
+
+    def __init__(self, resolver):
+        self.resolver = resolver
+        self.formulas: List[Formula] = []
+
+    def on_paragraph(self, paragraph: etree._Element, ctx) -> None:
+        math = paragraph.find(_O_MATH_PARA)
+        if math is None:
+            math = paragraph.find(_O_MATH)
+            if math is None:
+                return
+        props = self.resolver.paragraph_properties(paragraph)
+        spacing = props.get("spacing", {})
+        equation_text = "".join(node.text or "" for node in math.iter(_M_T))
+        equation_number = _EQUATION_NUMBER_RE.search(equation_text)
+        self.formulas.append(Formula(
+            row=ctx.paragraph_index,
+            in_table=ctx.in_table,
+            jc=props.get("jc") or "left",
+            right_tab=(
+                any(alignment in ("right", "end") for _, alignment in props.get("tabs", ()))
+                or any(ptab.get(W + "alignment") == "right" for ptab in paragraph.iter(_PTAB))
+            ),
+            space_before=_twips(spacing.get("before")),
+            space_after=_twips(spacing.get("after")),
+            equation_number=equation_number.group(1) if equation_number else None,
+        ))
+
+
+def build_formula_index(table: ParagraphTable, collector: FormulaCollector,
+                        table_spans: Sequence[Tuple[int, int]] = ()) -> FormulaIndex:
+    """
+    Attach numbers, neighbours and explanations to the collected formulas.
+
+    Args:
+        table: Paragraph table of the document
+        collector: Formula rows from the same walk
+        table_spans: (first row, last row) of every top-level table, in
+            order; neighbours of a formula laid out in a table are the
+            paragraphs around that table
+    """
+    index = FormulaIndex()
+    texts = table.texts
+    formula_rows = {formula.row for formula in collector.formulas}
+    total = len(texts)
+    starts = [start for start, _ in table_spans]
+
+    for formula in collector.formulas:
+        row = formula.row
+        text = texts[row]
+        inline_where = _INLINE_WHERE_RE.search(text)
+        if inline_where:
+            text = text[:inline_where.start()].rstrip(" ,")
+        # The number usually follows the last tab
+        head, _, tail = text.rpartition("\t")
+        head, tail = head.strip(), tail.strip()
+        if head or (tail and not _NUMBER_LIKE_RE.match(tail)):
+            continue  # formula inside running text
+        index.formulas.append(formula)
+        if inline_where:
+            index.where_inline.append(row)
+
+        first = last = row
+        if formula.in_table:
+            position = bisect_right(starts, row) - 1
+            if position >= 0 and table_spans[position][1] >= row:
+                first, last = table_spans[position]
+
+        if formula.equation_number is not None:
+            formula.number = formula.equation_number
+        elif formula.in_table:
+            # Formula | (N) in the next cell of the same table row
+            candidate = texts[row + 1].strip() if row < last else ""
+            if candidate:
+                _set_number(formula, candidate)
+        elif tail:
+            _set_number(formula, tail)
+            formula.number_right = formula.jc in ("right", "end") or ("\t" in text and formula.right_tab)
+
+        above = first - 1
+        formula.blank_above = (
+            above < 0 or not texts[above].strip() or above in formula_rows
+            or formula.space_before >= BLANK_LINE_SPACING
+        )
+
+        below = last + 1
+        next_text = texts[below].strip() if below < total else ""
+        if below < total and not next_text and below + 1 < total:
+            explanation = below + 1
+        else:
+            explanation = below
+        explanation_text = texts[explanation].strip() if explanation < total else ""
+        if _WHERE_RE.match(explanation_text):
+            formula.where_row = explanation
+            if _WHERE_COLON_RE.match(explanation_text):
+                index.where_colon.append(explanation)
+        elif not inline_where and explanation not in formula_rows and _SYMBOL_LINE_RE.match(explanation_text):
+            index.where_missing.append(explanation)
+        formula.blank_below = (
+            below >= total or not next_text or below in formula_rows
+            or formula.where_row == below or formula.space_after >= BLANK_LINE_SPACING
+        )
+    return index
+
+
+def _set_number(formula: Formula, text: str) -> None:
+    match = _NUMBER_RE.match(text)
+    if match:
+        formula.number = match.group(1)
+    else:
+        formula.bad_number = text
@@ -0,0 +1,96 @@
+"""
+Cheap issue locations ("раздел 2.3, абзац 147").
+
+`ParagraphLocator` is built once per document from its `ParagraphTable`:
+
+- an element -> paragraph index dict (in-memory trees only), so
+  `index_of` is O(1) instead of rebuilding `.//w:p` and calling
+  `list.index()` for every issue;
+- the sorted rows of heading-like paragraphs with a precomputed label each
+  (the list label for auto-numbered headings), so the enclosing section of any paragraph is one `bisect`.
+
+Paragraph numbers are 1-based in messages and count every w:p in document
+order (the same numbering as `WalkContext.paragraph_index` + 1).
+"""
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional
+
+from lxml import etree
+
+from tests.helpers.ooxml_utils import W, get_body_elements
+from tests.helpers.paragraphs import ParagraphTable, ParagraphTableBuilder
+from tests.helpers.rules import BodyWalker
+
+
+_SECTION_NUMBER_RE = re.compile(r"\s*(\d+(?:\.\d+)*)\.?(?:\s|$)")
+_LABEL_MAX_CHARS = 40
+
+
+def _heading_label(text: str, list_label: Optional[str] = None) -> str:
+    """Section label of a heading: its number ("2.3") or quoted title."""
+    for source in (list_label, text):
+        match = _SECTION_NUMBER_RE.match(source or "")
+        if match:
+            return match.group(1)
+    title = " ".join(text.split())
+    if len(title) > _LABEL_MAX_CHARS:
+        title = title[:_LABEL_MAX_CHARS] + "..."
+    return f"«{title}»"
+
+
+class ParagraphLocator:
+    """
+    Maps paragraphs to indices and enclosing sections.
+
+    Args:
+        table: Paragraph table of the document
+        paragraphs: The same w:p elements in document order, if the tree is
+            kept in memory (enables `index_of`)
+    """
+
+    def __init__(self, table: ParagraphTable, paragraphs: Optional[Iterable[etree._Element]] = None):
+        self.table = table
+        self.heading_rows: List[int] = table.heading_rows()
+        self._labels: List[str] = [
+            _heading_label(table.texts[row], table.labels[row]) for row in self.heading_rows
+        ]
+        self._index: Dict[etree._Element, int] = (
+            {element: i for i, element in enumerate(paragraphs)} if paragraphs is not None else {}
+        )
+
+    @classmethod
+    def from_document(cls, root: etree._Element, resolver) -> "ParagraphLocator":
+        """Build the table and the index for an in-memory document.xml tree."""
+        builder = ParagraphTableBuilder(resolver)
+        BodyWalker([builder]).walk(get_body_elements(root))
+        return cls(builder.table, root.iter(W + "p"))
+
+    def index_of(self, paragraph: etree._Element) -> int:
+        """0-based index of a w:p element, or -1 if it is not indexed."""
+        return self._index.get(paragraph, -1)
+
+    def heading_row(self, row: int) -> Optional[int]:
+        """Row of the nearest heading at or before `row`, or None."""
+        position = bisect_right(self.heading_rows, row) - 1
+        return self.heading_rows[position] if position >= 0 else None
+
+    def heading_text(self, row: int) -> str:
+        """Text of the nearest heading at or before `row` ("" if none)."""
+        heading = self.heading_row(row)
+        return self.table.texts[heading].strip() if heading is not None else ""
+
+    def describe(self, row: int) -> str:
+        """Human-readable location: "раздел 2.3, абзац 147"."""
+        position = bisect_right(self.heading_rows, row) - 1
+        if position < 0:
+            return f"абзац {row + 1}"
+        return f"раздел {self._labels[position]}, абзац {row + 1}"
+
+    def describe_rows(self, rows: List[int], limit: int = 3) -> str:
+        """Locations of the first `limit` distinct rows, with a count of the rest."""
+        rows = list(dict.fromkeys(rows))
+        text = "; ".join(self.describe(row) for row in rows[:limit])
+        if len(rows) > limit:
+            text += f" (и ещё {len(rows) - limit})"
+        return text
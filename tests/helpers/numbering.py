@@ -0,0 +1,283 @@
+"""
+Rendered numbers of auto-numbered paragraphs (word/numbering.xml).
+
+A list paragraph only carries w:numPr (numId, ilvl); the text Word shows
+("1.2", "А)", "•") comes from numbering.xml:
+
+    w:num (numId) -> w:abstractNum (level definitions) + w:lvlOverride
+
+`NumberingResolver` parses every abstractNum/level once (w:numStyleLink is
+followed to the abstractNum with the matching w:styleLink) and keeps the
+running counters, so `label(num_id, ilvl)` called for the numbered
+paragraphs in document order returns the number as rendered. As in Word,
+w:num instances of one abstractNum share its counters (a list split by
+copy-paste goes on "1, 2"); only a w:num with a w:startOverride counts on
+its own. The
+`ParagraphTableBuilder` does this during the shared walk and stores the
+result in `ParagraphTable.labels`.
+
+`heading_number` combines the rendered label with a number typed into the
+heading text, so checks see "2.1" whether it was typed or auto-numbered.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from tests.helpers.ooxml_utils import W
+
+
+_LEVEL_REF_RE = re.compile(r"%([1-9])")
+_TYPED_NUMBER_RE = re.compile(r"^\s*(\d+(?:\.\d+)*)(\.?)(?=\s|$)")
+
+_RUSSIAN_UPPER = "АБВГДЕЖЗИКЛМНОПРСТУФХЦЧШЩЭЮЯ"
+_ROMAN = (
+    (1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"),
+    (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I"),
+)
+
+
+def _int_attr(node: Optional[etree._Element], default: int) -> int:
+    if node is None:
+        return default
+    try:
+        return int(node.get(W + "val"))
+    except (TypeError, ValueError):
+        return default
+
+
+def _int_attr_raw(value: Optional[str]) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _letters(value: int, alphabet: str) -> str:
+    """Word's letter numbering: A..Z, AA..ZZ, AAA..."""
+    if value < 1:
+        return ""
+    index = (value - 1) % len(alphabet)
+    return alphabet[index] * ((value - 1) // len(alphabet) + 1)
+
+
+def _roman(value: int) -> str:
+    parts = []
+    for number, symbol in _ROMAN:
+        while value >= number:
+            parts.append(symbol)
+            value -= number
+    return "".join(parts)
+
+
+def format_number(value: int, num_fmt: str) -> str:
+    """Render one counter in a w:numFmt."""
+    if num_fmt == "upperLetter":
+        return _letters(value, "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    if num_fmt == "lowerLetter":
+        return _letters(value, "abcdefghijklmnopqrstuvwxyz")
+    if num_fmt == "russianUpper":
+        return _letters(value, _RUSSIAN_UPPER)
+    if num_fmt == "russianLower":
+        return _letters(value, _RUSSIAN_UPPER.lower())
+    if num_fmt == "upperRoman":
+        return _roman(value)
+    if num_fmt == "lowerRoman":
+        return _roman(value).lower()
+    if num_fmt in ("none", "bullet"):
+        return ""
+    if num_fmt == "decimalZero":
+        return f"{value:02d}"
+    return str(value)
+
+
+@dataclass(frozen=True)
+class LevelDefinition:
+    """One w:lvl of an abstractNum."""
+    start: int = 1
+    num_fmt: str = "decimal"
+    lvl_text: str = ""
+    # w:isLgl: show all levels of this label as decimal numbers
+    legal: bool = False
+    # w:lvlRestart: restart after this level (0 = never); None = after any higher level
+    restart: Optional[int] = None
+
+
+def _level_definition(lvl: etree._Element) -> LevelDefinition:
+    num_fmt = lvl.find(W + "numFmt")
+    lvl_text = lvl.find(W + "lvlText")
+    restart = lvl.find(W + "lvlRestart")
+    return LevelDefinition(
+        start=_int_attr(lvl.find(W + "start"), 1),
+        num_fmt=num_fmt.get(W + "val", "decimal") if num_fmt is not None else "decimal",
+        lvl_text=lvl_text.get(W + "val", "") if lvl_text is not None else "",
+        legal=lvl.find(W + "isLgl") is not None,
+        restart=_int_attr(restart, 0) if restart is not None else None,
+    )
+
+
+@dataclass
+class _ListState:
+    """Level definitions of one w:num and the running counters it uses."""
+    levels: Dict[int, LevelDefinition]
+    # Shared by all w:num of the abstractNum unless the num restarts it
+    counters: Dict[int, int] = field(default_factory=dict)
+
+
+class NumberingResolver:
+    """
+    Computes the rendered label of numbered paragraphs, in document order.
+
+    Args:
+        numbering: Root of word/numbering.xml (None: no numbered lists)
+    """
+
+    def __init__(self, numbering: Optional[etree._Element]):
+        self._abstract: Dict[str, Dict[int, LevelDefinition]] = {}
+        self._nums: Dict[str, Tuple[Optional[str], Dict[int, LevelDefinition], Dict[int, int]]] = {}
+        self._lists: Dict[str, _ListState] = {}
+        # ("abstract", abstractNumId) or ("num", numId) -> counters per level
+        self._counters: Dict[Tuple[str, Optional[str]], Dict[int, int]] = {}
+        if numbering is None:
+            return
+
+        style_links: Dict[str, str] = {}
+        num_style_links: Dict[str, str] = {}
+        for abstract in numbering.iterfind(W + "abstractNum"):
+            abstract_id = abstract.get(W + "abstractNumId")
+            if abstract_id is None:
+                continue
+            self._abstract[abstract_id] = {
+                _int_attr_raw(lvl.get(W + "ilvl")): _level_definition(lvl)
+                for lvl in abstract.iterfind(W + "lvl")
+            }
+            link = abstract.find(W + "styleLink")
+            if link is not None and link.get(W + "val"):
+                style_links[link.get(W + "val")] = abstract_id
+            link = abstract.find(W + "numStyleLink")
+            if link is not None and link.get(W + "val"):
+                num_style_links[abstract_id] = link.get(W + "val")
+        # A numStyleLink abstractNum takes its levels from the linked definition.
+        for abstract_id, style in num_style_links.items():
+            target = style_links.get(style)
+            if target is not None and target != abstract_id:
+                self._abstract[abstract_id] = self._abstract[target]
+
+        for num in numbering.iterfind(W + "num"):
+            num_id = num.get(W + "numId")
+            if num_id is None:
+                continue
+            abstract_ref = num.find(W + "abstractNumId")
+            abstract_id = abstract_ref.get(W + "val") if abstract_ref is not None else None
+            overrides: Dict[int, LevelDefinition] = {}
+            start_overrides: Dict[int, int] = {}
+            for override in num.iterfind(W + "lvlOverride"):
+                ilvl = _int_attr_raw(override.get(W + "ilvl"))
+                lvl = override.find(W + "lvl")
+                if lvl is not None:
+                    overrides[ilvl] = _level_definition(lvl)
+                start = override.find(W + "startOverride")
+                if start is not None:
+                    start_overrides[ilvl] = _int_attr(start, 1)
+            self._nums[num_id] = (abstract_id, overrides, start_overrides)
+
+    @classmethod
+    def from_model(cls, model) -> "NumberingResolver":
+        """Build a resolver from the numbering part of a DocumentModel."""
+        return cls(model.numbering)
+
+    def _state(self, num_id: str) -> Optional[_ListState]:
+        state = self._lists.get(num_id)
+        if state is None:
+            entry = self._nums.get(num_id)
+            if entry is None:
+                return None
+            abstract_id, overrides, start_overrides = entry
+            levels = dict(self._abstract.get(abstract_id, {}))
+            levels.update(overrides)
+            for ilvl, start in start_overrides.items():
+                base = levels.get(ilvl, LevelDefinition())
+                levels[ilvl] = LevelDefinition(start, base.num_fmt, base.lvl_text, base.legal, base.restart)
+            key = ("num", num_id) if start_overrides or abstract_id is None else ("abstract", abstract_id)
+            state = _ListState(levels, self._counters.setdefault(key, {}))
+            self._lists[num_id] = state
+        return state
+
+    def level(self, num_id: str, ilvl: int) -> Optional[LevelDefinition]:
+        """Effective definition of a list level (overrides applied)."""
+        state = self._state(num_id)
+        return state.levels.get(ilvl) if state is not None else None
+
+    def label(self, num_id: str, ilvl: int) -> Optional[str]:
+        """
+        Advance the counter of (num_id, ilvl) and return the rendered label.
+
+        Must be called once per numbered paragraph, in document order.
+        Returns None for unknown lists or levels.
+        """
+        state = self._state(num_id)
+        if state is None:
+            return None
+        definition = state.levels.get(ilvl)
+        if definition is None:
+            return None
+        counters = state.counters
+        counters[ilvl] = counters.get(ilvl, definition.start - 1) + 1
+        # Deeper levels restart after this one (unless w:lvlRestart says otherwise).
+        for deeper in [level for level in counters if level > ilvl]:
+            restart = state.levels.get(deeper, LevelDefinition()).restart
+            if restart is None or ilvl < restart:
+                del counters[deeper]
+        if definition.num_fmt == "bullet":
+            return definition.lvl_text
+
+        def render(match: "re.Match") -> str:
+            level = int(match.group(1)) - 1
+            level_def = state.levels.get(level, LevelDefinition())
+            value = counters.get(level, level_def.start)
+            return format_number(value, "decimal" if definition.legal else level_def.num_fmt)
+
+        return _LEVEL_REF_RE.sub(render, definition.lvl_text)
+
+
+@dataclass(frozen=True)
+class HeadingNumber:
+    """Number of a heading as the reader sees it."""
+    # Digits and dots without a trailing dot: "2.1"
+    number: str
+    # True if a dot follows the number ("2.1.")
+    trailing_dot: bool
+    # True if it comes from list numbering rather than the text
+    auto: bool
+
+    @property
+    def depth(self) -> int:
+        return self.number.count(".") + 1
+
+
+def heading_number(text: str, label: Optional[str]) -> Optional[HeadingNumber]:
+    """
+    Number of a heading from its list label or its typed text.
+
+    Only decimal numbers ("1", "2.3", "1.1.1.") count; letters and bullets
+    are not heading numbers.
+    """
+    for source, auto in ((label, True), (text, False)):
+        if not source:
+            continue
+        match = _TYPED_NUMBER_RE.match(source)
+        if match:
+            return HeadingNumber(match.group(1), bool(match.group(2)), auto)
+    return None
+
+
+def numbered_headings(table, rows: List[int]) -> Dict[int, HeadingNumber]:
+    """Heading numbers of the given paragraph table rows (unnumbered rows omitted)."""
+    numbers: Dict[int, HeadingNumber] = {}
+    labels = table.labels
+    for row in rows:
+        number = heading_number(table.texts[row], labels[row])
+        if number is not None:
+            numbers[row] = number
+    return numbers
@@ -0,0 +1,255 @@
+"""
+Index of figures and tables: captions, anchors and mentions in the text.
+
+`ObjectAnchorCollector` is a body rule that records, in the shared
+`BodyWalker` pass, where drawings (w:drawing, w:pict, w:object) and
+top-level tables (w:tbl) are. `build_object_index` then reads the revised
+text of the `ParagraphTable` once (SEQ and REF numbers in w:fldSimple
+included) and collects:
+
+- captions "Рисунок N – ...", "Таблица N – ..." (N may be "2.3") and
+  continuations "Продолжение таблицы N";
+- mentions in the text: "рисунок 2", "(рис. 2.1)", "таблицы 3 и 4",
+  "рисунках 1–3" (numbers after the word are expanded);
+- for each caption the object it belongs to: the drawing just above a
+  figure caption, the table just below a table caption.
+
+Only anchors, captions and first mentions are stored, so memory is
+proportional to the number of objects, not paragraphs. Placement is
+judged by paragraph order; pages are not rendered.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from tests.helpers.ooxml_utils import W
+from tests.helpers.paragraphs import ParagraphTable
+
+
+FIGURE = "figure"
+TABLE = "table"
+
+_DRAWINGS = {W + "drawing", W + "pict", W + "object"}
+
+_NUMBER = r"\d+(?:\.\d+)?"
+_CAPTION_RE = re.compile(rf"^(?:(рисунок)|(таблица))\s+({_NUMBER})\s*[—–-]")
+_CONTINUATION_RE = re.compile(rf"^(?:продолжение|окончание)\s+таблицы\s+({_NUMBER})")
+# "рисунок 2", "рис. 2.1", "рисунках 1 и 2", "таблицы 3–5", "табл. 4"
+_MENTION_RE = re.compile(
+    rf"(?<![а-яё])(?:(рис(?:\.|ун(?:ок|ка|ке|ком|ки|ков|кам|ками|ках)))|"
+    rf"(табл(?:\.|иц(?:а|ы|е|у|ей|ам|ами|ах)?)))\s*"
+    rf"({_NUMBER}(?:\s*(?:,|и|[—–-])\s*{_NUMBER})*)"
+)
+_MENTION_NUMBER_RE = re.compile(rf"({_NUMBER})|([—–-])")
+
+# How many paragraphs may separate a caption from its drawing or table
+CAPTION_DISTANCE = 3
+
+
+def _expand_numbers(text: str) -> List[str]:
+    """Numbers of one mention tail: "1, 3–5" -> 1, 3, 4, 5 ("2.1–2.3" too)."""
+    numbers: List[str] = []
+    pending_range = False
+    for number, dash in _MENTION_NUMBER_RE.findall(text):
+        if dash:
+            pending_range = bool(numbers)
+            continue
+        if pending_range:
+            first = numbers[-1]
+            prefix, _, start = first.rpartition(".")
+            end_prefix, _, end = number.rpartition(".")
+            if prefix == end_prefix and int(start) < int(end) <= int(start) + 50:
+                numbers.extend(
+                    f"{prefix}.{value}" if prefix else str(value)
+                    for value in range(int(start) + 1, int(end))
+                )
+            pending_range = False
+        numbers.append(number)
+    return numbers
+
+
+def sequence_gaps(numbers: List[str]) -> List[Tuple[str, int]]:
+    """
+    (expected number, position) where a numbering skips or goes back.
+
+    Through numbering goes 1, 2, 3...; numbering by chapter ("2.1")
+    restarts at 1 when the chapter number changes. Repeated numbers are
+    skipped (they are duplicates, not gaps).
+    """
+    result = []
+    seen = set()
+    previous: Optional[Tuple[str, int]] = None
+    for position, number in enumerate(numbers):
+        if number in seen:
+            continue
+        seen.add(number)
+        chapter, _, ordinal = number.rpartition(".")
+        value = int(ordinal)
+        if previous is not None and chapter == previous[0]:
+            expected = previous[1] + 1
+        else:
+            expected = 1 if chapter or previous is None else previous[1] + 1
+        if value != expected:
+            result.append((f"{chapter}.{expected}" if chapter else str(expected), position))
+        previous = (chapter, value)
+    return result
+
+
+@dataclass
+class CaptionedObject:
+    """One figure or table."""
+    kind: str
+    # Number as written: "3" or "2.3"
+    number: str
+    # Row of the caption paragraph
+    caption_row: int
+    # Row of the drawing / first row of the table (caption row if not found)
+    object_row: int
+    # Row of the first mention in the text, None if never mentioned
+    first_mention: Optional[int] = None
+
+
+@dataclass
+class ObjectIndex:
+    """Figures, tables and continuations of one document."""
+    figures: List[CaptionedObject] = field(default_factory=list)
+    tables: List[CaptionedObject] = field(default_factory=list)
+    # (table number, row) of "Продолжение таблицы N"
+    continuations: List[Tuple[str, int]] = field(default_factory=list)
+
+    def objects(self, kind: str) -> List[CaptionedObject]:
+        return self.figures if kind == FIGURE else self.tables
+
+    def _first_per_number(self, kind: str) -> List[CaptionedObject]:
+        """Objects without repeated numbers (mentions name a number, not a caption)."""
+        seen = set()
+        first = []
+        for obj in self.objects(kind):
+            if obj.number not in seen:
+                seen.add(obj.number)
+                first.append(obj)
+        return first
+
+    def unreferenced(self, kind: str) -> List[CaptionedObject]:
+        """Objects never mentioned in the text."""
+        return [obj for obj in self._first_per_number(kind) if obj.first_mention is None]
+
+    def before_first_mention(self, kind: str) -> List[CaptionedObject]:
+        """Objects placed above the paragraph that first mentions them."""
+        return [
+            obj for obj in self._first_per_number(kind)
+            if obj.first_mention is not None and obj.first_mention > obj.object_row
+        ]
+
+    def duplicates(self, kind: str) -> List[CaptionedObject]:
+        """Second and later captions with an already used number."""
+        seen = set()
+        repeated = []
+        for obj in self.objects(kind):
+            if obj.number in seen:
+                repeated.append(obj)
+            seen.add(obj.number)
+        return repeated
+
+    def gaps(self, kind: str) -> List[Tuple[str, CaptionedObject]]:
+        """(expected number, object) where numbering skips or goes back (see `sequence_gaps`)."""
+        objects = self.objects(kind)
+        return [(expected, objects[position])
+                for expected, position in sequence_gaps([obj.number for obj in objects])]
+
+    def orphan_continuations(self) -> List[Tuple[str, int]]:
+        """Continuations of a table number that has no caption above them."""
+        captioned: Dict[str, int] = {}
+        for obj in self.tables:
+            captioned.setdefault(obj.number, obj.caption_row)
+        return [(number, row) for number, row in self.continuations
+                if number not in captioned or captioned[number] > row]
+
+
+class ObjectAnchorCollector:
+    """Body rule recording drawing paragraphs and top-level table rows."""
+
+    def __init__(self):
+        self.drawing_rows: List[int] = []
+        # (first row inside the table, last row inside the table)
+        self.table_rows: List[Tuple[int, int]] = []
+        self._table_start = -1
+
+    def on_run(self, run: etree._Element, ctx) -> None:
+        for child in run:
+            if child.tag in _DRAWINGS:
+                if not self.drawing_rows or self.drawing_rows[-1] != ctx.paragraph_index:
+                    self.drawing_rows.append(ctx.paragraph_index)
+                return
+
+    def on_table(self, table: etree._Element, ctx) -> None:
+        if ctx.table_depth == 1:
+            self._table_start = ctx.paragraph_index + 1
+
+    def on_table_end(self, table: etree._Element, ctx) -> None:
+        if ctx.table_depth == 1:
+            self.table_rows.append((self._table_start, ctx.paragraph_index))
+
+
+def build_object_index(table: ParagraphTable, anchors: ObjectAnchorCollector) -> ObjectIndex:
+    """
+    Collect captions and mentions in one pass and attach captions to anchors.
+
+    Args:
+        table: Paragraph table of the document
+        anchors: Drawing and table positions from the same walk
+    """
+    index = ObjectIndex()
+    # First mention row per (kind, number)
+    mentions: Dict[Tuple[str, str], int] = {}
+
+    # Revised text: caption numbers are often SEQ fields in w:fldSimple
+    for row, lowered in enumerate(table.revised_lowered):
+        if "рис" not in lowered and "табл" not in lowered:
+            continue
+        text = lowered.lstrip()
+        caption_end = 0
+        if table.body_level[row]:
+            caption = _CAPTION_RE.match(text)
+            continuation = _CONTINUATION_RE.match(text) if caption is None else None
+            if caption is not None:
+                kind = FIGURE if caption.group(1) else TABLE
+                index.objects(kind).append(CaptionedObject(kind, caption.group(3), row, row))
+                caption_end = caption.end()
+            elif continuation is not None:
+                index.continuations.append((continuation.group(1), row))
+                caption_end = continuation.end()
+        for match in _MENTION_RE.finditer(text, caption_end):
+            kind = FIGURE if match.group(1) else TABLE
+            for number in _expand_numbers(match.group(3)):
+                mentions.setdefault((kind, number), row)
+
+    _attach_anchors(index, anchors)
+    for kind in (FIGURE, TABLE):
+        for obj in index.objects(kind):
+            obj.first_mention = mentions.get((kind, obj.number))
+    return index
+
+
+def _attach_anchors(index: ObjectIndex, anchors: ObjectAnchorCollector) -> None:
+    """Figure: nearest unclaimed drawing above its caption; table: nearest table below."""
+    drawings = anchors.drawing_rows
+    position = 0
+    claimed = -1
+    for obj in index.figures:
+        while position + 1 < len(drawings) and drawings[position + 1] <= obj.caption_row:
+            position += 1
+        if (drawings and position > claimed
+                and 0 <= obj.caption_row - drawings[position] <= CAPTION_DISTANCE):
+            obj.object_row = drawings[position]
+            claimed = position
+
+    starts = [start for start, _ in anchors.table_rows]
+    position = 0
+    for obj in index.tables:
+        while position < len(starts) and starts[position] <= obj.caption_row:
+            position += 1
+        if position < len(starts) and starts[position] - obj.caption_row <= CAPTION_DISTANCE:
+            obj.object_row = starts[position]
@@ -2,13 +2,14 @@
 Utilities for working with OOXML (Office Open XML) documents.
 
 Provides functions for:
-- Loading XML from .docx files
+- Loading XML from .docx files (once, via DocumentModel)
 - Converting units (twips ↔ mm, pt ↔ half-points)
 - Extracting formatting properties (margins, spacing, indents)
 """
 import zipfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, IO, Iterator, List, Union
 from lxml import etree
 
 
@@ -19,6 +20,9 @@ NS = {
     "wp": "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing",
 }
 
+# Clark-notation prefix for WordprocessingML tags (e.g. W + "p" == "{...}p")
+W = f"{{{NS['w']}}}"
+
 
 # Unit conversions
 # Word uses "twips" (twentieth of a point) for many measurements
@@ -60,28 +64,281 @@ def half_points_to_pt(half_points: int) -> float:
     return half_points / 2
 
 
-def load_xml(docx_path: Path, xml_path: str) -> etree._Element:
+class DocumentModel:
+    """
+    Single-open, lazily parsed view of a .docx archive.
+
+    The archive is opened once and read through its file handle, never loaded
+    into memory as a whole. Every XML part (document, styles, numbering,
+    settings, headers, relationships, ...) is parsed from a stream of its
+    member on first access and cached, so all checks share the same trees.
+
+    Usage:
+        with DocumentModel(path) as model:
+            margins = get_page_margins(model)
+            styles = model.styles
+    """
+
+    DOCUMENT = "word/document.xml"
+    STYLES = "word/styles.xml"
+    NUMBERING = "word/numbering.xml"
+    SETTINGS = "word/settings.xml"
+    DOCUMENT_RELS = "word/_rels/document.xml.rels"
+
+    def __init__(self, docx_path: Path):
+        self.path = Path(docx_path)
+        self._archive = zipfile.ZipFile(self.path, 'r')
+        self._names = self._archive.namelist()
+        self._parts: Dict[str, Optional[etree._Element]] = {}
+        self._locator = None
+
+    def __enter__(self) -> "DocumentModel":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the archive handle (parsed parts stay available)."""
+        self._archive.close()
+
+    @property
+    def names(self) -> List[str]:
+        """Names of all members in the archive."""
+        return list(self._names)
+
+    def has_part(self, xml_path: str) -> bool:
+        """Check whether the archive contains a member."""
+        return xml_path in self._names
+
+    def part_size(self, xml_path: str) -> int:
+        """Uncompressed size of a member in bytes (0 if missing)."""
+        if xml_path not in self._names:
+            return 0
+        return self._archive.getinfo(xml_path).file_size
+
+    def open_part(self, xml_path: str) -> IO[bytes]:
+        """Open a member as a binary stream without parsing it."""
+        return self._archive.open(xml_path)
+
+    def part(self, xml_path: str) -> Optional[etree._Element]:
+        """
+        Parse an XML part at most once.
+
+        Returns:
+            Parsed root element, or None if the part does not exist
+        """
+        if xml_path not in self._parts:
+            if xml_path in self._names:
+                with self._archive.open(xml_path) as stream:
+                    self._parts[xml_path] = etree.parse(stream).getroot()
+            else:
+                self._parts[xml_path] = None
+        return self._parts[xml_path]
+
+    @property
+    def document(self) -> etree._Element:
+        """Main document XML (word/document.xml)."""
+        root = self.part(self.DOCUMENT)
+        if root is None:
+            raise KeyError(f"There is no item named '{self.DOCUMENT}' in the archive")
+        return root
+
+    @property
+    def styles(self) -> Optional[etree._Element]:
+        """Styles XML (word/styles.xml), if present."""
+        return self.part(self.STYLES)
+
+    @property
+    def numbering(self) -> Optional[etree._Element]:
+        """Numbering definitions (word/numbering.xml), if present."""
+        return self.part(self.NUMBERING)
+
+    @property
+    def settings(self) -> Optional[etree._Element]:
+        """Document settings (word/settings.xml), if present."""
+        return self.part(self.SETTINGS)
+
+    @property
+    def rels(self) -> Optional[etree._Element]:
+        """Relationships of the main document part, if present."""
+        return self.part(self.DOCUMENT_RELS)
+
+    @property
+    def header_names(self) -> List[str]:
+        """Archive names of all header parts (word/header*.xml)."""
+        return [
+            name for name in self._names
+            if name.startswith("word/header") and name.endswith(".xml")
+        ]
+
+    @property
+    def footer_names(self) -> List[str]:
+        """Archive names of all footer parts (word/footer*.xml)."""
+        return [
+            name for name in self._names
+            if name.startswith("word/footer") and name.endswith(".xml")
+        ]
+
+    def relationship_target(self, rel_id: str) -> Optional[str]:
+        """Archive name of a part referenced from document.xml by r:id."""
+        rels = self.rels
+        if rels is None:
+            return None
+        for rel in rels:
+            if rel.get("Id") == rel_id:
+                target = rel.get("Target", "")
+                return target.lstrip("/") if target.startswith("/") else "word/" + target
+        return None
+
+    @property
+    def headers(self) -> Dict[str, etree._Element]:
+        """Parsed header parts keyed by archive name."""
+        return {name: self.part(name) for name in self.header_names}
+
+    @property
+    def locator(self):
+        """
+        `ParagraphLocator` of document.xml (paragraph indices and sections).
+
+        Built on first use from one walk of the in-memory tree.
+        """
+        if self._locator is None:
+            from tests.helpers.locations import ParagraphLocator
+            from tests.helpers.styles import StyleResolver
+            self._locator = ParagraphLocator.from_document(
+                self.document, StyleResolver.from_model(self))
+        return self._locator
+
+
+DocumentSource = Union[Path, DocumentModel]
+XmlSource = Union[etree._Element, DocumentModel]
+
+
+def _document_root(doc_xml: XmlSource) -> etree._Element:
+    """Return the document root for an element or a DocumentModel."""
+    if isinstance(doc_xml, DocumentModel):
+        return doc_xml.document
+    return doc_xml
+
+
+def load_xml(docx_path: DocumentSource, xml_path: str) -> etree._Element:
     """
     Load and parse an XML file from a .docx archive.
     
     Args:
-        docx_path: Path to the .docx file
+        docx_path: Path to the .docx file or an open DocumentModel
         xml_path: Internal path to XML file (e.g., "word/document.xml")
     
     Returns:
         Parsed XML element tree
+
+    Raises:
+        KeyError: If the archive has no such member
     """
+    if isinstance(docx_path, DocumentModel):
+        root = docx_path.part(xml_path)
+        if root is None:
+            raise KeyError(f"There is no item named '{xml_path}' in the archive")
+        return root
     with zipfile.ZipFile(docx_path, 'r') as z:
         xml_content = z.read(xml_path)
     return etree.fromstring(xml_content)
 
 
-def get_document_xml(docx_path: Path) -> etree._Element:
+def get_body_elements(doc_xml: XmlSource) -> List[etree._Element]:
+    """Top-level children of w:body for an in-memory document."""
+    body = _document_root(doc_xml).find(W + "body")
+    return list(body) if body is not None else []
+
+
+@contextmanager
+def _open_part_stream(source: DocumentSource, xml_path: str) -> Iterator[IO[bytes]]:
+    """Open an archive member as a stream for a path or a DocumentModel."""
+    if isinstance(source, DocumentModel):
+        with source.open_part(xml_path) as stream:
+            yield stream
+        return
+    with zipfile.ZipFile(source, 'r') as z:
+        with z.open(xml_path) as stream:
+            yield stream
+
+
+def iter_body_elements(source: DocumentSource,
+                       xml_path: str = DocumentModel.DOCUMENT) -> Iterator[etree._Element]:
+    """
+    Stream top-level w:body children (w:p, w:tbl, w:sdt, w:sectPr, ...).
+
+    The ZIP member is fed straight into `lxml.etree.iterparse`. Each body
+    child is yielded once it is complete and cleared (together with its
+    already processed siblings) when the consumer asks for the next one,
+    so peak memory is bounded by the largest single body element rather
+    than by the document size.
+
+    Consumers must not keep references to yielded elements; copy what is
+    needed (e.g. `copy.deepcopy(sect_pr)`) before advancing.
+
+    Args:
+        source: Path to the .docx file or an open DocumentModel
+        xml_path: Internal path to the part with a w:body
+
+    Yields:
+        Top-level body elements in document order
+    """
+    body_tag = W + "body"
+    with _open_part_stream(source, xml_path) as stream:
+        for _, element in etree.iterparse(stream, events=("end",), huge_tree=True):
+            parent = element.getparent()
+            if parent is None or parent.tag != body_tag:
+                continue
+            yield element
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
+
+
+def get_paragraph_text(paragraph: etree._Element) -> str:
+    """
+    Get plain paragraph text the way python-docx `Paragraph.text` does.
+
+    Runs directly in the paragraph or inside w:hyperlink are included;
+    w:tab/w:ptab become "\t", line breaks (w:br without type or with
+    type="textWrapping", w:cr) become "\n", w:noBreakHyphen becomes "-".
+    """
+    parts = []
+    for run in paragraph:
+        if run.tag == W + "r":
+            _append_run_text(run, parts)
+        elif run.tag == W + "hyperlink":
+            for inner in run:
+                if inner.tag == W + "r":
+                    _append_run_text(inner, parts)
+    return "".join(parts)
+
+
+def _append_run_text(run: etree._Element, parts: List[str]) -> None:
+    """Append the text of a single w:r to `parts`."""
+    for child in run:
+        tag = child.tag
+        if tag == W + "t":
+            parts.append(child.text or "")
+        elif tag in (W + "tab", W + "ptab"):
+            parts.append("\t")
+        elif tag == W + "br":
+            if child.get(W + "type", "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag == W + "cr":
+            parts.append("\n")
+        elif tag == W + "noBreakHyphen":
+            parts.append("-")
+
+
+def get_document_xml(docx_path: DocumentSource) -> etree._Element:
     """Load the main document XML."""
     return load_xml(docx_path, "word/document.xml")
 
 
-def get_styles_xml(docx_path: Path) -> Optional[etree._Element]:
+def get_styles_xml(docx_path: DocumentSource) -> Optional[etree._Element]:
     """Load the styles XML (if it exists)."""
     try:
         return load_xml(docx_path, "word/styles.xml")
@@ -89,16 +346,22 @@ def get_styles_xml(docx_path: Path) -> Optional[etree._Element]:
         return None
 
 
-def get_section_properties(doc_xml: etree._Element) -> Optional[etree._Element]:
+def get_section_properties(doc_xml: XmlSource) -> Optional[etree._Element]:
     """
     Get the last section properties (w:sectPr) from document.
-    The last sectPr typically contains the main page setup.
+    The last sectPr typically contains the main page setup; every section
+    is indexed by `tests.helpers.sections.SectionIndexBuilder`.
+
+    A w:sectPr element (e.g. one taken from a streaming pass) is returned as is.
     """
-    sect_prs = doc_xml.xpath(".//w:sectPr", namespaces=NS)
+    root = _document_root(doc_xml)
+    if root.tag == W + "sectPr":
+        return root
+    sect_prs = root.xpath(".//w:sectPr", namespaces=NS)
     return sect_prs[-1] if sect_prs else None
 
 
-def get_page_margins(doc_xml: etree._Element) -> Optional[Dict[str, int]]:
+def get_page_margins(doc_xml: XmlSource) -> Optional[Dict[str, int]]:
     """
     Get page margins from document in twips.
     
@@ -123,7 +386,7 @@ def get_page_margins(doc_xml: etree._Element) -> Optional[Dict[str, int]]:
     return margins
 
 
-def get_page_size(doc_xml: etree._Element) -> Optional[Dict[str, Any]]:
+def get_page_size(doc_xml: XmlSource) -> Optional[Dict[str, Any]]:
     """
     Get page size from document.
     
@@ -237,7 +500,7 @@ def get_run_properties(run: etree._Element) -> Dict[str, Any]:
     return props
 
 
-def check_margins(doc_xml: etree._Element, 
+def check_margins(doc_xml: XmlSource, 
                  left_mm: float = 30,
                  right_mm: float = 10,
                  top_mm: float = 20,
@@ -247,7 +510,7 @@ def check_margins(doc_xml: etree._Element,
     Check if document margins match expected values (within tolerance).
     
     Args:
-        doc_xml: Document XML element
+        doc_xml: Document XML element or DocumentModel
         left_mm, right_mm, top_mm, bottom_mm: Expected margins in mm
         tolerance_mm: Allowed deviation in mm
     
@@ -276,38 +539,65 @@ def check_margins(doc_xml: etree._Element,
     return True
 
 
-def find_paragraph_index(doc_xml: etree._Element, paragraph: etree._Element) -> int:
+def get_locator(doc_xml: XmlSource):
+    """
+    `ParagraphLocator` for a document.
+
+    A DocumentModel builds its locator once and keeps it. For a bare
+    document.xml root nothing is cached: the locator holds the paragraph
+    elements, so a cache would keep the tree alive, and lxml elements cannot
+    be weakly referenced. Callers doing many lookups in a bare root build the
+    locator once here and pass it as `locator=` to the functions below.
+    """
+    if isinstance(doc_xml, DocumentModel):
+        return doc_xml.locator
+    from tests.helpers.locations import ParagraphLocator
+    from tests.helpers.styles import StyleResolver
+    return ParagraphLocator.from_document(doc_xml, StyleResolver(None))
+
+
+def find_paragraph_index(doc_xml: XmlSource, paragraph: etree._Element, locator=None) -> int:
     """
     Find the index of a paragraph in the document.
     
     Args:
-        doc_xml: Document XML root
+        doc_xml: Document XML root or DocumentModel
         paragraph: Paragraph element to find
+        locator: Locator from `get_locator(doc_xml)`; required for repeated
+            lookups in a bare root, which otherwise scan the paragraphs
         
     Returns:
         0-based index, or -1 if not found
     """
-    all_paragraphs = doc_xml.xpath(".//w:p", namespaces=NS)
-    try:
-        return all_paragraphs.index(paragraph)
-    except ValueError:
-        return -1
-
-
-def find_nearby_heading(doc_xml: etree._Element, paragraph_index: int) -> str:
+    if locator is not None:
+        return locator.index_of(paragraph)
+    if isinstance(doc_xml, DocumentModel):
+        return doc_xml.locator.index_of(paragraph)
+    # One lookup: a scan of the w:p elements is cheaper than building a locator
+    for index, element in enumerate(doc_xml.iter(W + "p")):
+        if element is paragraph:
+            return index
+    return -1
+
+
+def find_nearby_heading(doc_xml: XmlSource, paragraph_index: int, locator=None) -> str:
     """
     Find the nearest heading before the given paragraph.
     
     Args:
-        doc_xml: Document XML root
+        doc_xml: Document XML root or DocumentModel
         paragraph_index: Index of the paragraph
+        locator: Locator from `get_locator(doc_xml)`; required for repeated
+            lookups in a bare root, which otherwise build one per call
         
     Returns:
         Heading text or empty string
     """
-    from docx import Document
-    # This is a simplified version - would need document path
-    return ""
+    if paragraph_index < 0:
+        return ""
+    if locator is None:
+        locator = get_locator(doc_xml)
+    return locator.heading_text(paragraph_index)
 
 
 def get_paragraph_text_preview(paragraph: etree._Element, max_length: int = 50) -> str:
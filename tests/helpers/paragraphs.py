@@ -0,0 +1,237 @@
+"""
+Columnar paragraph table of a document, built once per check.
+
+Text-based rules (required sections, citations, captions, ...) used to
+re-join and re-lowercase the whole document text for every check.
+`ParagraphTable` is filled by `ParagraphTableBuilder` during the single
+`BodyWalker` pass and keeps one list per column, row i being the i-th w:p
+in document order (the same numbering as `WalkContext.paragraph_index`):
+
+- texts           python-docx `Paragraph.text` semantics
+- lowered         texts[i].lower() (same length as texts[i])
+- revised         text with tracked changes applied (w:ins kept, w:del and
+                  w:moveFrom dropped; runs in fields, content controls and
+                  smart tags included); what text rules read, so a caption
+                  number in w:fldSimple or a citation in w:ins is seen
+- revised_lowered revised[i] lower-cased (same length), built on first use
+- offsets         start of row i in `joined` ("\\n".join(texts))
+- style_ids       paragraph style id (default paragraph style if none)
+- outline_levels  effective outline level (0 = level 1), None for body text
+- table_depths    nesting level of tables (0 = body text)
+- body_level      True for direct children of w:body (python-docx
+                  `Document.paragraphs`)
+- bold            short paragraph whose text runs are all (effectively) bold
+- numbering       (numId, ilvl) of an auto-numbered list item, None otherwise
+- labels          rendered list number ("1.2.", "А)") of that item, None
+                  otherwise (see `numbering.NumberingResolver`)
+
+`is_heading_like(row)` combines style, outline level and short bold lines;
+it is how section locators tell a heading from the same words in the
+table of contents or in a sentence.
+
+`joined`/`lowered_joined` are built once, so a substring search is one
+`str.find` plus a bisect over `offsets`.
+"""
+import re
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+from lxml import etree
+
+from tests.helpers.ooxml_utils import W, _append_run_text, get_paragraph_text
+
+
+_R = W + "r"
+_P = W + "p"
+_BODY = W + "body"
+# Containers whose runs are not part of the revised text
+_REMOVED = {W + "del", W + "moveFrom", W + "pPr", _P}
+
+# Longest paragraph (characters) still considered a possible heading
+HEADING_MAX_CHARS = 120
+_HEADING_STYLE_RE = re.compile(r"^(?:heading|title|заголовок)", re.IGNORECASE)
+
+
+def _lower(text: str) -> str:
+    """Lower case of `text` with the same length (e.g. "İ" lowers to two characters)."""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        lowered = "".join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+    return lowered
+
+
+def _append_revised_text(node: etree._Element, parts: List[str]) -> None:
+    """Append text of runs below `node`, skipping deleted content."""
+    for child in node:
+        tag = child.tag
+        if tag == _R:
+            _append_run_text(child, parts)
+        elif tag not in _REMOVED and isinstance(tag, str):
+            _append_revised_text(child, parts)
+
+
+def get_revised_text(paragraph: etree._Element) -> str:
+    """Paragraph text as it reads with all tracked changes accepted."""
+    parts: List[str] = []
+    _append_revised_text(paragraph, parts)
+    return "".join(parts)
+
+
+class ParagraphTable:
+    """Per-paragraph columns of one document (see module docstring)."""
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.lowered: List[str] = []
+        self.revised: List[str] = []
+        self.offsets: List[int] = []
+        self.style_ids: List[Optional[str]] = []
+        self.outline_levels: List[Optional[int]] = []
+        self.table_depths: List[int] = []
+        self.body_level: List[bool] = []
+        self.bold: List[bool] = []
+        self.numbering: List[Optional[Tuple[str, int]]] = []
+        self.labels: List[Optional[str]] = []
+        self._length = 0
+        self._joined: Optional[str] = None
+        self._lowered_joined: Optional[str] = None
+        self._revised_lowered: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def append(self, text: str, revised: str, style_id: Optional[str],
+               outline_level: Optional[int], table_depth: int, body_level: bool,
+               bold: bool = False, numbering: Optional[Tuple[str, int]] = None,
+               label: Optional[str] = None) -> None:
+        """Add the next paragraph row."""
+        self.offsets.append(self._length)
+        self._length += len(text) + 1
+        self.texts.append(text)
+        # Same length as the text, so offsets are valid for both
+        self.lowered.append(_lower(text))
+        self.revised.append(revised)
+        self.style_ids.append(style_id)
+        self.outline_levels.append(outline_level)
+        self.table_depths.append(table_depth)
+        self.body_level.append(body_level)
+        self.bold.append(bold)
+        self.numbering.append(numbering)
+        self.labels.append(label)
+        self._joined = self._lowered_joined = None
+        self._revised_lowered = None
+
+    @property
+    def joined(self) -> str:
+        """All paragraph texts joined with "\\n" (row i starts at offsets[i])."""
+        if self._joined is None:
+            self._joined = "\n".join(self.texts)
+        return self._joined
+
+    @property
+    def lowered_joined(self) -> str:
+        """Lower-cased `joined`, same offsets."""
+        if self._lowered_joined is None:
+            self._lowered_joined = "\n".join(self.lowered)
+        return self._lowered_joined
+
+    @property
+    def revised_lowered(self) -> List[str]:
+        """Lower-cased `revised` column (built once)."""
+        if self._revised_lowered is None:
+            self._revised_lowered = [_lower(text) for text in self.revised]
+        return self._revised_lowered
+
+    def row_at(self, offset: int) -> int:
+        """Row that contains character `offset` of `joined`."""
+        return bisect_right(self.offsets, offset) - 1
+
+    def body_rows(self) -> List[int]:
+        """Rows of body-level paragraphs (outside tables), in order."""
+        return [i for i, flag in enumerate(self.body_level) if flag]
+
+    def is_heading_like(self, row: int) -> bool:
+        """True for a body-level, non-empty paragraph that looks like a heading.
+
+        A heading has an outline level (directly or via its style), a heading
+        style (Heading N / Title / Заголовок N) or is a short bold line.
+        """
+        if not self.body_level[row] or not self.texts[row].strip():
+            return False
+        if self.outline_levels[row] is not None or self.bold[row]:
+            return True
+        style_id = self.style_ids[row]
+        return bool(style_id and _HEADING_STYLE_RE.match(style_id))
+
+    def heading_rows(self) -> List[int]:
+        """Rows of heading-like paragraphs, in order."""
+        return [i for i in range(len(self.texts)) if self.is_heading_like(i)]
+
+    def find(self, needle: str, rows: Optional[List[int]] = None) -> Optional[int]:
+        """
+        First row whose text contains `needle` (case-insensitive).
+
+        Args:
+            needle: Text to look for
+            rows: Restrict the search to these rows (e.g. `body_rows()`)
+
+        Returns:
+            Row index, or None if not found
+        """
+        needle = needle.lower()
+        allowed = None if rows is None else set(rows)
+        haystack = self.lowered_joined
+        start = haystack.find(needle)
+        while start != -1:
+            row = self.row_at(start)
+            # A match must not span the "\n" between two paragraphs.
+            if start + len(needle) <= self.offsets[row] + len(self.lowered[row]) and (
+                    allowed is None or row in allowed):
+                return row
+            start = haystack.find(needle, start + 1)
+        return None
+
+
+class ParagraphTableBuilder:
+    """
+    Body rule that fills a `ParagraphTable` in the shared walk.
+
+    Args:
+        resolver: `StyleResolver` for style ids and outline levels
+        numbering: `NumberingResolver` for list labels (None: labels stay None)
+    """
+
+    def __init__(self, resolver, numbering=None):
+        self.resolver = resolver
+        self.numbering = numbering
+        self.table = ParagraphTable()
+
+    def on_paragraph(self, paragraph: etree._Element, ctx) -> None:
+        resolver = self.resolver
+        text = get_paragraph_text(paragraph)
+        numbering = resolver.numbering(paragraph)
+        label = None
+        if numbering is not None and self.numbering is not None:
+            label = self.numbering.label(*numbering)
+        self.table.append(
+            text,
+            get_revised_text(paragraph),
+            resolver.paragraph_style_id(paragraph),
+            resolver.outline_level(paragraph),
+            ctx.table_depth,
+            paragraph.getparent().tag == _BODY,
+            0 < len(text.strip()) <= HEADING_MAX_CHARS and self._all_bold(paragraph),
+            numbering,
+            label,
+        )
+
+    def _all_bold(self, paragraph: etree._Element) -> bool:
+        """True if every run with visible text in `paragraph` is bold."""
+        seen = False
+        for run in paragraph.iter(_R):
+            if not "".join(t.text or "" for t in run.iterchildren(W + "t")).strip():
+                continue
+            if not self.resolver.run_properties(run, paragraph).get("b"):
+                return False
+            seen = True
+        return seen
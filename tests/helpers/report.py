@@ -115,6 +115,11 @@ class NormocontrolReport:
     
     def to_markdown(self, filepath: Path):
         """Export report as Markdown."""
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(self.render_markdown())
+    
+    def render_markdown(self) -> str:
+        """Render the Markdown report in memory."""
         lines = []
         lines.append("# Отчёт проверки нормоконтроля\n")
         lines.append(f"**Дата проверки:** {self.timestamp}\n")
@@ -169,8 +174,7 @@ class NormocontrolReport:
                         lines.append(f"  - Расположение: {issue.location}")
                     lines.append("")
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+        return '\n'.join(lines)
     
     def to_text(self, filepath: Path):
         """Export report as plain text."""
@@ -0,0 +1,151 @@
+"""
+Content-addressed on-disk cache for normocontrol results.
+
+A cache entry stores the serialized issues of one checked document. The key
+is a SHA-256 over everything that can change the result:
+- the .docx bytes,
+- the checklist markdown the configuration was parsed from,
+- a checker version stamp.
+
+Entries are small JSON files (`<key[:2]>/<key>.json`). Writes are atomic, so
+several processes (batch workers, parallel CI jobs) may share one directory.
+The total size is bounded: least recently used entries (by mtime, refreshed
+on every hit) are evicted first. The directory is scanned once, on the
+first write of a cache object; after that the object keeps the entries in
+LRU order with their sizes and a running total, so a write or a hit costs
+O(1) and eviction pops the oldest entries. Entries written meanwhile by
+other processes are counted at their next scan (next run or worker).
+"""
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Issue fields stored in the cache; the document name is re-stamped on replay.
+ISSUE_FIELDS = ("category", "severity", "description", "expected", "actual", "location")
+
+
+def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sha256_files(paths: Iterable[Path]) -> str:
+    """SHA-256 over several files (names and contents), order-independent."""
+    digest = hashlib.sha256()
+    for path in sorted(Path(p) for p in paths):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(sha256_file(path).encode("ascii"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache of check results keyed by content hashes.
+
+    Args:
+        cache_dir: Directory with cache entries (created on first write)
+        checklist_hash: Hash of the checklist the configuration came from
+        checker_version: Version stamp of the checking code
+        max_bytes: Upper bound for the total size of entries
+    """
+
+    def __init__(self, cache_dir: Path, checklist_hash: str, checker_version: str,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.checklist_hash = checklist_hash
+        self.checker_version = checker_version
+        self.max_bytes = max_bytes
+        # Entry path -> size, least recently used first; None until the first scan
+        self._entries: Optional["OrderedDict[Path, int]"] = None
+        self._total = 0
+
+    def key_for(self, docx_path: Path) -> str:
+        """Build the cache key for a document."""
+        digest = hashlib.sha256()
+        for part in (sha256_file(docx_path), self.checklist_hash, self.checker_version):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[List[Dict[str, str]]]:
+        """
+        Return cached issues for `key`, or None on a miss.
+
+        A hit refreshes the entry's mtime so it becomes most recently used.
+        """
+        path = self._entry_path(key)
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if self._entries is not None and path in self._entries:
+            self._entries.move_to_end(path)
+        issues = data.get("issues")
+        return issues if isinstance(issues, list) else None
+
+    def put(self, key: str, issues: Iterable[Dict[str, str]]) -> None:
+        """Store issues for `key` (atomic write) and evict old entries."""
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "key": key,
+            "issues": [{name: issue.get(name, "") for name in ISSUE_FIELDS} for issue in issues],
+        }
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            size = os.path.getsize(tmp_name)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        if self._entries is None:
+            self._scan()
+        else:
+            self._total += size - self._entries.pop(path, 0)
+            self._entries[path] = size
+        self.evict()
+
+    def _scan(self) -> None:
+        """Read sizes and LRU order of all entries from the directory."""
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        entries.sort()
+        self._entries = OrderedDict((path, size) for _, path, size in entries)
+        self._total = sum(self._entries.values())
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits `max_bytes`."""
+        if self._entries is None:
+            self._scan()
+        while self._total > self.max_bytes and self._entries:
+            path, size = self._entries.popitem(last=False)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            self._total -= size
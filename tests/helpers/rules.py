@@ -0,0 +1,173 @@
+"""
+Single-traversal rule engine for OOXML document bodies.
+
+`BodyWalker` walks w:body exactly once and dispatches every paragraph, run,
+table and section properties element to registered rules. A rule is any
+object that defines one or more of the hooks below; hooks a rule does not
+define are never called, so adding a rule costs only its own callbacks,
+not another scan of the document:
+
+- on_body_element(element, ctx)  every top-level body element (before its content)
+- on_paragraph(paragraph, ctx)    every w:p (including nested ones)
+- on_paragraph_end(paragraph, ctx) after all runs of the paragraph
+- on_run(run, ctx)                every w:r
+- on_table(table, ctx)            every w:tbl (before its content)
+- on_table_end(table, ctx)        after the table content
+- on_sect_pr(sect_pr, ctx)        every w:sectPr (paragraph-level and final)
+- on_finish(ctx)                  once, after the last element
+
+While inside tables the context also tells which table, row and cell the
+current paragraph or run belongs to (`table_index`, `row_index`,
+`cell_index`), so rules can judge table content apart from body text.
+
+The walker accepts any iterable of top-level body elements, so the same
+rules run over an in-memory tree (`ooxml_utils.get_body_elements`) or a
+constant-memory stream (`ooxml_utils.iter_body_elements`). In streaming
+mode elements are cleared after their hooks return: rules must copy what
+they keep.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from lxml import etree
+
+from tests.helpers.ooxml_utils import W
+
+
+HOOKS = (
+    "on_body_element",
+    "on_paragraph",
+    "on_paragraph_end",
+    "on_run",
+    "on_table",
+    "on_table_end",
+    "on_sect_pr",
+    "on_finish",
+)
+
+_P = W + "p"
+_R = W + "r"
+_TBL = W + "tbl"
+_TR = W + "tr"
+_TC = W + "tc"
+_SECT_PR = W + "sectPr"
+
+
+@dataclass
+class WalkContext:
+    """Traversal state shared with rule callbacks."""
+    # 0-based index of the current w:p in document order (same as `.//w:p`)
+    paragraph_index: int = -1
+    # 0-based index of the current top-level body element
+    body_index: int = -1
+    # 0-based index of the current w:r in document order
+    run_index: int = -1
+    # Innermost open paragraph (None between paragraphs)
+    paragraph: Optional[etree._Element] = None
+    # Open tables, outermost first
+    tables: List[etree._Element] = field(default_factory=list)
+    # [row, cell] position inside each open table, outermost first (0-based)
+    cells: List[List[int]] = field(default_factory=list)
+    # 0-based index of the current top-level w:tbl in document order
+    # (the last one after it ends; -1 before the first table)
+    table_index: int = -1
+    # Scratch space for rules that need to share derived data
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def in_table(self) -> bool:
+        """True while inside any w:tbl."""
+        return bool(self.tables)
+
+    @property
+    def table_depth(self) -> int:
+        """Nesting level of tables (0 = body text)."""
+        return len(self.tables)
+
+    @property
+    def row_index(self) -> int:
+        """Row of the innermost open table (-1 outside tables)."""
+        return self.cells[-1][0] if self.cells else -1
+
+    @property
+    def cell_index(self) -> int:
+        """Cell of the current row of the innermost open table (-1 outside tables)."""
+        return self.cells[-1][1] if self.cells else -1
+
+
+class BodyWalker:
+    """Walks body elements once and dispatches them to rules."""
+
+    def __init__(self, rules: Iterable[Any]):
+        self.rules = list(rules)
+        self._hooks: Dict[str, List[Callable]] = {
+            name: [getattr(rule, name) for rule in self.rules if callable(getattr(rule, name, None))]
+            for name in HOOKS
+        }
+        # Paragraphs, tables, rows and cells are always tracked so the context is reliable.
+        tags = [_P, _TBL, _TR, _TC]
+        if self._hooks["on_run"]:
+            tags.append(_R)
+        if self._hooks["on_sect_pr"]:
+            tags.append(_SECT_PR)
+        self._tags = tuple(tags)
+        self.ctx = WalkContext()
+
+    def walk(self, body_elements: Iterable[etree._Element]) -> WalkContext:
+        """Visit all elements, then call `on_finish` hooks."""
+        for element in body_elements:
+            self.visit(element)
+        for hook in self._hooks["on_finish"]:
+            hook(self.ctx)
+        return self.ctx
+
+    def visit(self, element: etree._Element) -> None:
+        """Visit one top-level body element and its descendants."""
+        ctx = self.ctx
+        ctx.body_index += 1
+        hooks = self._hooks
+        for hook in hooks["on_body_element"]:
+            hook(element, ctx)
+        paragraph_stack: List[etree._Element] = []
+
+        for event, node in etree.iterwalk(element, events=("start", "end"), tag=self._tags):
+            tag = node.tag
+            if event == "start":
+                if tag == _R:
+                    ctx.run_index += 1
+                    for hook in hooks["on_run"]:
+                        hook(node, ctx)
+                elif tag == _P:
+                    ctx.paragraph_index += 1
+                    paragraph_stack.append(node)
+                    ctx.paragraph = node
+                    for hook in hooks["on_paragraph"]:
+                        hook(node, ctx)
+                elif tag == _TC:
+                    if ctx.cells:
+                        ctx.cells[-1][1] += 1
+                elif tag == _TR:
+                    if ctx.cells:
+                        ctx.cells[-1][0] += 1
+                        ctx.cells[-1][1] = -1
+                elif tag == _TBL:
+                    if not ctx.tables:
+                        ctx.table_index += 1
+                    ctx.tables.append(node)
+                    ctx.cells.append([-1, -1])
+                    for hook in hooks["on_table"]:
+                        hook(node, ctx)
+                elif tag == _SECT_PR:
+                    for hook in hooks["on_sect_pr"]:
+                        hook(node, ctx)
+            else:
+                if tag == _P:
+                    for hook in hooks["on_paragraph_end"]:
+                        hook(node, ctx)
+                    paragraph_stack.pop()
+                    ctx.paragraph = paragraph_stack[-1] if paragraph_stack else None
+                elif tag == _TBL:
+                    for hook in hooks["on_table_end"]:
+                        hook(node, ctx)
+                    ctx.tables.pop()
+                    ctx.cells.pop()
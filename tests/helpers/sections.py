@@ -0,0 +1,115 @@
+"""
+Index of document sections (w:sectPr) with their page setup.
+
+`get_section_properties` returns only the last w:sectPr, so a landscape
+section for a wide table or a separate title-page section is invisible to
+checks. `SectionIndexBuilder` is a body rule that records every section in
+the shared `BodyWalker` pass:
+
+- a section ends with the paragraph whose w:pPr holds its w:sectPr; the
+  last section's w:sectPr is the final child of w:body;
+- paragraph rows are inclusive and use `WalkContext.paragraph_index`
+  numbering (every w:p in document order);
+- values are extracted immediately, so the rule works on streamed
+  (cleared) elements as well.
+
+Old properties kept by tracked changes (w:sectPrChange) are ignored.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from lxml import etree
+
+from tests.helpers.ooxml_utils import W, get_page_margins, get_page_size
+
+
+_P = W + "p"
+_PPR = W + "pPr"
+_BODY = W + "body"
+_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+
+@dataclass
+class SectionInfo:
+    """Page setup of one section."""
+    # 0-based section number in document order
+    index: int
+    # First and last paragraph rows of the section (inclusive)
+    first_row: int
+    last_row: int
+    # 'width', 'height' (twips), 'orient' as in `get_page_size`; None if absent
+    page_size: Optional[Dict[str, Any]] = None
+    # Margins in twips as in `get_page_margins`; None if absent
+    margins: Optional[Dict[str, int]] = None
+    # w:titlePg: the first page has its own header/footer
+    title_page: bool = False
+    # w:type of the break that starts the section ("nextPage" if absent)
+    start_type: str = "nextPage"
+    # Header/footer references: type (default/first/even) -> relationship id
+    header_refs: Dict[str, str] = field(default_factory=dict)
+    footer_refs: Dict[str, str] = field(default_factory=dict)
+    # w:pgNumType w:start: page number of the first page (None: continues)
+    page_number_start: Optional[int] = None
+
+    @property
+    def orientation(self) -> Optional[str]:
+        """'portrait' or 'landscape' (from w:orient or the page proportions)."""
+        if not self.page_size:
+            return None
+        if self.page_size.get("orient") == "landscape":
+            return "landscape"
+        if self.page_size["width"] > self.page_size["height"]:
+            return "landscape"
+        return "portrait"
+
+
+def _references(sect_pr: etree._Element, tag: str) -> Dict[str, str]:
+    """Map reference type to relationship id for w:headerReference/w:footerReference."""
+    refs: Dict[str, str] = {}
+    for ref in sect_pr.iterfind(W + tag):
+        rel_id = ref.get(_R + "id")
+        if rel_id:
+            refs[ref.get(W + "type", "default")] = rel_id
+    return refs
+
+
+def section_info(sect_pr: etree._Element, index: int, first_row: int, last_row: int) -> SectionInfo:
+    """Extract the page setup of one w:sectPr."""
+    title_pg = sect_pr.find(W + "titlePg")
+    start = sect_pr.find(W + "type")
+    page_numbers = sect_pr.find(W + "pgNumType")
+    page_number_start = page_numbers.get(W + "start") if page_numbers is not None else None
+    return SectionInfo(
+        index=index,
+        first_row=first_row,
+        last_row=last_row,
+        page_size=get_page_size(sect_pr),
+        margins=get_page_margins(sect_pr),
+        title_page=title_pg is not None and title_pg.get(W + "val", "true") not in ("0", "false", "off"),
+        start_type=start.get(W + "val", "nextPage") if start is not None else "nextPage",
+        header_refs=_references(sect_pr, "headerReference"),
+        footer_refs=_references(sect_pr, "footerReference"),
+        page_number_start=int(page_number_start) if page_number_start and page_number_start.isdigit() else None,
+    )
+
+
+class SectionIndexBuilder:
+    """Body rule that collects `SectionInfo` for every section."""
+
+    def __init__(self):
+        self.sections: List[SectionInfo] = []
+        self._next_row = 0
+
+    def on_sect_pr(self, sect_pr: etree._Element, ctx) -> None:
+        parent = sect_pr.getparent()
+        if parent is None:
+            return
+        if parent.tag == _PPR:
+            grandparent = parent.getparent()
+            if grandparent is None or grandparent.tag != _P:
+                return
+        elif parent.tag != _BODY:
+            return
+        last_row = ctx.paragraph_index
+        self.sections.append(section_info(sect_pr, len(self.sections), self._next_row, last_row))
+        self._next_row = last_row + 1
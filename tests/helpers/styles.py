@@ -0,0 +1,331 @@
+"""
+Effective (inherited) formatting of paragraphs and runs.
+
+Direct formatting (`get_paragraph_properties`, `get_run_properties`) misses
+everything a document takes from styles.xml. Word resolves a property in
+this order, later layers overriding earlier ones:
+
+1. w:docDefaults (w:pPrDefault / w:rPrDefault)
+2. the paragraph style and its w:basedOn chain (default paragraph style
+   when the paragraph has no w:pStyle)
+3. the character style (w:rStyle) and its chain, for runs
+4. direct formatting on the paragraph / run
+
+Theme font references (w:asciiTheme="minorHAnsi" ...) are resolved against
+word/theme/theme1.xml.
+
+`StyleResolver` flattens every style chain once into a memo table, so the
+effective properties of a paragraph or run are one dict merge with its
+direct formatting. Results have the same shape as `get_paragraph_properties`
+and `get_run_properties`, with inherited values filled in.
+
+Simplification: toggle properties (w:b) follow "last layer wins" instead of
+Word's XOR across styles, and so does a w:tabs list (Word merges tab stops
+across layers); this matches real documents in practice.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+from lxml import etree
+
+from tests.helpers.ooxml_utils import W
+
+
+THEME_PATH = "word/theme/theme1.xml"
+
+_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+# (group, attribute) pairs merged attribute by attribute
+_PPR_ATTRS = {
+    "ind": ("left", "right", "firstLine", "hanging"),
+    "spacing": ("line", "lineRule", "before", "after"),
+}
+_FONT_SLOTS = ("ascii", "hAnsi", "cs")
+_FALSE_VALUES = {"0", "false", "off"}
+
+# A flattened layer: {(group, attribute): value} or {(name,): value}
+Layer = Dict[Tuple[str, ...], Any]
+
+
+def _ppr_layer(p_pr: Optional[etree._Element]) -> Layer:
+    """Paragraph properties explicitly set by one w:pPr."""
+    layer: Layer = {}
+    if p_pr is None:
+        return layer
+    for group, attrs in _PPR_ATTRS.items():
+        node = p_pr.find(W + group)
+        if node is None:
+            continue
+        for attr in attrs:
+            value = node.get(W + attr)
+            if value is not None:
+                layer[(group, attr)] = value
+        # firstLine and hanging are mutually exclusive: setting one clears the other
+        if group == "ind":
+            if ("ind", "hanging") in layer:
+                layer[("ind", "firstLine")] = None
+            elif ("ind", "firstLine") in layer:
+                layer[("ind", "hanging")] = None
+    jc = p_pr.find(W + "jc")
+    if jc is not None:
+        layer[("jc",)] = jc.get(W + "val")
+    num_pr = p_pr.find(W + "numPr")
+    if num_pr is not None:
+        for child in ("numId", "ilvl"):
+            node = num_pr.find(W + child)
+            if node is not None and node.get(W + "val") is not None:
+                layer[("numPr", child)] = node.get(W + "val")
+    tabs = p_pr.find(W + "tabs")
+    if tabs is not None:
+        stops = []
+        for tab in tabs.iterfind(W + "tab"):
+            if tab.get(W + "val") == "clear":
+                continue
+            try:
+                stops.append((int(tab.get(W + "pos")), tab.get(W + "val")))
+            except (TypeError, ValueError):
+                continue
+        layer[("tabs",)] = tuple(sorted(stops))
+    outline = p_pr.find(W + "outlineLvl")
+    if outline is not None:
+        try:
+            layer[("outlineLvl",)] = int(outline.get(W + "val"))
+        except (TypeError, ValueError):
+            pass
+    page_break = p_pr.find(W + "pageBreakBefore")
+    if page_break is not None:
+        layer[("pageBreakBefore",)] = page_break.get(W + "val", "true") not in _FALSE_VALUES
+    return layer
+
+
+def _rpr_layer(r_pr: Optional[etree._Element], theme_fonts: Dict[str, str]) -> Layer:
+    """Run properties explicitly set by one w:rPr."""
+    layer: Layer = {}
+    if r_pr is None:
+        return layer
+    sz = r_pr.find(W + "sz")
+    if sz is not None and sz.get(W + "val") is not None:
+        try:
+            layer[("sz",)] = int(sz.get(W + "val"))
+        except ValueError:
+            pass
+    r_fonts = r_pr.find(W + "rFonts")
+    if r_fonts is not None:
+        for slot in _FONT_SLOTS:
+            # A theme reference wins over an explicit name on the same element.
+            theme = r_fonts.get(W + slot + "Theme")
+            name = theme_fonts.get(theme) if theme else None
+            if name is None:
+                name = r_fonts.get(W + slot)
+            if name is not None:
+                layer[("rFonts", slot)] = name
+    b = r_pr.find(W + "b")
+    if b is not None:
+        layer[("b",)] = b.get(W + "val", "true").lower() not in _FALSE_VALUES
+    return layer
+
+
+def _nest(layer: Layer) -> Dict[str, Any]:
+    """Convert a flat layer to the `get_*_properties` dict shape."""
+    props: Dict[str, Any] = {}
+    for key, value in layer.items():
+        if len(key) == 1:
+            if value is not None:
+                props[key[0]] = value
+        else:
+            group = props.setdefault(key[0], {})
+            group[key[1]] = value
+    return props
+
+
+def _theme_fonts(theme: Optional[etree._Element]) -> Dict[str, str]:
+    """Map theme font references (minorHAnsi, majorBidi, ...) to typefaces."""
+    fonts: Dict[str, str] = {}
+    if theme is None:
+        return fonts
+    for kind in ("major", "minor"):
+        font = theme.find(f".//{_A}{kind}Font")
+        if font is None:
+            continue
+        latin = font.find(_A + "latin")
+        cs = font.find(_A + "cs")
+        ea = font.find(_A + "ea")
+        if latin is not None and latin.get("typeface"):
+            fonts[kind + "HAnsi"] = fonts[kind + "Ascii"] = latin.get("typeface")
+        if cs is not None and cs.get("typeface"):
+            fonts[kind + "Bidi"] = cs.get("typeface")
+        if ea is not None and ea.get("typeface"):
+            fonts[kind + "EastAsia"] = ea.get("typeface")
+    return fonts
+
+
+class StyleResolver:
+    """
+    Resolves effective paragraph and run properties with memoized styles.
+
+    Args:
+        styles: Root of word/styles.xml (None: only direct formatting)
+        theme: Root of word/theme/theme1.xml, if present
+    """
+
+    def __init__(self, styles: Optional[etree._Element], theme: Optional[etree._Element] = None):
+        self.theme_fonts = _theme_fonts(theme)
+        self._styles: Dict[str, etree._Element] = {}
+        self.default_paragraph_style: Optional[str] = None
+        self._ppr_defaults: Layer = {}
+        self._rpr_defaults: Layer = {}
+
+        if styles is not None:
+            defaults = styles.find(W + "docDefaults")
+            if defaults is not None:
+                self._ppr_defaults = _ppr_layer(defaults.find(f"{W}pPrDefault/{W}pPr"))
+                self._rpr_defaults = _rpr_layer(defaults.find(f"{W}rPrDefault/{W}rPr"), self.theme_fonts)
+            for style in styles.iterfind(W + "style"):
+                style_id = style.get(W + "styleId")
+                if style_id is None:
+                    continue
+                self._styles[style_id] = style
+                if (style.get(W + "type") == "paragraph"
+                        and style.get(W + "default") in ("1", "true", "on")):
+                    self.default_paragraph_style = style_id
+
+        # Memo tables: style id -> flattened chain (defaults excluded)
+        self._ppr_chains: Dict[Optional[str], Layer] = {}
+        self._rpr_chains: Dict[Optional[str], Layer] = {}
+        # (paragraph style, character style) -> base run layer incl. defaults
+        self._run_bases: Dict[Tuple[Optional[str], Optional[str]], Layer] = {}
+        self._paragraph_bases: Dict[Optional[str], Layer] = {}
+
+    @classmethod
+    def from_model(cls, model) -> "StyleResolver":
+        """Build a resolver from the parts of a DocumentModel."""
+        return cls(model.styles, model.part(THEME_PATH))
+
+    def _chain(self, style_id: Optional[str], memo: Dict[Optional[str], Layer],
+               layer_of, seen: Tuple[str, ...] = ()) -> Layer:
+        """Flatten the basedOn chain of a style into one layer (memoized)."""
+        if style_id in memo:
+            return memo[style_id]
+        style = self._styles.get(style_id) if style_id is not None else None
+        if style is None or style_id in seen:
+            return {}
+        based_on = style.find(W + "basedOn")
+        parent = based_on.get(W + "val") if based_on is not None else None
+        layer = dict(self._chain(parent, memo, layer_of, seen + (style_id,)))
+        layer.update(layer_of(style))
+        memo[style_id] = layer
+        return layer
+
+    def _style_ppr(self, style: etree._Element) -> Layer:
+        return _ppr_layer(style.find(W + "pPr"))
+
+    def _style_rpr(self, style: etree._Element) -> Layer:
+        return _rpr_layer(style.find(W + "rPr"), self.theme_fonts)
+
+    def paragraph_style_id(self, paragraph: Optional[etree._Element]) -> Optional[str]:
+        """Style id applied to a paragraph (the default style if none)."""
+        if paragraph is not None:
+            p_style = paragraph.find(f"{W}pPr/{W}pStyle")
+            if p_style is not None:
+                return p_style.get(W + "val")
+        return self.default_paragraph_style
+
+    def style_paragraph_layer(self, style_id: Optional[str]) -> Layer:
+        """Defaults + paragraph style chain, flattened once per style."""
+        base = self._paragraph_bases.get(style_id)
+        if base is None:
+            base = dict(self._ppr_defaults)
+            base.update(self._chain(style_id, self._ppr_chains, self._style_ppr))
+            self._paragraph_bases[style_id] = base
+        return base
+
+    def style_run_layer(self, paragraph_style: Optional[str], run_style: Optional[str]) -> Layer:
+        """Defaults + paragraph style rPr + character style chain, memoized."""
+        key = (paragraph_style, run_style)
+        base = self._run_bases.get(key)
+        if base is None:
+            base = dict(self._rpr_defaults)
+            base.update(self._chain(paragraph_style, self._rpr_chains, self._style_rpr))
+            if run_style is not None:
+                base.update(self._chain(run_style, self._rpr_chains, self._style_rpr))
+            self._run_bases[key] = base
+        return base
+
+    def paragraph_properties(self, paragraph: etree._Element) -> Dict[str, Any]:
+        """
+        Effective properties of a paragraph.
+
+        Returns dict shaped like `get_paragraph_properties` ('ind', 'spacing',
+        'jc', 'style') with inherited values filled in, plus 'outlineLvl'
+        (0 = heading level 1; body text has none or 9) and 'tabs' (sorted
+        (position, alignment) custom tab stops).
+        """
+        style_id = self.paragraph_style_id(paragraph)
+        layer = dict(self.style_paragraph_layer(style_id))
+        layer.update(_ppr_layer(paragraph.find(W + "pPr")))
+        props = _nest(layer)
+        if style_id is not None:
+            props["style"] = style_id
+        return props
+
+    def outline_level(self, paragraph: etree._Element) -> Optional[int]:
+        """Effective outline level (0-8), or None for body text."""
+        outline = paragraph.find(f"{W}pPr/{W}outlineLvl")
+        if outline is not None:
+            try:
+                level = int(outline.get(W + "val"))
+            except (TypeError, ValueError):
+                level = None
+        else:
+            level = self.style_paragraph_layer(self.paragraph_style_id(paragraph)).get(("outlineLvl",))
+        # Level 9 is Word's explicit "body text".
+        return level if level is not None and 0 <= level <= 8 else None
+
+    def page_break_before(self, paragraph: etree._Element) -> bool:
+        """Effective w:pageBreakBefore (directly or via the paragraph style)."""
+        page_break = paragraph.find(f"{W}pPr/{W}pageBreakBefore")
+        if page_break is not None:
+            return page_break.get(W + "val", "true") not in _FALSE_VALUES
+        return bool(self.style_paragraph_layer(self.paragraph_style_id(paragraph)).get(("pageBreakBefore",)))
+
+    def numbering(self, paragraph: etree._Element) -> Optional[Tuple[str, int]]:
+        """
+        Effective list numbering of a paragraph: (numId, ilvl), or None.
+
+        w:numPr may come from the paragraph or its style; numId "0" turns
+        inherited numbering off.
+        """
+        layer = self.style_paragraph_layer(self.paragraph_style_id(paragraph))
+        num_id = layer.get(("numPr", "numId"))
+        ilvl = layer.get(("numPr", "ilvl"))
+        num_pr = paragraph.find(f"{W}pPr/{W}numPr")
+        if num_pr is not None:
+            node = num_pr.find(W + "numId")
+            if node is not None:
+                num_id = node.get(W + "val", num_id)
+            node = num_pr.find(W + "ilvl")
+            if node is not None:
+                ilvl = node.get(W + "val", ilvl)
+        if num_id is None or num_id == "0":
+            return None
+        try:
+            return num_id, int(ilvl or 0)
+        except ValueError:
+            return num_id, 0
+
+    def run_properties(self, run: etree._Element,
+                       paragraph: Optional[etree._Element] = None) -> Dict[str, Any]:
+        """
+        Effective properties of a run inside `paragraph`.
+
+        Returns dict shaped like `get_run_properties` ('sz' in half-points,
+        'rFonts', 'b') with inherited values filled in.
+        """
+        r_pr = run.find(W + "rPr")
+        run_style = None
+        if r_pr is not None:
+            r_style = r_pr.find(W + "rStyle")
+            if r_style is not None:
+                run_style = r_style.get(W + "val")
+        layer = dict(self.style_run_layer(self.paragraph_style_id(paragraph), run_style))
+        layer.update(_rpr_layer(r_pr, self.theme_fonts))
+        return _nest(layer)
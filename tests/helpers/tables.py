@@ -0,0 +1,115 @@
+"""
+Per-table cell index of top-level tables (w:tbl).
+
+`TableIndexBuilder` is a body rule that uses the table/row/cell position the
+`BodyWalker` keeps in its context (`WalkContext.table_index`, `cells`) and
+records, for every top-level table:
+
+- its paragraph rows (the same numbering as `WalkContext.paragraph_index`);
+- the paragraph rows of each cell of its first `HEAD_ROWS` table rows, so
+  header texts and a row of column numbers ("1", "2", "3", ...) can be read
+  from the `ParagraphTable` without another scan;
+- the size of the table and whether its first row repeats on every page
+  (w:tblHeader).
+
+Nested tables count as content of the outer cell they are in. Only rows of
+the table heads are stored, so memory does not grow with table length.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from lxml import etree
+
+from tests.helpers.ooxml_utils import W
+from tests.helpers.paragraphs import ParagraphTable
+
+
+# Table rows whose cells are indexed: the header and a row of column numbers
+HEAD_ROWS = 2
+
+_TR = W + "tr"
+_TBL_HEADER = f"{W}trPr/{W}tblHeader"
+_NUMBER_ROW_CELL_RE = re.compile(r"^\d+$")
+
+
+@dataclass
+class TableInfo:
+    """One top-level table."""
+    # 0-based index of the table in document order (`WalkContext.table_index`)
+    index: int
+    # First and last paragraph rows inside the table (inclusive)
+    first_row: int
+    last_row: int = -1
+    # Table rows and the largest number of cells in a row
+    rows: int = 0
+    columns: int = 0
+    # The first row is marked to repeat at the top of each page
+    repeat_header: bool = False
+    # head[r][c]: paragraph rows of cell c in table row r (r < HEAD_ROWS)
+    head: List[List[List[int]]] = field(default_factory=list)
+
+    def cell_texts(self, table: ParagraphTable, row: int) -> List[str]:
+        """Texts of the cells of one head row ("" for empty cells)."""
+        if row >= len(self.head):
+            return []
+        return [
+            " ".join(table.texts[paragraph].strip() for paragraph in cell).strip()
+            for cell in self.head[row]
+        ]
+
+    def numbered_columns_row(self, table: ParagraphTable) -> Optional[int]:
+        """Head row that numbers the columns 1, 2, 3, ... (None if none does)."""
+        for row in range(len(self.head)):
+            texts = self.cell_texts(table, row)
+            if len(texts) > 1 and all(_NUMBER_ROW_CELL_RE.match(text) for text in texts) \
+                    and [int(text) for text in texts] == list(range(1, len(texts) + 1)):
+                return row
+        return None
+
+
+class TableIndexBuilder:
+    """Body rule collecting `TableInfo` for every top-level table."""
+
+    def __init__(self):
+        self.tables: List[TableInfo] = []
+
+    def on_table(self, table: etree._Element, ctx) -> None:
+        if ctx.table_depth == 1:
+            self.tables.append(TableInfo(
+                index=ctx.table_index,
+                first_row=ctx.paragraph_index + 1,
+                repeat_header=_repeats_header(table),
+            ))
+
+    def on_paragraph(self, paragraph: etree._Element, ctx) -> None:
+        if not ctx.cells:
+            return
+        row, cell = ctx.cells[0]
+        info = self.tables[-1]
+        if cell + 1 > info.columns and ctx.table_depth == 1:
+            info.columns = cell + 1
+        if row >= HEAD_ROWS or cell < 0:
+            return
+        head = info.head
+        while len(head) <= row:
+            head.append([])
+        cells = head[row]
+        while len(cells) <= cell:
+            cells.append([])
+        cells[cell].append(ctx.paragraph_index)
+
+    def on_table_end(self, table: etree._Element, ctx) -> None:
+        if ctx.table_depth == 1:
+            info = self.tables[-1]
+            info.last_row = ctx.paragraph_index
+            info.rows = ctx.cells[0][0] + 1
+
+
+def _repeats_header(table: etree._Element) -> bool:
+    """True if the first w:tr of the table carries w:tblHeader (not switched off)."""
+    first_row = table.find(_TR)
+    if first_row is None:
+        return False
+    marker = first_row.find(_TBL_HEADER)
+    return marker is not None and marker.get(W + "val", "true") not in ("0", "false", "off")
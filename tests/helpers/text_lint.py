@@ -0,0 +1,165 @@
+"""
+Text lint: number and unit spacing, bare math signs, colloquialisms.
+
+`TextLinter` is compiled once from word lists (units, colloquial words and
+phrases) kept in a data file next to the checklist, and runs over the
+revised paragraph texts of the `ParagraphTable` (tracked insertions and
+field results included):
+
+- units are turned into one regular expression whose alternation is
+  factored by common prefixes (a trie: "к(?:Вт|Гц|Па|...)"), combined with
+  the math-sign pattern into a single regex. The engine tries it only at
+  digits and signs and follows one trie branch per character, so a list of
+  thousands of units costs about as much as a list of ten. Single-letter
+  units ("м", "г", "т", "с") are left out: glued to a number they are far
+  more often "2025г", "03.2025г." or "5т.е." than a missing space;
+- colloquial words and phrases are matched with the `AhoCorasick`
+  automaton over the lower-case text; an entry ending with "*" is a stem
+  ("прикольн*" matches "прикольный", "прикольно").
+
+Each paragraph is scanned twice (regex, automaton) whatever the list sizes,
+so the pass stays linear in the text length.
+"""
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from tests.helpers.paragraphs import ParagraphTable
+from tests.helpers.text_search import AhoCorasick
+
+
+UNIT_SPACING = "unit_spacing"
+MATH_SIGN = "math_sign"
+COLLOQUIAL = "colloquial"
+
+_SIGNS = "<>=≤≥≠"
+# Neighbour words of a sign that carry a value: a number or a variable (x, α)
+_VALUE_RE = re.compile(r"[\dA-Za-zΑ-Ωα-ω]")
+# How far to look for the neighbours of a sign
+_NEIGHBOUR_CHARS = 40
+
+
+@dataclass(frozen=True)
+class LintHit:
+    """One finding of the text lint."""
+    kind: str
+    # Paragraph row and the span of the hit in its text
+    row: int
+    start: int
+    end: int
+    # Text of the hit as written ("100кВт", ">", "как бы")
+    text: str
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex alternation of `words`, factored by common prefixes.
+
+    ["кВт", "кГц", "к"] -> "к(?:Вт|Гц)?"; longer words are tried first at
+    every branch, so the longest listed unit wins.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        if not word:
+            continue
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: Dict[str, dict]) -> str:
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        pattern = f"{pattern}?" if len(branches) > 1 else f"(?:{pattern})?"
+    return pattern
+
+
+class TextLinter:
+    """
+    Compiled lint rules.
+
+    Args:
+        units: Unit symbols that must be separated from the number ("кВт", "%");
+            single letters are ignored
+        colloquialisms: Words and phrases in lower case; "*" at the end marks a stem
+    """
+
+    def __init__(self, units: Iterable[str], colloquialisms: Iterable[str]):
+        # One letter after a number is usually an abbreviation ("2025г"), not a unit
+        units = [unit for unit in units if unit and not (len(unit) == 1 and unit.isalpha())]
+        parts = []
+        if units:
+            # "100кВт", "80%": a number glued to a unit that is not part of a longer word
+            parts.append(rf"(?P<unit>(?<!\w)\d+(?:[.,]\d+)?(?:{trie_pattern(units)})(?![^\W\d_]))")
+        # A sign standing alone between spaces
+        parts.append(rf"(?P<sign>(?<!\S)[{_SIGNS}](?!\S))")
+        self._pattern = re.compile("|".join(parts))
+        phrases = []
+        for phrase in colloquialisms:
+            phrase = phrase.strip().lower()
+            stem = phrase.endswith("*")
+            phrase = phrase.rstrip("*")
+            if phrase:
+                phrases.append((phrase, stem))
+        self._phrases = AhoCorasick((phrase, stem) for phrase, stem in phrases) if phrases else None
+
+    @classmethod
+    def from_file(cls, path: Path) -> "TextLinter":
+        """Linter for a JSON data file with "units" and "colloquialisms" lists (cached per file)."""
+        return _load_linter(str(path))
+
+    def lint(self, text: str, lowered: Optional[str] = None) -> Iterator[Tuple[str, int, int]]:
+        """Yield (kind, start, end) for every hit in one paragraph text."""
+        if not text:
+            return
+        for match in self._pattern.finditer(text):
+            if match.lastgroup == "unit":
+                yield UNIT_SPACING, match.start(), match.end()
+            elif not _has_value_nearby(text, match.start(), match.end()):
+                yield MATH_SIGN, match.start(), match.end()
+        if self._phrases is None:
+            return
+        lowered = text.lower() if lowered is None else lowered
+        for start, end, stem in self._phrases.iter_matches(lowered):
+            if start and lowered[start - 1].isalnum():
+                continue
+            if not stem and end < len(lowered) and (lowered[end].isalnum() or lowered[end] == "-"):
+                continue
+            if stem:
+                while end < len(lowered) and lowered[end].isalpha():
+                    end += 1
+            yield COLLOQUIAL, start, end
+
+
+@lru_cache(maxsize=4)
+def _load_linter(path: str) -> TextLinter:
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    return TextLinter(data.get("units", ()), data.get("colloquialisms", ()))
+
+
+def _has_value_nearby(text: str, start: int, end: int) -> bool:
+    """True if the word before or after a sign is a number or a variable."""
+    before = text[max(0, start - _NEIGHBOUR_CHARS):start].split()
+    after = text[end:end + _NEIGHBOUR_CHARS].split()
+    neighbours = before[-1:] + after[:1]
+    return any(_VALUE_RE.search(word) for word in neighbours)
+
+
+def lint_rows(table: ParagraphTable, linter: TextLinter, rows: Iterable[int]) -> List[LintHit]:
+    """Lint the given paragraph rows; hits are in document order."""
+    hits: List[LintHit] = []
+    texts, lowered = table.revised, table.revised_lowered
+    for row in rows:
+        text = texts[row]
+        for kind, start, end in linter.lint(text, lowered[row]):
+            hits.append(LintHit(kind, row, start, end, text[start:end]))
+    return hits
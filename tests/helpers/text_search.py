@@ -0,0 +1,72 @@
+"""
+Multi-pattern text search (Aho–Corasick).
+
+Searching for N titles with N `str.find` calls scans the text N times.
+`AhoCorasick` compiles all patterns into one automaton and reports every
+occurrence of every pattern in a single left-to-right scan, so the cost is
+linear in the text length plus the number of matches, regardless of how
+many patterns (titles, synonyms, abbreviations) a profile has.
+"""
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    """
+    Automaton over a fixed set of patterns.
+
+    Args:
+        patterns: (pattern, key) pairs; `key` is reported with each match.
+            Patterns are matched literally (callers normalize case).
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+
+        for pattern, key in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(pattern), key))
+
+        # Breadth-first: failure links point to the longest proper suffix state.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Yield (start, end, key) for every occurrence in `text`.
+
+        Matches are ordered by end position; overlapping matches are all
+        reported.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                end = index + 1
+                for length, key in out[state]:
+                    yield end - length, end, key
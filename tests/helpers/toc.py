@@ -0,0 +1,224 @@
+"""
+Table of contents vs. the headings of the document.
+
+The entries are the paragraphs of the TOC field result (from the field's
+first to its last paragraph) or, for a hand-typed table of contents, the
+paragraphs of the "Оглавление"/"Содержание" section. `parse_toc_entry`
+splits an entry into number, title and page:
+
+    "1.2 Обзор аналогов\\t7", "Введение .......... 3", "2\\tПроектирование\\t12"
+
+Titles are normalised (case, "ё", spaces, trailing dots) and `compare_toc`
+matches entries and headings through dicts keyed by the normalised title
+and by the section number, so the comparison is linear:
+
+- same title: matched (a heading split over paragraphs, "ПРИЛОЖЕНИЕ А" +
+  "(обязательное)" + title, matches the entry that joins them);
+- same number, other title: renamed;
+- entries left over are extra, headings left over are missing.
+
+Page numbers come from Word's last layout: `RenderedPageCollector` counts
+w:lastRenderedPageBreak marks in the shared walk, which gives the page of
+every heading as it was when the document was last saved. Documents saved
+by other editors have no such marks and their page numbers are not judged.
+"""
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lxml import etree
+
+from tests.helpers.ooxml_utils import W
+from tests.helpers.paragraphs import ParagraphTable
+
+
+_T = W + "t"
+_LAST_RENDERED = W + "lastRenderedPageBreak"
+
+# Number in front of an entry or heading: "1 ", "2.3. ", "2\t"
+_NUMBER_RE = re.compile(r"^\s*(\d+(?:\.\d+)*)\.?(?:\s+|$)")
+# Page after the title: tab, dot leaders or spaces, then the number
+_PAGE_RE = re.compile(r"^(.*?\S)(?:\s*\t\s*|\s*[.…·_]{2,}\s*|\s+)(\d{1,4})\s*$")
+# TOC levels switch argument: \o "1-3"
+_LEVELS_RE = re.compile(r"^\d+-(\d+)$")
+_SPACES_RE = re.compile(r"\s+")
+# Levels a TOC field collects when it does not say
+DEFAULT_LEVELS = 3
+
+
+@dataclass
+class TocEntry:
+    """One line of the table of contents."""
+    # Paragraph row of the entry
+    row: int
+    # Title without number and page
+    title: str
+    # Section number ("2.3"), None if the entry has none
+    number: Optional[str] = None
+    # Page number, None if the entry has none
+    page: Optional[int] = None
+
+    @property
+    def level(self) -> int:
+        """0-based level from the number ("2.3" -> 1); 0 without a number."""
+        return self.number.count(".") if self.number else 0
+
+
+def normalize_title(text: str) -> str:
+    """Comparison key of a title: lower case, "е" for "ё", single spaces, no final dot."""
+    return _SPACES_RE.sub(" ", text.lower().replace("ё", "е")).strip(" .:")
+
+
+def split_number(text: str, label: Optional[str] = None) -> Tuple[Optional[str], str]:
+    """(section number, title) of a heading; `label` is the rendered list label."""
+    match = _NUMBER_RE.match(text)
+    if match:
+        return match.group(1), text[match.end():].strip()
+    label_match = _NUMBER_RE.match(label or "")
+    return (label_match.group(1) if label_match else None), text.strip()
+
+
+def parse_toc_entry(row: int, text: str) -> Optional[TocEntry]:
+    """Number, title and page of one TOC paragraph (None for an empty one)."""
+    text = text.strip()
+    if not text:
+        return None
+    page = None
+    match = _PAGE_RE.match(text)
+    if match:
+        text, page = match.group(1), int(match.group(2))
+    number, title = split_number(text)
+    title = title.strip("\t .…·_")
+    if not title:
+        return None
+    return TocEntry(row=row, title=title, number=number, page=page)
+
+
+def toc_levels(tokens: List[str]) -> int:
+    """Deepest level a TOC field collects, from its \\o "1-N" switch."""
+    for position, token in enumerate(tokens[:-1]):
+        if token.lower() == "\\o":
+            match = _LEVELS_RE.match(tokens[position + 1])
+            if match:
+                return int(match.group(1))
+    return DEFAULT_LEVELS
+
+
+class RenderedPageCollector:
+    """Body rule counting Word's w:lastRenderedPageBreak marks per paragraph."""
+
+    def __init__(self):
+        # Rows with marks, the running number of marks before each of them,
+        # and whether the row itself starts on a new page
+        self._rows: List[int] = []
+        self._before: List[int] = []
+        self._starts_page: List[bool] = []
+        self._total = 0
+
+    def on_paragraph(self, paragraph: etree._Element, ctx) -> None:
+        marks = 0
+        text_seen = leading = False
+        for node in paragraph.iter(_T, _LAST_RENDERED):
+            if node.tag == _T:
+                text_seen = text_seen or bool(node.text)
+            else:
+                leading = leading or not text_seen
+                marks += 1
+        if marks:
+            self._rows.append(ctx.paragraph_index)
+            self._before.append(self._total)
+            self._starts_page.append(leading)
+            self._total += marks
+
+    @property
+    def available(self) -> bool:
+        """True if the document carries Word's layout marks."""
+        return bool(self._total)
+
+    def page_of(self, row: int) -> int:
+        """1-based page (counted from the first page) on which paragraph `row` starts."""
+        position = bisect_right(self._rows, row) - 1
+        if position < 0:
+            return 1
+        if self._rows[position] == row:
+            return self._before[position] + 1 + (1 if self._starts_page[position] else 0)
+        total = self._before[position + 1] if position + 1 < len(self._rows) else self._total
+        return total + 1
+
+
+@dataclass
+class TocComparison:
+    """Differences between the table of contents and the headings."""
+    # Heading rows without a TOC entry
+    missing: List[int] = field(default_factory=list)
+    # TOC entries without a heading
+    extra: List[TocEntry] = field(default_factory=list)
+    # (entry, heading row) with the same number but another title
+    renamed: List[Tuple[TocEntry, int]] = field(default_factory=list)
+    # (entry, heading row) of every matched pair, in TOC order
+    matched: List[Tuple[TocEntry, int]] = field(default_factory=list)
+
+
+def compare_toc(table: ParagraphTable, entries: Iterable[TocEntry], heading_rows: Iterable[int],
+                expected_rows: Iterable[int] = ()) -> TocComparison:
+    """
+    Match TOC entries with headings.
+
+    Args:
+        table: Paragraph table of the document
+        entries: Parsed TOC entries, in order
+        heading_rows: Rows of all headings an entry may point to
+        expected_rows: Headings that must have an entry (reported as missing)
+    """
+    by_title: Dict[str, int] = {}
+    by_number: Dict[str, int] = {}
+    for row in heading_rows:
+        number, title = split_number(table.texts[row], table.labels[row])
+        by_title.setdefault(normalize_title(title), row)
+        if number:
+            by_number.setdefault(number, row)
+
+    comparison = TocComparison()
+    used = set()
+    unmatched: List[TocEntry] = []
+    for entry in entries:
+        key = normalize_title(entry.title)
+        row = by_title.get(key)
+        if row is None:
+            # Heading split over paragraphs: the entry starts with the heading title
+            words = key.split(" ")
+            for size in range(len(words) - 1, 0, -1):
+                row = by_title.get(" ".join(words[:size]))
+                if row is not None and _continues(table, row, " ".join(words[size:])):
+                    break
+                row = None
+        if row is None or row in used:
+            unmatched.append(entry)
+            continue
+        used.add(row)
+        comparison.matched.append((entry, row))
+
+    for entry in unmatched:
+        row = by_number.get(entry.number) if entry.number else None
+        if row is not None and row not in used:
+            used.add(row)
+            comparison.renamed.append((entry, row))
+        else:
+            comparison.extra.append(entry)
+
+    comparison.missing = [row for row in expected_rows if row not in used]
+    return comparison
+
+
+def _continues(table: ParagraphTable, row: int, rest: str) -> bool:
+    """True if `rest` is the text of the paragraphs after heading `row` ("(обязательное)" optional)."""
+    parts: List[str] = []
+    for next_row in range(row + 1, min(row + 4, len(table))):
+        part = normalize_title(table.texts[next_row])
+        if not part:
+            continue
+        parts.append(part)
+        if rest in (" ".join(parts), " ".join(text for text in parts if not text.startswith("("))):
+            return True
+    return False
@@ -0,0 +1,1906 @@
+"""
+Unit tests for the IT normocontrol checker (scripts/standards_verification/check_it_docx.py).
+
+Documents are generated on the fly with the `make_docx` fixture, so these
+tests do not depend on the sample .docx files.
+"""
+import contextlib
+import importlib.util
+import json
+import multiprocessing
+import re
+import subprocess
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+from lxml import etree
+
+from tests.helpers.ooxml_utils import (
+    W,
+    DocumentModel,
+    find_nearby_heading,
+    find_paragraph_index,
+    get_body_elements,
+    get_locator,
+    get_page_margins,
+    get_paragraph_text,
+    iter_body_elements,
+    mm_to_twips,
+)
+from tests.helpers.abbreviations import abbreviation_token, build_abbreviation_index
+from tests.helpers.appendices import PageBreakCollector, build_appendix_index
+from tests.helpers.citations import build_citation_index, parse_citation
+from tests.helpers.fields import FieldCollector, collect_fields
+from tests.helpers.formulas import FormulaCollector, build_formula_index
+from tests.helpers.locations import ParagraphLocator
+from tests.helpers.numbering import NumberingResolver, heading_number
+from tests.helpers.objects import ObjectAnchorCollector, build_object_index
+from tests.helpers.paragraphs import ParagraphTable, ParagraphTableBuilder
+from tests.helpers.report import NormocontrolReport
+from tests.helpers.result_cache import ResultCache
+from tests.helpers.rules import BodyWalker
+from tests.helpers.sections import SectionIndexBuilder
+from tests.helpers.styles import StyleResolver
+from tests.helpers.tables import TableIndexBuilder
+from tests.helpers.text_lint import TextLinter, trie_pattern
+from tests.helpers.text_search import AhoCorasick
+from tests.helpers.toc import RenderedPageCollector, parse_toc_entry
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CHECKER_PATH = REPO_ROOT / "scripts" / "standards_verification" / "check_it_docx.py"
+CHECKLIST_PATH = REPO_ROOT / "scripts" / "standards_verification" / "standars_control_it_short.md"
+
+
+def _load_checker():
+    spec = importlib.util.spec_from_file_location("check_it_docx", CHECKER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+checker = _load_checker()
+
+
+def p(text: str = "", ppr: str = "", rpr: str = "") -> str:
+    """Build a w:p with a single run."""
+    ppr_xml = f"<w:pPr>{ppr}</w:pPr>" if ppr else ""
+    rpr_xml = f"<w:rPr>{rpr}</w:rPr>" if rpr else ""
+    return f'<w:p>{ppr_xml}<w:r>{rpr_xml}<w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+
+
+SECT_PR = (
+    '<w:sectPr><w:pgSz w:w="11906" w:h="16838"/>'
+    '<w:pgMar w:top="1134" w:right="567" w:bottom="851" w:left="1304"/></w:sectPr>'
+)
+
+
+STYLES_XML = (
+    '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:docDefaults>'
+    '<w:rPrDefault><w:rPr><w:rFonts w:asciiTheme="minorHAnsi" w:hAnsiTheme="minorHAnsi"/>'
+    '<w:sz w:val="22"/></w:rPr></w:rPrDefault>'
+    '<w:pPrDefault><w:pPr><w:spacing w:after="160" w:line="259" w:lineRule="auto"/></w:pPr></w:pPrDefault>'
+    '</w:docDefaults>'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/>'
+    '<w:pPr><w:ind w:firstLine="709"/></w:pPr>'
+    '<w:rPr><w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman"/><w:sz w:val="28"/></w:rPr></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Body"><w:basedOn w:val="Normal"/>'
+    '<w:pPr><w:jc w:val="both"/></w:pPr></w:style>'
+    '<w:style w:type="paragraph" w:styleId="List"><w:basedOn w:val="Body"/>'
+    '<w:pPr><w:ind w:left="720" w:hanging="360"/></w:pPr></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Plain"><w:basedOn w:val="Missing"/></w:style>'
+    '<w:style w:type="character" w:styleId="Small"><w:rPr><w:sz w:val="24"/></w:rPr></w:style>'
+    '</w:styles>'
+)
+
+THEME_XML = (
+    '<a:theme xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"><a:themeElements>'
+    '<a:fontScheme name="Office">'
+    '<a:majorFont><a:latin typeface="Calibri Light"/></a:majorFont>'
+    '<a:minorFont><a:latin typeface="Calibri"/><a:cs typeface=""/></a:minorFont>'
+    '</a:fontScheme></a:themeElements></a:theme>'
+)
+
+
+@pytest.fixture
+def config():
+    return checker.load_it_normocontrol_config(CHECKLIST_PATH)
+
+
+class TestDocumentModel:
+    """DocumentModel opens the archive once and parses each part at most once."""
+
+    def test_parts_are_parsed_once(self, make_docx):
+        path = make_docx(p("Текст") + SECT_PR, parts={"word/header1.xml": (
+            '<w:hdr xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>'
+        )})
+
+        with DocumentModel(path) as model:
+            assert model.document is model.document
+            assert model.part("word/header1.xml") is model.headers["word/header1.xml"]
+            assert model.styles is None
+            assert get_page_margins(model)["left"] == 1304
+
+    def test_archive_is_not_read_whole(self, make_docx, monkeypatch):
+        path = make_docx(p("Текст") + SECT_PR)
+
+        def read_bytes(self):
+            raise AssertionError("the archive must be read through the zip file handle")
+
+        monkeypatch.setattr(Path, "read_bytes", read_bytes)
+
+        with DocumentModel(path) as model:
+            assert [get_paragraph_text(el) for el in model.document.iter(W + "p")] == ["Текст"]
+            assert get_page_margins(model)["left"] == 1304
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_checks_share_one_model(self, make_docx, config, monkeypatch, stream):
+        body = (
+            p("ВВЕДЕНИЕ", rpr=BOLD) + p("Текст [1]")
+            + p("СПИСОК ИСПОЛЬЗОВАННЫХ ИСТОЧНИКОВ", rpr=BOLD) + p("1 Иванов И. И. Книга")
+        )
+        path = make_docx(body + SECT_PR, parts={
+            "word/styles.xml": STYLES_XML,
+            "word/header1.xml": _header("<w:p>" + _complex_field("PAGE", "1") + "</w:p>"),
+        })
+        archives = []
+        members = []
+        original_init, original_open = zipfile.ZipFile.__init__, zipfile.ZipFile.open
+
+        def counting_init(self, file, *args, **kwargs):
+            archives.append(file)
+            original_init(self, file, *args, **kwargs)
+
+        def counting_open(self, name, *args, **kwargs):
+            members.append(getattr(name, "filename", name))
+            return original_open(self, name, *args, **kwargs)
+
+        monkeypatch.setattr(zipfile.ZipFile, "__init__", counting_init)
+        monkeypatch.setattr(zipfile.ZipFile, "open", counting_open)
+
+        checker._check_document(path, path.name, NormocontrolReport(), config, stream=stream)
+
+        # One archive open for the whole run, and no part is read twice
+        assert archives == [path]
+        assert "word/document.xml" in members
+        assert len(members) == len(set(members))
+
+
+def _issues(report):
+    return [(i.category, i.severity, i.description, i.expected, i.actual) for i in report.issues]
+
+
+@pytest.fixture
+def run_checker():
+    """Run the checker on a path and return its in-memory `CheckResult`."""
+
+    def _run(path: Path, **kwargs):
+        return checker.check_it_docx_api(path, **kwargs)
+
+    return _run
+
+
+class TestStreaming:
+    """Constant-memory iterparse mode gives the same results as the in-memory tree."""
+
+    def test_body_elements_are_released(self, make_docx):
+        body = "".join(p(f"Абзац {i}", ppr='<w:ind w:firstLine="200"/>') for i in range(200))
+        path = make_docx(body + SECT_PR)
+
+        preceding_alive = []
+        texts = []
+        for element in iter_body_elements(path):
+            preceding_alive.append(len(list(element.itersiblings(preceding=True))))
+            if element.tag == W + "p":
+                texts.append(get_paragraph_text(element))
+
+        assert max(preceding_alive) <= 1
+        assert texts[:2] == ["Абзац 0", "Абзац 1"]
+
+    def test_stream_matches_in_memory(self, make_docx, run_checker):
+        body = "".join(
+            p(f"Текст [{i}]", ppr='<w:ind w:firstLine="200"/><w:spacing w:line="360" w:lineRule="auto"/>',
+              rpr='<w:rFonts w:ascii="Arial"/><w:sz w:val="20"/>')
+            for i in range(1, 30)
+        )
+        path = make_docx(body + p("Введение") + SECT_PR)
+
+        in_memory = run_checker(path, stream=False)
+        streamed = run_checker(path, stream=True)
+
+        assert _issues(streamed) == _issues(in_memory)
+        assert {i.category for i in streamed.issues} >= {"paragraphs", "fonts"}
+
+
+class TestBodyWalker:
+    """The rule engine visits the body once and dispatches by element type."""
+
+    TABLE = (
+        "<w:tbl><w:tr><w:tc>" + p("ячейка") + "</w:tc></w:tr></w:tbl>"
+    )
+
+    def test_dispatch_and_context(self, make_docx):
+        path = make_docx(p("до") + self.TABLE + p("после") + SECT_PR)
+
+        class Recorder:
+            def __init__(self):
+                self.events = []
+
+            def on_paragraph(self, paragraph, ctx):
+                self.events.append(("p", ctx.paragraph_index, ctx.in_table))
+
+            def on_table(self, table, ctx):
+                self.events.append(("tbl", ctx.table_depth))
+
+            def on_sect_pr(self, sect_pr, ctx):
+                self.events.append(("sectPr",))
+
+            def on_finish(self, ctx):
+                self.events.append(("finish", ctx.body_index))
+
+        class RunsOnly:
+            def __init__(self):
+                self.runs = []
+
+            def on_run(self, run, ctx):
+                self.runs.append(ctx.paragraph_index)
+
+        recorder, runs_only = Recorder(), RunsOnly()
+        with DocumentModel(path) as model:
+            BodyWalker([recorder, runs_only]).walk(get_body_elements(model))
+
+        assert recorder.events == [
+            ("p", 0, False),
+            ("tbl", 1),
+            ("p", 1, True),
+            ("p", 2, False),
+            ("sectPr",),
+            ("finish", 3),
+        ]
+        assert runs_only.runs == [0, 1, 2]
+
+    def test_same_results_for_stream(self, make_docx):
+        path = make_docx(p("до") + self.TABLE + p("после") + SECT_PR)
+
+        class Counter:
+            paragraphs = 0
+
+            def on_paragraph(self, paragraph, ctx):
+                self.paragraphs += 1
+
+        in_memory, streamed = Counter(), Counter()
+        with DocumentModel(path) as model:
+            BodyWalker([in_memory]).walk(get_body_elements(model))
+            BodyWalker([streamed]).walk(iter_body_elements(model))
+
+        assert in_memory.paragraphs == streamed.paragraphs == 3
+
+
+class TestBatch:
+    """Batch mode fans documents out to a process pool and merges one report."""
+
+    def test_collect_paths(self, make_docx, tmp_path):
+        make_docx(p("a"), name="one.docx")
+        make_docx(p("b"), name="~$one.docx")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "two.docx").write_bytes((tmp_path / "one.docx").read_bytes())
+
+        by_dir = checker._collect_docx_paths([str(tmp_path)], tmp_path)
+        by_glob = checker._collect_docx_paths(["*.docx"], tmp_path)
+
+        assert [path.name for path in by_dir] == ["one.docx", "two.docx"]
+        assert [path.name for path in by_glob] == ["one.docx"]
+
+    @pytest.mark.skipif(
+        multiprocessing.get_start_method() != "fork",
+        reason="patched checker must be inherited by forked workers",
+    )
+    def test_aggregate_report_and_timeout(self, make_docx, tmp_path, monkeypatch):
+        fast = make_docx(p("Текст") + SECT_PR, name="fast.docx")
+        slow = make_docx(p("Текст") + SECT_PR, name="slow.docx")
+        original = checker._check_document
+
+        def sometimes_slow(docx_path, *args, **kwargs):
+            if docx_path.name == "slow.docx":
+                time.sleep(30)
+            return original(docx_path, *args, **kwargs)
+
+        # Worker processes are forked, so they see the patched function.
+        monkeypatch.setattr(checker, "_check_document", sometimes_slow)
+
+        exit_code = checker.check_it_docx_batch(
+            [fast, slow], tmp_path / "reports", workers=2, timeout=1, base_dir=tmp_path
+        )
+
+        json_reports = list((tmp_path / "reports").glob("it_normocontrol_batch_*.json"))
+        assert exit_code == 1
+        assert len(json_reports) == 1
+        data = json.loads(json_reports[0].read_text(encoding="utf-8"))
+        assert data["documents"] == ["fast.docx", "slow.docx"]
+        slow_issues = [i for i in data["issues"] if i["document"] == "slow.docx"]
+        assert [i["category"] for i in slow_issues] == ["checker"]
+        assert any(i["document"] == "fast.docx" for i in data["issues"])
+
+    @pytest.mark.skipif(
+        multiprocessing.get_start_method() != "fork",
+        reason="patched checker must be inherited by forked workers",
+    )
+    def test_hung_worker_is_replaced(self, make_docx, tmp_path, monkeypatch):
+        hung = make_docx(p("Текст") + SECT_PR, name="hung.docx")
+        queued = make_docx(p("Текст") + SECT_PR, name="queued.docx")
+        original = checker._check_document
+
+        def sometimes_hung(docx_path, *args, **kwargs):
+            if docx_path.name == "hung.docx":
+                time.sleep(60)
+            return original(docx_path, *args, **kwargs)
+
+        # The in-worker timer cannot interrupt the call, only the parent can.
+        monkeypatch.setattr(checker, "_check_document", sometimes_hung)
+        monkeypatch.setattr(checker, "_time_limit", lambda seconds: contextlib.nullcontext())
+
+        start = time.monotonic()
+        checker.check_it_docx_batch([hung, queued], tmp_path / "reports", workers=1, timeout=0.5,
+                                    base_dir=tmp_path)
+
+        assert time.monotonic() - start < 30
+        json_report = next((tmp_path / "reports").glob("it_normocontrol_batch_*.json"))
+        issues = json.loads(json_report.read_text(encoding="utf-8"))["issues"]
+        assert [i["category"] for i in issues if i["document"] == "hung.docx"] == ["checker"]
+        # The document queued behind the hung one is checked, not timed out
+        assert "checker" not in {i["category"] for i in issues if i["document"] == "queued.docx"}
+
+
+class TestResultCache:
+    """Content-addressed result cache replays issues of unchanged documents."""
+
+    def test_hit_replays_without_opening(self, make_docx, tmp_path, config, monkeypatch):
+        path = make_docx(p("Текст") + SECT_PR)
+        cache = ResultCache(tmp_path / "cache", checklist_hash="md", checker_version="v1")
+
+        first = NormocontrolReport()
+        checker._check_document(path, "doc.docx", first, config, cache=cache)
+
+        def fail_open(self, docx_path):
+            raise AssertionError("cached document must not be opened")
+
+        monkeypatch.setattr(DocumentModel, "__init__", fail_open)
+        second = NormocontrolReport()
+        checker._check_document(path, "other.docx", second, config, cache=cache)
+
+        assert first.issues
+        assert [(i.category, i.description) for i in second.issues] == [
+            (i.category, i.description) for i in first.issues
+        ]
+        assert {i.document for i in second.issues} == {"other.docx"}
+
+    def test_key_depends_on_checklist_and_version(self, make_docx, tmp_path):
+        path = make_docx(p("Текст"))
+        base = ResultCache(tmp_path, checklist_hash="md", checker_version="v1")
+
+        assert base.key_for(path) == ResultCache(tmp_path, "md", "v1").key_for(path)
+        assert base.key_for(path) != ResultCache(tmp_path, "md2", "v1").key_for(path)
+        assert base.key_for(path) != ResultCache(tmp_path, "md", "v2").key_for(path)
+
+    def test_lru_eviction_bounds_size(self, tmp_path):
+        cache = ResultCache(tmp_path, "md", "v1", max_bytes=600)
+        issue = {"category": "fonts", "severity": "warning", "description": "x" * 100}
+        keys = [f"{i:02d}" + "0" * 62 for i in range(6)]
+
+        for key in keys:
+            cache.put(key, [issue])
+            # Distinct mtimes; touch the first entry so it stays most recently used.
+            time.sleep(0.02)
+            assert cache.get(keys[0]) is not None
+            time.sleep(0.02)
+
+        remaining = {path.stem for path in tmp_path.glob("*/*.json")}
+        assert keys[0] in remaining
+        assert keys[-1] in remaining
+        assert keys[1] not in remaining
+        assert sum(path.stat().st_size for path in tmp_path.glob("*/*.json")) <= 600
+
+    def test_writes_do_not_rescan(self, tmp_path, monkeypatch):
+        cache = ResultCache(tmp_path, "md", "v1", max_bytes=2000)
+        issue = {"category": "fonts", "severity": "warning", "description": "x" * 100}
+        cache.put("ff" + "0" * 62, [issue])
+
+        def fail_glob(self, pattern):
+            raise AssertionError("the cache directory must be scanned only once")
+
+        monkeypatch.setattr(Path, "glob", fail_glob)
+        for i in range(50):
+            cache.put(f"{i:02d}" + "1" * 62, [issue])
+        monkeypatch.undo()
+
+        assert sum(path.stat().st_size for path in tmp_path.glob("*/*.json")) <= 2000
+
+
+class TestCompiledConfig:
+    """The checklist is compiled once into a hash-checked JSON artifact."""
+
+    def test_compile_and_reuse(self, tmp_path, monkeypatch):
+        checklist = tmp_path / "checklist.md"
+        checklist.write_text(CHECKLIST_PATH.read_text(encoding="utf-8"), encoding="utf-8")
+
+        compiled = checker.compile_it_normocontrol_config(checklist)
+        artifact = checker.compiled_config_path(checklist)
+        assert artifact.exists()
+
+        def fail_parse(text):
+            raise AssertionError("compiled config must be reused")
+
+        monkeypatch.setattr(checker, "parse_it_normocontrol_config", fail_parse)
+        assert checker.load_it_normocontrol_config(checklist) == compiled
+
+    def test_load_does_not_write(self, tmp_path):
+        checklist = tmp_path / "checklist.md"
+        checklist.write_text(CHECKLIST_PATH.read_text(encoding="utf-8"), encoding="utf-8")
+
+        checker.load_it_normocontrol_config(checklist)
+
+        assert list(tmp_path.iterdir()) == [checklist]
+
+    def test_edit_invalidates_artifact(self, tmp_path):
+        checklist = tmp_path / "checklist.md"
+        text = CHECKLIST_PATH.read_text(encoding="utf-8")
+        checklist.write_text(text, encoding="utf-8")
+        checker.compile_it_normocontrol_config(checklist)
+
+        checklist.write_text(text.replace("левое 23", "левое 25"), encoding="utf-8")
+
+        assert checker.load_it_normocontrol_config(checklist).margins_left_mm == 25
+
+    def test_abstract_limits(self):
+        config = checker.parse_it_normocontrol_config(CHECKLIST_PATH.read_text(encoding="utf-8"))
+        bare = checker.parse_it_normocontrol_config(
+            CHECKLIST_PATH.read_text(encoding="utf-8").replace(" (500–800 знаков; 5–15 ключевых слов)", "")
+        )
+
+        assert (config.abstract_chars_min, config.abstract_chars_max) == (500, 800)
+        assert (config.abstract_keywords_min, config.abstract_keywords_max) == (5, 15)
+        assert bare.abstract_chars_min is None and bare.abstract_keywords_max is None
+
+    def test_compile_config_reports_broken_checklist(self, tmp_path):
+        checklist = tmp_path / "checklist.md"
+        checklist.write_text("# пусто\n", encoding="utf-8")
+
+        assert checker.main(["compile-config", str(checklist)]) == 1
+        assert not checker.compiled_config_path(checklist).exists()
+
+
+class TestStyleResolver:
+    """Effective properties follow docDefaults, basedOn chains and the theme."""
+
+    def _model(self, make_docx, body):
+        return DocumentModel(make_docx(body + SECT_PR, parts={
+            "word/styles.xml": STYLES_XML,
+            "word/theme/theme1.xml": THEME_XML,
+        }))
+
+    def test_inheritance_chain(self, make_docx):
+        body = (
+            p("a", ppr='<w:pStyle w:val="Body"/>')
+            + p("b", ppr='<w:pStyle w:val="List"/>')
+            + p("c", ppr='<w:pStyle w:val="Plain"/>', rpr='<w:rStyle w:val="Small"/>')
+            + p("d", rpr='<w:sz w:val="20"/>')
+        )
+        with self._model(make_docx, body) as model:
+            resolver = StyleResolver.from_model(model)
+            body_p, list_p, plain_p, normal_p = model.document.iter(W + "p")
+
+            props = resolver.paragraph_properties(body_p)
+            assert props["ind"]["firstLine"] == "709"
+            assert props["jc"] == "both"
+            assert props["spacing"]["line"] == "259"
+            assert resolver.paragraph_properties(list_p)["ind"]["firstLine"] is None
+
+            run = body_p.find(W + "r")
+            assert resolver.run_properties(run, body_p) == {
+                "sz": 28, "rFonts": {"ascii": "Times New Roman", "hAnsi": "Times New Roman"},
+            }
+            # Unknown basedOn: defaults only, theme font resolved; character style on top
+            plain = resolver.run_properties(plain_p.find(W + "r"), plain_p)
+            assert plain == {"sz": 24, "rFonts": {"ascii": "Calibri", "hAnsi": "Calibri"}}
+            # No pStyle: the default paragraph style applies under direct formatting
+            assert resolver.run_properties(normal_p.find(W + "r"), normal_p)["sz"] == 20
+
+    def test_chains_are_flattened_once(self, make_docx):
+        body = "".join(p(str(i), ppr='<w:pStyle w:val="List"/>') for i in range(50))
+        with self._model(make_docx, body) as model:
+            resolver = StyleResolver.from_model(model)
+            calls = []
+            original = resolver._style_ppr
+
+            def counting(style):
+                calls.append(style.get(W + "styleId"))
+                return original(style)
+
+            resolver._style_ppr = counting
+            for paragraph in model.document.iter(W + "p"):
+                resolver.paragraph_properties(paragraph)
+
+            assert sorted(calls) == ["Body", "List", "Normal"]
+
+    def test_styled_document_is_not_flagged(self, make_docx, run_checker):
+        body = "".join(p(f"Текст {i}", ppr='<w:pStyle w:val="Body"/>') for i in range(20))
+        path = make_docx(body + SECT_PR, parts={"word/styles.xml": STYLES_XML})
+
+        report = run_checker(path)
+
+        assert not [
+            i for i in report.issues
+            if i.category in ("fonts", "paragraphs") and i.severity != "info"
+        ]
+
+    def test_headings_and_cells_are_not_body_text(self, make_docx, run_checker):
+        styles = STYLES_XML.replace(
+            "</w:styles>",
+            '<w:style w:type="paragraph" w:styleId="Heading1"><w:basedOn w:val="Normal"/>'
+            '<w:pPr><w:ind w:firstLine="0"/><w:outlineLvl w:val="0"/></w:pPr></w:style>'
+            '<w:style w:type="paragraph" w:styleId="Caption"><w:basedOn w:val="Normal"/>'
+            '<w:pPr><w:ind w:firstLine="0"/></w:pPr></w:style></w:styles>',
+        )
+        body = (
+            p("1 Анализ", ppr='<w:pStyle w:val="Heading1"/>')
+            + "".join(p(f"Текст {i}", ppr='<w:pStyle w:val="Body"/>') for i in range(5))
+            + p("Таблица 1 – Данные", ppr='<w:pStyle w:val="Caption"/>')
+            + '<w:tbl><w:tr><w:tc>' + p("ячейка", ppr='<w:ind w:firstLine="0"/>') + '</w:tc></w:tr></w:tbl>'
+        )
+        path = make_docx(body + SECT_PR, parts={"word/styles.xml": styles})
+
+        report = run_checker(path)
+
+        assert not [i for i in report.issues if i.category == "paragraphs"]
+
+
+class TestFontHistogram:
+    """Font usage is aggregated over all runs, weighted by text length."""
+
+    def test_late_font_change_is_seen(self, make_docx, run_checker):
+        times = '<w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman"/><w:sz w:val="28"/>'
+        arial = '<w:rFonts w:ascii="Arial" w:hAnsi="Arial"/><w:sz w:val="20"/>'
+        body = (
+            "".join(p("т", rpr=times) for _ in range(300))
+            + "".join(p("а" * 10, rpr=arial) for _ in range(100))
+        )
+        report = run_checker(make_docx(body + SECT_PR))
+
+        fonts = [i for i in report.issues if i.category == "fonts"]
+        size_warning = [i for i in fonts if i.severity == "warning"]
+        histogram = [i for i in fonts if i.severity == "info"]
+
+        # 1000 of 1300 characters are Arial 10pt, although the first 300 runs are not.
+        assert size_warning and size_warning[0].actual.startswith("1000 из 1300")
+        assert histogram[0].actual == "Arial 10pt — 76.9%; Times New Roman 14pt — 23.1%"
+
+
+SAMPLE_DOCUMENTS = sorted(Path(__file__).parent.glob("*.docx"))
+
+TRICKY_BODY = (
+    p("Введение")
+    + '<w:p><w:r><w:t>Табуляция</w:t><w:tab/><w:t>и</w:t><w:br/><w:t>перенос</w:t>'
+    '<w:br w:type="page"/><w:cr/><w:noBreakHyphen/><w:ptab w:alignment="right"/></w:r></w:p>'
+    '<w:p><w:hyperlink><w:r><w:t xml:space="preserve">ссылка [1] </w:t></w:r></w:hyperlink>'
+    '<w:ins><w:r><w:t>вставка</w:t></w:r></w:ins><w:del><w:r><w:delText>удалено</w:delText></w:r></w:del></w:p>'
+    '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Таблица 1 – в ячейке</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+    + p("Рисунок 1 - Схема")
+    + p("Заключение")
+    + p("Список использованных источников")
+    + p("1. Источник")
+    + SECT_PR
+)
+
+
+def _paragraph_table(model: DocumentModel) -> ParagraphTable:
+    builder = ParagraphTableBuilder(StyleResolver.from_model(model), NumberingResolver.from_model(model))
+    BodyWalker([builder]).walk(get_body_elements(model))
+    return builder.table
+
+
+def _python_docx_texts(path: Path) -> list:
+    """Oracle: body paragraph texts as python-docx reads them."""
+    docx = pytest.importorskip("docx")
+    return [paragraph.text for paragraph in docx.Document(str(path)).paragraphs]
+
+
+class TestTextExtraction:
+    """Paragraph text comes from lxml with python-docx semantics; docx is never imported."""
+
+    def test_paragraph_texts_match_python_docx(self, make_docx):
+        path = make_docx(TRICKY_BODY)
+
+        with DocumentModel(path) as model:
+            body = model.document.find(W + "body")
+            texts = [get_paragraph_text(el) for el in body if el.tag == W + "p"]
+
+        assert texts == _python_docx_texts(path)
+
+    @pytest.mark.parametrize("docx_path", SAMPLE_DOCUMENTS, ids=lambda path: path.name)
+    def test_sample_document_parity(self, docx_path):
+        with DocumentModel(docx_path) as model:
+            table = _paragraph_table(model)
+
+        assert [table.texts[row] for row in table.body_rows()] == _python_docx_texts(docx_path)
+
+    def test_docx_is_not_imported(self, make_docx, tmp_path):
+        path = make_docx(TRICKY_BODY)
+        code = (
+            "import sys\n"
+            f"sys.path.insert(0, {str(CHECKER_PATH.parent)!r})\n"
+            "import check_it_docx\n"
+            "from pathlib import Path\n"
+            f"check_it_docx.check_it_docx(Path({str(path)!r}), Path({str(tmp_path / 'reports')!r}))\n"
+            "print(sorted(m for m in sys.modules if m == 'docx' or m.startswith('docx.')))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=REPO_ROOT)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+class TestParagraphTable:
+    """One columnar table per document serves every text-based rule."""
+
+    def test_columns(self, make_docx):
+        heading = '<w:pStyle w:val="Heading1"/>'
+        styles = STYLES_XML.replace(
+            "</w:styles>",
+            '<w:style w:type="paragraph" w:styleId="Heading1"><w:basedOn w:val="Normal"/>'
+            '<w:pPr><w:outlineLvl w:val="0"/></w:pPr></w:style></w:styles>',
+        )
+        path = make_docx(p("ВВЕДЕНИЕ", ppr=heading) + TRICKY_BODY, parts={"word/styles.xml": styles})
+
+        with DocumentModel(path) as model:
+            table = _paragraph_table(model)
+
+        assert table.style_ids[:2] == ["Heading1", "Normal"]
+        assert table.outline_levels[:2] == [0, None]
+        assert table.revised[3] == "ссылка [1] вставка"
+        assert table.texts[3] == "ссылка [1] "
+        cell = table.find("в ячейке")
+        assert table.table_depths[cell] == 1 and not table.body_level[cell]
+        for row, text in enumerate(table.texts):
+            assert table.joined[table.offsets[row]:table.offsets[row] + len(text)] == text
+
+    def test_find_stays_inside_paragraphs(self, make_docx):
+        with DocumentModel(make_docx(p("Вве") + p("дение") + p("Введение") + SECT_PR)) as model:
+            table = _paragraph_table(model)
+
+        assert table.find("введение") == 2
+        assert table.find("е\nд") is None
+        assert table.row_at(table.offsets[1] + 2) == 1
+
+
+class TestCheckApi:
+    """check_it_docx_api returns everything in memory; reports never collide."""
+
+    def test_result_in_memory(self, make_docx, tmp_path):
+        path = make_docx(p("Введение", rpr='<w:rFonts w:ascii="Arial" w:hAnsi="Arial"/>') + SECT_PR)
+
+        result = checker.check_it_docx_api(path)
+
+        assert result.exit_code == 1
+        assert result.summary["errors"] == sum(i.severity == "error" for i in result.issues)
+        assert "# Отчёт проверки нормоконтроля" in result.markdown
+        assert not (tmp_path / "reports").exists()
+
+    def test_reports_in_same_second_do_not_overwrite(self, make_docx, tmp_path):
+        result = checker.check_it_docx_api(make_docx(p("Текст") + SECT_PR))
+
+        paths = {result.write_markdown(tmp_path) for _ in range(3)}
+
+        assert len(paths) == 3
+        assert all(path.read_text(encoding="utf-8") == result.markdown for path in paths)
+
+
+BOLD = "<w:b/>"
+
+
+def _structure_issues(report):
+    return [i for i in report.issues if i.category == "structure"]
+
+
+class TestSectionLocator:
+    """Section headings are located in one multi-pattern scan of heading-like paragraphs."""
+
+    def test_automaton_reports_overlapping_matches(self):
+        automaton = AhoCorasick([("he", 1), ("she", 2), ("hers", 3), ("приложени", 4)])
+
+        assert list(automaton.iter_matches("ushers")) == [(1, 4, 2), (2, 4, 1), (2, 6, 3)]
+        assert list(automaton.iter_matches("приложения")) == [(0, 9, 4)]
+
+    def test_toc_and_sentences_are_not_headings(self, make_docx, run_checker):
+        toc = "".join(p(f"{name}\t{page}") for page, name in enumerate(
+            ["Введение", "Заключение", "Список использованных источников"], start=3))
+        body = (
+            p("ЗАДАНИЕ", rpr=BOLD)
+            + p("РЕФЕРАТ", rpr=BOLD)
+            + p("Содержание", rpr=BOLD)
+            + toc
+            + p("Во введении и в заключение сказано главное.")
+            + p("ВВЕДЕНИЕ", rpr=BOLD)
+            + p("1 Анализ", rpr=BOLD)
+            + p("ЗАКЛЮЧЕНИЕ", rpr=BOLD)
+            + p("СПИСОК ИСПОЛЬЗОВАННЫХ ИСТОЧНИКОВ", rpr=BOLD)
+            + p("ПРИЛОЖЕНИЕ А", rpr=BOLD)
+            + SECT_PR
+        )
+        report = run_checker(make_docx(body))
+
+        assert _structure_issues(report) == []
+
+    def test_positions_are_real_headings(self, make_docx, config):
+        body = (
+            p("Введение в заключение")
+            + p("ЗАКЛЮЧЕНИЕ", rpr=BOLD)
+            + p("1. Введение", ppr='<w:outlineLvl w:val="0"/>')
+            + SECT_PR
+        )
+        with DocumentModel(make_docx(body)) as model:
+            paragraphs = checker._check_body("doc", model, NormocontrolReport(), config).locator.table
+
+        positions = checker._find_section_positions(paragraphs, ["Введение", "Заключение"])
+
+        assert positions == {"Заключение": 1, "Введение": 2}
+
+    def test_title_only_in_text_is_reported(self, make_docx, run_checker):
+        body = p("ЗАДАНИЕ", rpr=BOLD) + p("Реферат и введение обычным текстом.") + SECT_PR
+
+        issue = _structure_issues(run_checker(make_docx(body)))[0]
+
+        assert issue.severity == "error"
+        assert "Реферат (есть в тексте: раздел «ЗАДАНИЕ», абзац 2, но не оформлен как заголовок)" in issue.actual
+        assert "Приложения" not in issue.actual
+
+
+class TestLocations:
+    """Issue locations come from one element index and a bisect over headings."""
+
+    BODY = (
+        p("Перед заголовками")
+        + p("ВВЕДЕНИЕ", rpr=BOLD)
+        + p("Текст введения")
+        + p("2.3 Выбор архитектуры", ppr='<w:outlineLvl w:val="1"/>')
+        + p("Текст раздела")
+        + SECT_PR
+    )
+
+    def test_describe(self, make_docx):
+        with DocumentModel(make_docx(self.BODY)) as model:
+            locator = ParagraphLocator(_paragraph_table(model))
+
+        assert locator.describe(0) == "абзац 1"
+        assert locator.describe(2) == "раздел «ВВЕДЕНИЕ», абзац 3"
+        assert locator.describe(4) == "раздел 2.3, абзац 5"
+        assert locator.describe_rows([0, 2, 3, 4], limit=2) == "абзац 1; раздел «ВВЕДЕНИЕ», абзац 3 (и ещё 2)"
+
+    def test_find_paragraph_index_and_heading(self, make_docx):
+        with DocumentModel(make_docx(self.BODY)) as model:
+            paragraphs = list(model.document.iter(W + "p"))
+
+            assert [find_paragraph_index(model, el) for el in paragraphs] == list(range(5))
+            assert find_paragraph_index(model, etree.Element(W + "p")) == -1
+            assert find_nearby_heading(model, 4) == "2.3 Выбор архитектуры"
+            assert find_nearby_heading(model, 0) == ""
+
+            # A bare document root works too (direct formatting only).
+            root = model.document
+            assert find_paragraph_index(root, paragraphs[3]) == 3
+            assert find_nearby_heading(root, 2) == "ВВЕДЕНИЕ"
+
+            # Nothing is cached for a bare root: an edited tree is seen as it is now,
+            # and a locator built once can be passed in for repeated lookups.
+            body = root.find(W + "body")
+            body.remove(paragraphs[0])
+            assert find_paragraph_index(root, paragraphs[3]) == 2
+            locator = get_locator(root)
+            assert find_nearby_heading(root, 1, locator=locator) == "ВВЕДЕНИЕ"
+
+    def test_lookups_do_not_rescan_the_document(self, make_docx):
+        path = make_docx(p("ВВЕДЕНИЕ", rpr=BOLD) + p("Текст") * 3000 + SECT_PR)
+        with DocumentModel(path) as model:
+            paragraphs = list(model.document.iter(W + "p"))
+            find_paragraph_index(model, paragraphs[0])
+
+            start = time.perf_counter()
+            indices = [find_paragraph_index(model, el) for el in paragraphs]
+            elapsed = time.perf_counter() - start
+
+        assert indices == list(range(len(paragraphs)))
+        assert elapsed < 0.5
+
+    def test_bare_root_lookups(self, make_docx, monkeypatch):
+        path = make_docx(p("ВВЕДЕНИЕ", rpr=BOLD) + p("Текст") * 3000 + SECT_PR)
+        with DocumentModel(path) as model:
+            root = model.document
+        paragraphs = list(root.iter(W + "p"))
+
+        # Bulk lookups share one locator built up front
+        start = time.perf_counter()
+        locator = get_locator(root)
+        indices = [find_paragraph_index(root, el, locator=locator) for el in paragraphs]
+        headings = {find_nearby_heading(root, i, locator=locator) for i in indices}
+        elapsed = time.perf_counter() - start
+
+        assert indices == list(range(len(paragraphs)))
+        assert headings == {"ВВЕДЕНИЕ"}
+        assert elapsed < 1.0
+
+        # A single lookup scans the paragraphs instead of building a locator
+        monkeypatch.setattr(ParagraphLocator, "from_document", None)
+        assert find_paragraph_index(root, paragraphs[-1]) == len(paragraphs) - 1
+        assert find_paragraph_index(root, etree.Element(W + "p")) == -1
+
+    def test_issues_carry_locations(self, make_docx, run_checker):
+        body = (
+            p("1 Анализ", rpr=BOLD)
+            + p("Абзац", ppr='<w:ind w:firstLine="1134"/>')
+            + p("Рисунок 1 - Схема.")
+            + SECT_PR
+        )
+        report = run_checker(make_docx(body))
+        locations = {i.category: i.location for i in report.issues}
+
+        assert locations["paragraphs"] == "раздел 1, абзац 2"
+        assert locations["figures"] == "раздел 1, абзац 3"
+
+
+def _sect_pr(config, width_mm=210, height_mm=297, landscape=False, rotated=False, extra="", left_mm=None):
+    """w:sectPr with A4 size and the checklist margins (optionally altered)."""
+    margins = {
+        "top": config.margins_top_mm,
+        "right": config.margins_right_mm,
+        "bottom": config.margins_bottom_mm,
+        "left": config.margins_left_mm if left_mm is None else left_mm,
+    }
+    if rotated:
+        margins = {"top": margins["left"], "right": margins["top"],
+                   "bottom": margins["right"], "left": margins["bottom"]}
+    orient = ' w:orient="landscape"' if landscape else ""
+    mar = " ".join(f'w:{key}="{mm_to_twips(mm)}"' for key, mm in margins.items())
+    return (
+        f'<w:sectPr>{extra}<w:pgSz w:w="{mm_to_twips(width_mm)}" w:h="{mm_to_twips(height_mm)}"{orient}/>'
+        f"<w:pgMar {mar}/></w:sectPr>"
+    )
+
+
+class TestSections:
+    """Every section is indexed and checked, not only the last one."""
+
+    def test_index(self, make_docx, config):
+        title = _sect_pr(
+            config,
+            extra='<w:headerReference w:type="default" r:id="rId7"/>'
+                  '<w:footerReference w:type="first" r:id="rId8"/><w:titlePg/>',
+        )
+        wide = _sect_pr(config, 297, 210, landscape=True, extra='<w:type w:val="nextPage"/>')
+        body = (
+            p("Титул") + p("", ppr=title)
+            + p("Таблица") + p("", ppr=wide)
+            + p("Текст") + _sect_pr(config)
+        )
+        with DocumentModel(make_docx(body)) as model:
+            builder = SectionIndexBuilder()
+            BodyWalker([builder]).walk(get_body_elements(model))
+            streamed = SectionIndexBuilder()
+            BodyWalker([streamed]).walk(iter_body_elements(model))
+
+        sections = builder.sections
+        assert [(s.first_row, s.last_row) for s in sections] == [(0, 1), (2, 3), (4, 4)]
+        assert [s.orientation for s in sections] == ["portrait", "landscape", "portrait"]
+        assert sections[0].title_page and not sections[2].title_page
+        assert sections[0].header_refs == {"default": "rId7"}
+        assert sections[0].footer_refs == {"first": "rId8"}
+        assert sections[0].margins["left"] == mm_to_twips(config.margins_left_mm)
+        assert streamed.sections == sections
+
+    def test_tracked_section_change_is_ignored(self, make_docx, config):
+        old = f"<w:sectPrChange w:id=\"1\">{_sect_pr(config, left_mm=10)}</w:sectPrChange>"
+        with DocumentModel(make_docx(p("Текст") + _sect_pr(config, extra=old))) as model:
+            builder = SectionIndexBuilder()
+            BodyWalker([builder]).walk(get_body_elements(model))
+
+        assert len(builder.sections) == 1
+
+    def test_checks_run_per_section(self, make_docx, run_checker, config):
+        body = (
+            p("Титул") + p("", ppr=_sect_pr(config, left_mm=10))
+            + p("Таблица") + p("", ppr=_sect_pr(config, 297, 210, landscape=True, rotated=True))
+            + p("Текст") + _sect_pr(config)
+        )
+        issues = [i for i in run_checker(make_docx(body)).issues if i.category == "page_setup"]
+
+        assert [(i.description, i.location) for i in issues] == [
+            ("Некорректное поле 'left'",
+             "Раздел 1 из 3 (абзацы 1–2, книжная) → Разметка страницы → Поля → Настраиваемые поля"),
+        ]
+
+    def test_wrong_size_in_middle_section(self, make_docx, run_checker, config):
+        body = (
+            p("Текст") + p("", ppr=_sect_pr(config, 216, 279))
+            + p("Текст") + _sect_pr(config)
+        )
+        issues = [i for i in run_checker(make_docx(body)).issues if i.category == "page_setup"]
+
+        assert [(i.description, i.location) for i in issues] == [
+            ("Размер страницы не соответствует A4", "Раздел 1 из 2 (абзацы 1–2, книжная)"),
+        ]
+
+
+def _complex_field(instruction: str, result: str) -> str:
+    """Runs of a complex field: begin, instrText, separate, result, end."""
+    return (
+        '<w:r><w:fldChar w:fldCharType="begin"/></w:r>'
+        f'<w:r><w:instrText xml:space="preserve"> {instruction} </w:instrText></w:r>'
+        '<w:r><w:fldChar w:fldCharType="separate"/></w:r>'
+        f'<w:r><w:t>{result}</w:t></w:r>'
+        '<w:r><w:fldChar w:fldCharType="end"/></w:r>'
+    )
+
+
+def _header(paragraph_xml: str) -> str:
+    return f'<w:hdr xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">{paragraph_xml}</w:hdr>'
+
+
+HEADER_STYLES_XML = STYLES_XML.replace(
+    "</w:styles>",
+    '<w:style w:type="paragraph" w:styleId="Header"><w:basedOn w:val="Normal"/><w:pPr><w:tabs>'
+    '<w:tab w:val="center" w:pos="4677"/><w:tab w:val="right" w:pos="9355"/></w:tabs></w:pPr></w:style>'
+    "</w:styles>",
+)
+
+
+class TestFields:
+    """Fields are parsed from w:fldSimple and w:fldChar sequences, not by substring."""
+
+    def test_complex_and_simple_fields(self, make_docx):
+        toc = (
+            '<w:p><w:r><w:fldChar w:fldCharType="begin"/></w:r>'
+            '<w:r><w:instrText xml:space="preserve"> TOC \\o "1-3" \\h </w:instrText></w:r>'
+            '<w:r><w:fldChar w:fldCharType="separate"/></w:r>'
+            '<w:r><w:t>Введение\t</w:t></w:r>' + _complex_field("PAGEREF _Toc1 \\h", "3") + "</w:p>"
+            '<w:p><w:r><w:t>Заключение</w:t></w:r><w:r><w:fldChar w:fldCharType="end"/></w:r></w:p>'
+        )
+        caption = (
+            '<w:p><w:bookmarkStart w:id="0" w:name="_Ref5"/><w:r><w:t xml:space="preserve">Рисунок </w:t></w:r>'
+            '<w:fldSimple w:instr=" SEQ Рисунок \\* ARABIC "><w:r><w:t>1</w:t></w:r></w:fldSimple>'
+            '<w:bookmarkEnd w:id="0"/></w:p>'
+        )
+        with DocumentModel(make_docx(toc + caption + SECT_PR)) as model:
+            collector = FieldCollector()
+            BodyWalker([collector]).walk(get_body_elements(model))
+
+        toc_field, pageref, seq = collector.fields
+        assert (toc_field.name, toc_field.paragraph_index, toc_field.end_paragraph_index) == ("TOC", 0, 1)
+        assert toc_field.result == "Введение\t3Заключение"
+        assert toc_field.switches == {"\\o", "\\h"} and toc_field.argument == ""
+        assert (pageref.name, pageref.argument, pageref.result) == ("PAGEREF", "_Toc1", "3")
+        assert (seq.name, seq.argument, seq.result, seq.simple) == ("SEQ", "Рисунок", "1", True)
+        assert collector.bookmarks == {"_Ref5"}
+
+    def test_preceding_text(self):
+        header = etree.fromstring(_header(
+            '<w:p><w:r><w:t>Стр.</w:t></w:r><w:r><w:tab/></w:r>' + _complex_field("PAGE", "5") + "</w:p>"
+        ))
+
+        (page,) = collect_fields(header)
+
+        assert (page.name, page.preceding_text, page.result) == ("PAGE", "Стр.\t", "5")
+
+    def _pagination(self, make_docx, run_checker, header_paragraph):
+        parts = {"word/header1.xml": _header(header_paragraph), "word/styles.xml": HEADER_STYLES_XML}
+        report = run_checker(make_docx(p("Текст") + SECT_PR, parts=parts))
+        return [(i.description, i.actual) for i in report.issues if i.category == "pagination"]
+
+    def test_pages_text_is_not_a_page_field(self, make_docx, run_checker):
+        issues = self._pagination(
+            make_docx, run_checker,
+            '<w:p><w:r><w:t>PAGES / Page layout</w:t></w:r>' + _complex_field("NUMPAGES", "9") + "</w:p>",
+        )
+
+        assert issues == [("Не найдено поле PAGE в колонтитулах (не удалось подтвердить нумерацию страниц)",
+                           "PAGE не найден")]
+
+    @pytest.mark.parametrize("paragraph, expected", [
+        ('<w:p><w:pPr><w:jc w:val="right"/></w:pPr>' + _complex_field("PAGE", "2") + "</w:p>", []),
+        ('<w:p><w:pPr><w:pStyle w:val="Header"/></w:pPr><w:r><w:tab/><w:tab/></w:r>'
+         '<w:fldSimple w:instr="PAGE"><w:r><w:t>2</w:t></w:r></w:fldSimple></w:p>', []),
+        ('<w:p><w:pPr><w:pStyle w:val="Header"/></w:pPr><w:r><w:tab/></w:r>'
+         + _complex_field("PAGE", "2") + "</w:p>",
+         [("Номер страницы не выровнен по правому краю", "по центру")]),
+    ], ids=["jc-right", "right-tab-stop", "centered"])
+    def test_page_number_position(self, make_docx, run_checker, paragraph, expected):
+        assert self._pagination(make_docx, run_checker, paragraph) == expected
+
+    def test_seq_gap_and_broken_reference(self, make_docx, run_checker):
+        def caption(number):
+            return (
+                '<w:p><w:r><w:t xml:space="preserve">Рисунок </w:t></w:r>'
+                + _complex_field("SEQ Рисунок \\* ARABIC", str(number)) + "<w:r><w:t> – Схема</w:t></w:r></w:p>"
+            )
+
+        body = (
+            p("1 Анализ", rpr=BOLD)
+            + caption(1) + caption(3)
+            + p("Рисунок 4 – Вручную")
+            + '<w:p><w:r><w:t xml:space="preserve">см. </w:t></w:r>'
+            + _complex_field("REF _Ref99 \\h", "Ошибка! Источник ссылки не найден.") + "</w:p>"
+            + SECT_PR
+        )
+        issues = {i.description: i for i in run_checker(make_docx(body)).issues if i.category != "fonts"}
+
+        gap = issues["Нарушена нумерация поля SEQ «Рисунок»"]
+        assert (gap.category, gap.expected, gap.actual, gap.location) == ("figures", "2", "3", "раздел 1, абзац 3")
+        assert issues["Часть подписей пронумерована вручную, без поля SEQ"].location == "раздел 1, абзац 4"
+        broken = issues["Перекрёстные ссылки указывают на несуществующие закладки"]
+        assert (broken.actual, broken.location) == ("_Ref99", "раздел 1, абзац 5")
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_bookmarks_outside_paragraphs(self, make_docx, run_checker, stream):
+        body = (
+            p("1 Анализ", rpr=BOLD)
+            + '<w:p><w:r><w:t xml:space="preserve">см. </w:t></w:r>'
+            + _complex_field("REF _RefTable \\h", "таблицу 1")
+            + _complex_field("REF _RefRow \\h", "строку 2") + "</w:p>"
+            + '<w:bookmarkStart w:id="1" w:name="_RefTable"/>'
+            + '<w:tbl><w:tr><w:tc>' + p("а") + '</w:tc></w:tr>'
+            + '<w:bookmarkStart w:id="2" w:name="_RefRow"/>'
+            + '<w:tr><w:tc>' + p("б") + '</w:tc></w:tr><w:bookmarkEnd w:id="2"/></w:tbl>'
+            + '<w:bookmarkEnd w:id="1"/>'
+            + SECT_PR
+        )
+
+        report = run_checker(make_docx(body), stream=stream)
+
+        assert "Перекрёстные ссылки указывают на несуществующие закладки" not in {
+            i.description for i in report.issues
+        }
+
+
+NUMBERED = '<w:numPr><w:ilvl w:val="0"/><w:numId w:val="4"/></w:numPr>'
+
+
+class TestCitations:
+    """Citations are expanded and matched with the source list in one pass."""
+
+    @pytest.mark.parametrize("content, expected", [
+        ("8", [8]),
+        ("1, 3", [1, 3]),
+        ("2–5", [2, 3, 4, 5]),
+        ("1; 4-5", [1, 4, 5]),
+        ("3, с. 45; 7", [3, 7]),
+        ("Электронный ресурс", None),
+        ("0, 1", None),
+        ("1900–2020", None),
+    ])
+    def test_parse(self, content, expected):
+        assert parse_citation(content) == expected
+
+    def test_index(self, make_docx):
+        body = (
+            p("Текст [1, 3] и [2–4], снова [1].")
+            + p("СПИСОК ИСПОЛЬЗОВАННЫХ ИСТОЧНИКОВ", rpr=BOLD)
+            + p("Иванов И. И. Книга [Электронный ресурс]", ppr=NUMBERED)
+            + p("Петров П. П. Статья", ppr=NUMBERED)
+            + p("Сидоров С. С. Пособие", ppr=NUMBERED)
+            + p("5. Смирнов", )
+            + p("ПРИЛОЖЕНИЕ А", rpr=BOLD)
+            + p("См. [6]")
+            + SECT_PR
+        )
+        with DocumentModel(make_docx(body)) as model:
+            table = _paragraph_table(model)
+
+        index = build_citation_index(table, 1, 6)
+
+        assert index.mentions == [(1, 0), (3, 0), (2, 0), (3, 0), (4, 0), (1, 0), (6, 7)]
+        assert list(index.first_mentions) == [1, 3, 2, 4, 6]
+        assert index.sources == {1: 2, 2: 3, 3: 4, 5: 5}
+        assert index.dotted_entries == [5]
+        assert index.dangling() == [(4, 0), (6, 7)]
+        assert index.unused() == [(5, 5)]
+        assert index.out_of_order() == [(3, 2, 0), (2, 3, 0), (6, 5, 7)]
+
+    def test_tracked_insertion(self, make_docx):
+        body = (
+            '<w:p><w:r><w:t xml:space="preserve">Текст </w:t></w:r>'
+            '<w:ins><w:r><w:t>[1]</w:t></w:r></w:ins></w:p>'
+            + p("СПИСОК ИСПОЛЬЗОВАННЫХ ИСТОЧНИКОВ", rpr=BOLD)
+            + p("1 Иванов И. И. Книга")
+            + SECT_PR
+        )
+        with DocumentModel(make_docx(body)) as model:
+            table = _paragraph_table(model)
+
+        index = build_citation_index(table, 2, 3)
+
+        assert index.mentions == [(1, 0)]
+        assert index.unused() == []
+
+    def test_issues(self, make_docx, run_checker):
+        body = (
+            p("1 Анализ", rpr=BOLD)
+            + p("Известно [2], см. также [1–2] и [4].")
+            + p("СПИСОК ИСПОЛЬЗОВАННЫХ ИСТОЧНИКОВ", rpr=BOLD)
+            + p("1 Иванов И. И. Книга")
+            + p("2 Петров П. П. Статья")
+            + p("3 Сидоров С. С. Пособие")
+            + SECT_PR
+        )
+        issues = {
+            i.description: (i.severity, i.actual, i.location)
+            for i in run_checker(make_docx(body)).issues if i.category == "references"
+        }
+
+        assert issues == {
+            "Ссылки на источники, которых нет в списке": ("error", "[4]", "раздел 1, абзац 2"),
+            "В списке есть источники без ссылок в тексте": (
+                "warning", "[3]", "раздел «СПИСОК ИСПОЛЬЗОВАННЫХ ИСТОЧНИКОВ», абзац 6"),
+            "Источники пронумерованы не в порядке первых ссылок": (
+                "warning", "впервые упомянут [2] (нарушений: 3)", "раздел 1, абзац 2"),
+        }
+
+
+DRAWING = '<w:p><w:r><w:drawing/></w:r></w:p>'
+
+
+def _tbl(*cells: str) -> str:
+    return "<w:tbl><w:tr>" + "".join(f"<w:tc>{p(cell)}</w:tc>" for cell in cells) + "</w:tr></w:tbl>"
+
+
+class TestObjectIndex:
+    """Captions, drawings, tables and mentions are indexed in the body walk."""
+
+    BODY = (
+        p("На рисунке 1 и в таблицах 1–2 показано главное.")  # 0
+        + DRAWING  # 1
+        + p("Рисунок 1 – Схема")  # 2
+        + p("Таблица 1 – Данные")  # 3
+        + _tbl("a", "b")  # 4, 5
+        + p("Продолжение таблицы 1")  # 6
+        + _tbl("c")  # 7
+        + DRAWING  # 8
+        + p("Рисунок 3 – Без ссылки")  # 9
+        + p("Таблица 2 – Итоги")  # 10
+        + _tbl("см. табл. 2")  # 11
+        + p("Продолжение таблицы 5")  # 12
+        + p("Как видно из рис. 2, всё хорошо")  # 13
+        + SECT_PR
+    )
+
+    def test_index(self, make_docx):
+        with DocumentModel(make_docx(self.BODY)) as model:
+            builder = ParagraphTableBuilder(StyleResolver.from_model(model))
+            anchors = ObjectAnchorCollector()
+            BodyWalker([builder, anchors]).walk(get_body_elements(model))
+
+        index = build_object_index(builder.table, anchors)
+
+        assert anchors.drawing_rows == [1, 8]
+        assert anchors.table_rows == [(4, 5), (7, 7), (11, 11)]
+        assert [(o.number, o.caption_row, o.object_row, o.first_mention) for o in index.figures] == [
+            ("1", 2, 1, 0), ("3", 9, 8, None)]
+        assert [(o.number, o.caption_row, o.object_row, o.first_mention) for o in index.tables] == [
+            ("1", 3, 4, 0), ("2", 10, 11, 0)]
+        assert index.continuations == [("1", 6), ("5", 12)]
+        assert [o.number for o in index.unreferenced("figure")] == ["3"]
+        assert [(expected, o.number) for expected, o in index.gaps("figure")] == [("2", "3")]
+        assert index.orphan_continuations() == [("5", 12)]
+
+    def test_placement_and_duplicates(self, make_docx, run_checker):
+        body = (
+            p("1 Анализ", rpr=BOLD)
+            + DRAWING
+            + p("Рисунок 1.1 – Схема")
+            + p("Схема показана на рисунке 1.1.")
+            + p("Рисунок 1.1 – Ещё схема (см. рисунок 1.1)")
+            + p("2 Проект", rpr=BOLD)
+            + p("Рисунок 2.2 – Пропуск, рисунок 2.2")
+            + SECT_PR
+        )
+        issues = {
+            i.description: (i.severity, i.expected, i.actual, i.location)
+            for i in run_checker(make_docx(body)).issues if i.category == "figures"
+        }
+
+        assert issues["Рисунки расположены до первого упоминания в тексте"] == (
+            "warning", "Объект — сразу после первой ссылки на него",
+            "1.1 (ссылка: раздел 1, абзац 4)", "раздел 1, абзац 2")
+        assert issues["Повторяющиеся номера рисунков"][0] == "error"
+        assert issues["Повторяющиеся номера рисунков"][3] == "раздел 1, абзац 5"
+        assert issues["Нарушена последовательность номеров рисунков"][1:] == (
+            "2.1", "2.2", "раздел 2, абзац 7")
+        assert "Нет ссылок в тексте на рисунки" not in issues
+
+    def test_seq_in_simple_field(self, make_docx, run_checker):
+        caption = (
+            '<w:p><w:r><w:t xml:space="preserve">Рисунок </w:t></w:r>'
+            '<w:fldSimple w:instr=" SEQ Рисунок \\* ARABIC "><w:r><w:t>1</w:t></w:r></w:fldSimple>'
+            '<w:r><w:t xml:space="preserve"> – Схема</w:t></w:r></w:p>'
+        )
+        body = p("Схема показана на рисунке 1.") + DRAWING + caption + SECT_PR
+
+        issues = [i.description for i in run_checker(make_docx(body)).issues if i.category == "figures"]
+
+        assert issues == []
+
+
+NUMBERING_XML = (
+    '<w:numbering xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:abstractNum w:abstractNumId="1">'
+    '<w:styleLink w:val="Headings"/>'
+    '<w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:lvlText w:val="%1"/></w:lvl>'
+    '<w:lvl w:ilvl="1"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:lvlText w:val="%1.%2"/></w:lvl>'
+    '<w:lvl w:ilvl="2"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:lvlText w:val="%1.%2.%3."/></w:lvl>'
+    '</w:abstractNum>'
+    '<w:abstractNum w:abstractNumId="2"><w:numStyleLink w:val="Headings"/></w:abstractNum>'
+    '<w:abstractNum w:abstractNumId="3">'
+    '<w:lvl w:ilvl="0"><w:numFmt w:val="russianUpper"/><w:lvlText w:val="%1)"/></w:lvl>'
+    '</w:abstractNum>'
+    '<w:num w:numId="1"><w:abstractNumId w:val="2"/></w:num>'
+    '<w:num w:numId="2"><w:abstractNumId w:val="3"/>'
+    '<w:lvlOverride w:ilvl="0"><w:startOverride w:val="3"/></w:lvlOverride></w:num>'
+    '<w:num w:numId="4"><w:abstractNumId w:val="1"/></w:num>'
+    '</w:numbering>'
+)
+
+
+def _numbered(ilvl: int, num_id: int = 1, extra: str = "") -> str:
+    return f'<w:numPr><w:ilvl w:val="{ilvl}"/><w:numId w:val="{num_id}"/></w:numPr>{extra}'
+
+
+class TestNumbering:
+    """List labels are computed from numbering.xml during the body walk."""
+
+    def test_labels(self, make_docx):
+        body = (
+            p("Анализ", ppr=_numbered(0))
+            + p("Обзор", ppr=_numbered(1))
+            + p("Детали", ppr=_numbered(2))
+            + p("Проект", ppr=_numbered(0))
+            + p("Схема", ppr=_numbered(1))
+            + p("Пункт", ppr=_numbered(0, num_id=2))
+            + p("Пункт", ppr=_numbered(0, num_id=2))
+            + p("Без номера")
+            + SECT_PR
+        )
+        with DocumentModel(make_docx(body, parts={"word/numbering.xml": NUMBERING_XML})) as model:
+            table = _paragraph_table(model)
+
+        assert table.labels == ["1", "1.1", "1.1.1.", "2", "2.1", "В)", "Г)", None]
+        assert table.numbering[1] == ("1", 1)
+        assert table.numbering[7] is None
+
+    def test_nums_share_abstract_counters(self, make_docx):
+        numbering = NUMBERING_XML.replace(
+            "</w:numbering>",
+            '<w:num w:numId="5"><w:abstractNumId w:val="3"/></w:num>'
+            '<w:num w:numId="6"><w:abstractNumId w:val="3"/></w:num>'
+            '<w:num w:numId="7"><w:abstractNumId w:val="3"/>'
+            '<w:lvlOverride w:ilvl="0"><w:startOverride w:val="1"/></w:lvlOverride></w:num>'
+            "</w:numbering>",
+        )
+        body = (
+            p("Пункт", ppr=_numbered(0, num_id=5))
+            + p("Пункт", ppr=_numbered(0, num_id=6))
+            + p("Пункт", ppr=_numbered(0, num_id=5))
+            + p("Новый список", ppr=_numbered(0, num_id=7))
+            + p("Пункт", ppr=_numbered(0, num_id=7))
+            + SECT_PR
+        )
+        with DocumentModel(make_docx(body, parts={"word/numbering.xml": numbering})) as model:
+            table = _paragraph_table(model)
+
+        # Copy-pasted items on another numId go on; a startOverride restarts
+        assert table.labels == ["А)", "Б)", "В)", "А)", "Б)"]
+
+    @pytest.mark.parametrize("text, label, expected", [
+        ("Анализ", "2.1", ("2.1", False, True)),
+        ("2.1. Анализ", None, ("2.1", True, False)),
+        ("3 Проект", None, ("3", False, False)),
+        ("Анализ", "А)", None),
+        ("2020 год", None, ("2020", False, False)),
+    ])
+    def test_heading_number(self, text, label, expected):
+        number = heading_number(text, label)
+
+        assert (number and (number.number, number.trailing_dot, number.auto)) == expected
+
+    def test_source_list_uses_labels(self, make_docx):
+        numbering = NUMBERING_XML.replace('<w:lvlText w:val="%1"/>', '<w:lvlText w:val="%1."/>')
+        body = (
+            p("Текст [1, 2].")
+            + p("СПИСОК ИСПОЛЬЗОВАННЫХ ИСТОЧНИКОВ", rpr=BOLD)
+            + p("Иванов И. И. Книга", ppr=_numbered(0, num_id=4))
+            + p("Петров П. П. Статья", ppr=_numbered(0, num_id=4))
+            + SECT_PR
+        )
+        with DocumentModel(make_docx(body, parts={"word/numbering.xml": numbering})) as model:
+            table = _paragraph_table(model)
+
+        index = build_citation_index(table, 1)
+
+        assert index.sources == {1: 2, 2: 3}
+        assert index.dotted_entries == [2, 3]
+
+    def test_heading_issues(self, make_docx, run_checker):
+        body = (
+            p("ВВЕДЕНИЕ", rpr=BOLD)
+            + p("1 Анализ", rpr=BOLD)
+            + p("1.1.1 Детали", rpr=BOLD)
+            + p("2. Проект", rpr=BOLD)
+            + p("3 Схема", ppr='<w:outlineLvl w:val="0"/>')
+            + p("Итоги раздела.", rpr=BOLD)
+            + p("4 Заключение", rpr=BOLD)
+            + SECT_PR
+        )
+        issues = {
+            i.description: (i.expected, i.actual, i.location)
+            for i in run_checker(make_docx(body)).issues if i.category == "headings"
+        }
+
+        assert issues["Нарушена нумерация заголовков (1 шт.)"] == (
+            "1 → 1.1 → 1.1.1; после предыдущего: 1.1 или 2", "1.1.1", "раздел 1.1.1, абзац 3")
+        assert issues["Заголовки не выделены полужирным"][2] == "раздел 3, абзац 5"
+        assert issues["Точка после номера заголовка"][2] == "раздел 2, абзац 4"
+        assert issues["Точка в конце заголовка"][2] == "раздел «Итоги раздела.», абзац 6"
+        assert issues["Разделы, которые не нумеруются, имеют номер"][1:] == ("4 Заключение", "раздел 4, абзац 7")
+
+
+SIZE_12 = '<w:sz w:val="24"/>'
+
+
+def _grid(*rows, rpr: str = SIZE_12, header: bool = False) -> str:
+    """A w:tbl with one single-run paragraph per cell."""
+    tr_pr = "<w:trPr><w:tblHeader/></w:trPr>" if header else ""
+    return "<w:tbl>" + "".join(
+        "<w:tr>" + (tr_pr if index == 0 else "")
+        + "".join(f"<w:tc>{p(cell, rpr=rpr)}</w:tc>" for cell in cells) + "</w:tr>"
+        for index, cells in enumerate(rows)
+    ) + "</w:tbl>"
+
+
+class TestTables:
+    """Runs are tagged with their table and cell; tables are judged apart from body text."""
+
+    def test_walk_context_tracks_cells(self):
+        body = etree.fromstring(
+            f'<w:body xmlns:w="{W[1:-1]}">'
+            + p("до")
+            + _grid(["a", "b"], ["c", "d" + "</w:t></w:r></w:p>" + _grid(["x"]) + '<w:p><w:r><w:t>e'])
+            + _grid(["f"])
+            + "</w:body>"
+        )
+
+        class Positions:
+            def __init__(self):
+                self.seen = []
+
+            def on_run(self, run, ctx):
+                self.seen.append((run.findtext(W + "t"), ctx.table_index, ctx.row_index, ctx.cell_index,
+                                  ctx.table_depth))
+
+        rule = Positions()
+        BodyWalker([rule]).walk(list(body))
+
+        assert rule.seen == [
+            ("до", -1, -1, -1, 0),
+            ("a", 0, 0, 0, 1), ("b", 0, 0, 1, 1), ("c", 0, 1, 0, 1), ("d", 0, 1, 1, 1),
+            ("x", 0, 0, 0, 2), ("e", 0, 1, 1, 1),
+            ("f", 1, 0, 0, 1),
+        ]
+
+    def test_table_index(self, make_docx):
+        body = (
+            p("Таблица 1 – Данные")
+            + _grid(["№ п/п", "имя"], ["1", "2"], ["3", "4"], header=True)
+            + _grid(["a"])
+            + SECT_PR
+        )
+        with DocumentModel(make_docx(body)) as model:
+            builder = ParagraphTableBuilder(StyleResolver.from_model(model))
+            tables = TableIndexBuilder()
+            BodyWalker([builder, tables]).walk(get_body_elements(model))
+
+        first, second = tables.tables
+        assert (first.index, first.first_row, first.last_row, first.rows, first.columns) == (0, 1, 6, 3, 2)
+        assert first.repeat_header and not second.repeat_header
+        assert first.head == [[[1], [2]], [[3], [4]]]
+        assert first.cell_texts(builder.table, 0) == ["№ п/п", "имя"]
+        assert first.numbered_columns_row(builder.table) == 1
+        assert (second.first_row, second.rows, second.numbered_columns_row(builder.table)) == (7, 1, None)
+
+    def test_issues(self, make_docx, run_checker):
+        body = (
+            p("1 Анализ", rpr=BOLD)
+            + p("Данные приведены в таблицах 1 и 2.")
+            + p("Таблица 1 – Данные")
+            + _grid(["№ п/п", "имя"], ["1", "Иванов"])
+            + p("Продолжение таблицы 1")
+            + _grid(["2", "Петров"])
+            + p("Таблица 2 – Итоги")
+            + _grid(["Показатель", "Значение"], ["1", "2"], rpr='<w:sz w:val="28"/>')
+            + SECT_PR
+        )
+        report = run_checker(make_docx(body))
+        issues = {
+            i.description: (i.actual, i.location)
+            for i in report.issues if i.category == "tables"
+        }
+
+        assert issues == {
+            "Кегль текста в таблицах не 12 pt (1 шт.)": ("таблица 3: 14pt", "раздел 1, абзац 12"),
+            "Столбец «№ п/п» в таблице": ("таблиц: 1", "раздел 1, абзац 4"),
+            "Заголовки граф таблицы начинаются со строчной буквы": ("ячеек: 1", "раздел 1, абзац 5"),
+            "В перенесённой таблице графы не пронумерованы": (
+                "1", "раздел 1, абзац 4; раздел 1, абзац 9"),
+        }
+        assert not [i for i in report.issues if i.description == "Много текста с нестандартным размером шрифта"]
+
+
+def _formula(tail: str = "", ppr: str = "", math: str = "E=m") -> str:
+    """A display formula paragraph: m:oMathPara followed by `tail` (e.g. a tab and "(1)")."""
+    tail_xml = "".join(
+        '<w:r><w:tab/></w:r>' if part == "\t" else f'<w:r><w:t xml:space="preserve">{part}</w:t></w:r>'
+        for part in re.split(r"(\t)", tail) if part
+    )
+    ppr_xml = f"<w:pPr>{ppr}</w:pPr>" if ppr else ""
+    return f'<w:p>{ppr_xml}<m:oMathPara><m:oMath><m:r><m:t>{math}</m:t></m:r></m:oMath></m:oMathPara>{tail_xml}</w:p>'
+
+
+RIGHT_TAB = '<w:tabs><w:tab w:val="center" w:pos="4677"/><w:tab w:val="right" w:pos="9355"/></w:tabs>'
+
+
+class TestFormulas:
+    """Formulas are found in the body walk; only their neighbours are read afterwards."""
+
+    def test_index(self, make_docx):
+        body = (
+            p("Энергия равна")  # 0
+            + p("")  # 1
+            + _formula("\t(1)", ppr=RIGHT_TAB)  # 2
+            + p("где E – энергия, Дж.")  # 3
+            + p("Скорость:")  # 4
+            + _formula("\t\t2)", ppr=RIGHT_TAB)  # 5
+            + p("")  # 6
+            + p("v – скорость, м/с.")  # 7
+            + p("Конец примера")  # 8
+            + '<w:p><w:r><w:t xml:space="preserve">Пусть </w:t></w:r><m:oMath><m:r><m:t>x</m:t></m:r></m:oMath>'
+              '<w:r><w:t xml:space="preserve"> мало.</w:t></w:r></w:p>'  # 9
+            + p("")  # 10
+            + _formula("(3), где:")  # 11
+            + p("")  # 12
+            + _formula(math="a=b#(4)")  # 13
+            + p("где: a – …")  # 14
+            + SECT_PR
+        )
+        with DocumentModel(make_docx(body)) as model:
+            resolver = StyleResolver.from_model(model)
+            builder = ParagraphTableBuilder(resolver)
+            collector = FormulaCollector(resolver)
+            BodyWalker([builder, collector]).walk(get_body_elements(model))
+
+        index = build_formula_index(builder.table, collector)
+
+        assert [(f.row, f.number, f.bad_number, f.number_right, f.blank_above, f.blank_below, f.where_row)
+                for f in index.formulas] == [
+            (2, "1", None, True, True, True, 3),
+            (5, None, "2)", True, False, True, None),
+            (11, "3", None, False, True, True, None),
+            (13, "4", None, True, True, True, 14),
+        ]
+        assert (index.where_colon, index.where_missing, index.where_inline) == ([14], [7], [11])
+
+    def test_issues(self, make_docx, run_checker):
+        body = (
+            p("1 Расчёт", rpr=BOLD)
+            + p("Мощность:")
+            + _formula("\t(1)", ppr=RIGHT_TAB)
+            + p("где P – мощность, Вт.")
+            + p("")
+            + _formula("\t(3)", ppr=RIGHT_TAB)
+            + p("Текст сразу после формулы.")
+            + p("")
+            + _formula()
+            + p("")
+            + SECT_PR
+        )
+        issues = {
+            i.description: (i.expected, i.actual, i.location)
+            for i in run_checker(make_docx(body)).issues if i.category == "formulas"
+        }
+
+        assert issues == {
+            "Формулы не отделены от текста пустой строкой": (
+                "Пустая строка сверху и снизу формулы", "формул: 2 из 3", "раздел 1, абзац 3; раздел 1, абзац 6"),
+            "Формулы без номера": (
+                "Номер справа в круглых скобках: (1) или (2.1)", "формул: 1 из 3", "раздел 1, абзац 9"),
+            "Нарушена последовательность номеров формул": ("2", "3", "раздел 1, абзац 6"),
+        }
+
+
+class TestTextLint:
+    """Units, bare signs and colloquialisms are found by one combined regex and one automaton."""
+
+    def test_trie_pattern(self):
+        assert trie_pattern(["кВт", "кГц", "к"]) == "к(?:Вт|Гц)?"
+        assert re.fullmatch(trie_pattern(["м", "мм", "мин", "м/с"]), "м/с")
+
+    @pytest.mark.parametrize("text, expected", [
+        ("Мощность 100кВт, нагрев до 20°С", [("unit_spacing", "100кВт"), ("unit_spacing", "20°С")]),
+        ("Загрузка 80% при 2,5ГГц", [("unit_spacing", "80%"), ("unit_spacing", "2,5ГГц")]),
+        ("Мощность 100 кВт, 80 %, 3 мин, 10 минут, HTML5м", []),
+        ("Скорость > надёжности", [("math_sign", ">")]),
+        ("При x > 0 и n = 10", []),
+        ("Это как бы прикольное решение", [("colloquial", "как бы"), ("colloquial", "прикольное")]),
+        ("Компилятор и компания", []),
+        ("В 2025г, к 03.2025г. и 5т.е. по 2 м", []),
+        ("Длина 5м, масса 3кг", [("unit_spacing", "3кг")]),
+    ])
+    def test_lint(self, text, expected):
+        linter = TextLinter.from_file(checker._text_lint_path())
+
+        assert [(kind, text[start:end]) for kind, start, end in linter.lint(text)] == expected
+
+    def test_large_lists_stay_linear(self):
+        units = [f"ед{i}" for i in range(5000)] + ["кВт"]
+        phrases = [f"оборот{i}" for i in range(5000)] + ["как бы"]
+        text = "Мощность 100кВт и как бы всё. " * 2000
+        small = TextLinter(["кВт"], ["как бы"])
+        large = TextLinter(units, phrases)
+
+        start = time.perf_counter()
+        small_hits = list(small.lint(text))
+        small_time = time.perf_counter() - start
+        start = time.perf_counter()
+        large_hits = list(large.lint(text))
+        large_time = time.perf_counter() - start
+
+        assert large_hits == small_hits and len(large_hits) == 4000
+        assert large_time < small_time * 5 + 0.05
+
+    def test_issues(self, make_docx, run_checker):
+        body = (
+            p("1 Анализ", rpr=BOLD)
+            + p("Сервер потребляет 500Вт, что как бы немного.")
+            + p("Надёжность = качество.")
+            + p("СПИСОК ИСПОЛЬЗОВАННЫХ ИСТОЧНИКОВ", rpr=BOLD)
+            + p("1 Иванов И. И. Книга. – М., 2020. – 100с.")
+            + SECT_PR
+        )
+        issues = {
+            i.description: (i.actual, i.location)
+            for i in run_checker(make_docx(body)).issues if i.category == "text"
+        }
+
+        assert issues == {
+            "Нет пробела между числом и единицей измерения (1 шт.)": (
+                "«500Вт» (раздел 1, абзац 2)", "раздел 1, абзац 2"),
+            "Математические знаки в тексте без числовых значений (1 шт.)": (
+                "«=» (раздел 1, абзац 3)", "раздел 1, абзац 3"),
+            "Разговорные слова и выражения в тексте (1 шт.)": (
+                "«как бы» (раздел 1, абзац 2)", "раздел 1, абзац 2"),
+        }
+
+
+class TestAbbreviations:
+    """Abbreviations of the text and of the abbreviations list are dict lookups."""
+
+    @pytest.mark.parametrize("word, expected", [
+        ("СУБД", True), ("API", True), ("HTML5", True), ("ПрО", True),
+        ("Таблица", False), ("GitHub", False), ("XIV", False), ("А", False),
+    ])
+    def test_token(self, word, expected):
+        assert abbreviation_token(word) is expected
+
+    def test_index(self, make_docx):
+        body = (
+            p("УСЛОВНЫЕ ОБОЗНАЧЕНИЯ И СОКРАЩЕНИЯ", rpr=BOLD)  # 0
+            + p("API – программный интерфейс приложения")  # 1
+            + p("СУБД\tсистема управления базами данных")  # 2
+            + p("ЛВС – локальная вычислительная сеть")  # 3
+            + p("ВВЕДЕНИЕ", rpr=BOLD)  # 4
+            + p("Сервер отдаёт JSON через API, данные хранит СУБД PostgreSQL.")  # 5
+            + p("По ГОСТ 2.105 в XXI веке IT-компании пишут API и ПрО.")  # 6
+            + SECT_PR
+        )
+        with DocumentModel(make_docx(body)) as model:
+            table = _paragraph_table(model)
+
+        index = build_abbreviation_index(table, range(4, 7), range(1, 4), common={"ГОСТ"})
+
+        assert index.declared == {"API": 1, "СУБД": 2, "ЛВС": 3}
+        assert index.used == {"JSON": 5, "API": 5, "СУБД": 5, "ГОСТ": 6, "IT": 6, "ПрО": 6}
+        assert index.undeclared() == [("JSON", 5), ("IT", 6), ("ПрО", 6)]
+        assert index.unused() == [("ЛВС", 3)]
+
+    def test_issues(self, make_docx, run_checker):
+        body = (
+            p("ПОЯСНИТЕЛЬНАЯ ЗАПИСКА К КУРСОВОМУ ПРОЕКТУ")
+            + p("Перечень сокращений", rpr=BOLD)
+            + _grid(["API", "программный интерфейс"], ["ЛВС", "локальная сеть"])
+            + p("Введение", rpr=BOLD)
+            + p("Клиент вызывает API по протоколу HTTP, как требует ГОСТ.")
+            + p("1 Анализ", rpr=BOLD)
+            + p("Для REST используется HTTP.")
+            + SECT_PR
+        )
+        issues = {
+            i.description: (i.actual, i.location)
+            for i in run_checker(make_docx(body)).issues if i.category == "abbreviations"
+        }
+
+        assert issues == {
+            "Сокращения не приведены в перечне «Условные обозначения и сокращения»": (
+                "HTTP (раздел «Введение», абзац 8); REST (раздел 1, абзац 10)",
+                "раздел «Введение», абзац 8; раздел 1, абзац 10"),
+            "В перечне сокращений есть сокращения, которые не используются в тексте": (
+                "ЛВС", "раздел «Перечень сокращений», абзац 5"),
+        }
+
+    def test_title_page_is_skipped(self, make_docx, run_checker):
+        body = (
+            p("УТВЕРЖДАЮ")
+            + p("Ректор МГТУ")
+            + f"<w:p>{PAGE_BREAK}</w:p>"
+            + p("ЗАДАНИЕ")
+            + p("1 Анализ", rpr=BOLD)
+            + p("Для REST используется HTTP.")
+            + SECT_PR
+        )
+        issues = [
+            i.actual for i in run_checker(make_docx(body)).issues if i.category == "abbreviations"
+        ]
+
+        assert issues == ["REST (раздел 1, абзац 6); HTTP (раздел 1, абзац 6)"]
+
+
+class TestAbstract:
+    """The abstract is measured on the rows between its heading and the next one."""
+
+    @staticmethod
+    def _issues(run_checker, make_docx, *paragraphs):
+        body = (
+            p("РЕФЕРАТ", rpr=BOLD) + "".join(p(text) for text in paragraphs)
+            + p("ВВЕДЕНИЕ", rpr=BOLD) + p("Текст.") + SECT_PR
+        )
+        return {
+            i.description: (i.actual, i.location)
+            for i in run_checker(make_docx(body)).issues if i.category == "abstract"
+        }
+
+    @pytest.mark.parametrize("text, expected", [
+        ("Ключевые слова: СУБД, API, веб-сервис.", ["СУБД", "API", "веб-сервис"]),
+        ("БАЗА ДАННЫХ, ВЕБ-ПРИЛОЖЕНИЕ; REST", ["БАЗА ДАННЫХ", "ВЕБ-ПРИЛОЖЕНИЕ", "REST"]),
+        ("Объект исследования, цель, результаты.", None),
+        ("ПОЯСНИТЕЛЬНАЯ ЗАПИСКА", None),
+    ])
+    def test_keyword_line(self, text, expected):
+        assert checker._abstract_keywords(text) == expected
+
+    def test_within_limits(self, run_checker, make_docx):
+        issues = self._issues(
+            run_checker, make_docx,
+            "СУБД, API, ВЕБ-СЕРВИС, REST, БАЗА ДАННЫХ",
+            "Текст реферата. " * 40,
+        )
+
+        assert issues == {}
+
+    def test_limits_are_reported(self, run_checker, make_docx):
+        issues = self._issues(
+            run_checker, make_docx,
+            "Ключевые слова: СУБД, API",
+            "Короткий реферат.",
+        )
+
+        assert issues == {
+            "Объём реферата не соответствует требованиям": ("17 знаков", "раздел «РЕФЕРАТ», абзац 1"),
+            "Число ключевых слов реферата не соответствует требованиям": (
+                "2: СУБД, API", "раздел «РЕФЕРАТ», абзац 2"),
+        }
+
+    def test_missing_keywords(self, run_checker, make_docx):
+        issues = self._issues(run_checker, make_docx, "Текст реферата. " * 40)
+
+        assert list(issues) == ["В реферате не найдены ключевые слова"]
+
+
+def _rendered(text: str, rpr: str = BOLD) -> str:
+    """Paragraph Word put at the top of a page in its last layout."""
+    return (
+        f'<w:p><w:r><w:rPr>{rpr}</w:rPr><w:lastRenderedPageBreak/>'
+        f'<w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+    )
+
+
+class TestToc:
+    """TOC entries are matched with headings by title and number."""
+
+    @staticmethod
+    def _issues(report):
+        return {i.description: i.actual for i in report.issues if i.category == "toc"}
+
+    @pytest.mark.parametrize("text, expected", [
+        ("Введение\t3", (None, "Введение", 3)),
+        ("1.2 Обзор аналогов .......... 17", ("1.2", "Обзор аналогов", 17)),
+        ("2\tПроектирование\t12", ("2", "Проектирование", 12)),
+        ("Приложение А Схема базы данных", (None, "Приложение А Схема базы данных", None)),
+    ])
+    def test_parse_entry(self, text, expected):
+        entry = parse_toc_entry(0, text)
+
+        assert (entry.number, entry.title, entry.page) == expected
+
+    def test_rendered_pages(self, make_docx):
+        body = (
+            p("Титул") + _rendered("Первая") + p("Текст")
+            + '<w:p><w:r><w:t>Начало</w:t><w:lastRenderedPageBreak/><w:t>конец</w:t></w:r></w:p>'
+            + p("Текст") + SECT_PR
+        )
+        with DocumentModel(make_docx(body)) as model:
+            collector = RenderedPageCollector()
+            BodyWalker([collector]).walk(get_body_elements(model))
+
+        assert [collector.page_of(row) for row in range(5)] == [1, 2, 2, 2, 3]
+
+    def test_field_toc(self, make_docx, run_checker):
+        toc = (
+            '<w:p><w:r><w:fldChar w:fldCharType="begin"/></w:r>'
+            '<w:r><w:instrText xml:space="preserve"> TOC \\o "1-2" \\h </w:instrText></w:r>'
+            '<w:r><w:fldChar w:fldCharType="separate"/></w:r>'
+            '<w:r><w:t>Введение\t</w:t></w:r>' + _complex_field("PAGEREF _Toc1 \\h", "2") + "</w:p>"
+            + p("1 Анализ\t4") + p("2 Разработка\t4") + p("Итоги\t6")
+            + '<w:p><w:r><w:fldChar w:fldCharType="end"/></w:r></w:p>'
+        )
+        body = (
+            p("СОДЕРЖАНИЕ", rpr=BOLD) + toc
+            + _rendered("ВВЕДЕНИЕ") + p("Текст.")
+            + _rendered("1 Анализ") + p("1.1 Обзор", rpr=BOLD) + p("1.1.1 Детали", rpr=BOLD)
+            + _rendered("2 Проектирование") + p("Текст.")
+            + _rendered("ЗАКЛЮЧЕНИЕ") + p("Текст.")
+            + SECT_PR
+        )
+
+        assert self._issues(run_checker(make_docx(body))) == {
+            "В оглавлении есть строки без соответствующего заголовка": "«Итоги»",
+            "Названия в оглавлении отличаются от заголовков": "«Разработка» → «2 Проектирование»",
+            "Заголовки отсутствуют в оглавлении": "«1.1 Обзор»; «ЗАКЛЮЧЕНИЕ»",
+            "Номера страниц в оглавлении не совпадают с расположением заголовков": "«Анализ»: 4 вместо 3",
+        }
+
+    def test_typed_toc(self, make_docx, run_checker):
+        body = (
+            p("Содержание", rpr=BOLD)
+            + p("Введение .......... 3") + p("1 Анализ\t4") + p("Приложение А Схема данных\t9")
+            + p("ВВЕДЕНИЕ", rpr=BOLD) + p("Текст.")
+            + p("1 АНАЛИЗ", rpr=BOLD) + p("Текст.")
+            + p("ПРИЛОЖЕНИЕ А", rpr=BOLD) + p("(обязательное)") + p("Схема данных", rpr=BOLD)
+            + SECT_PR
+        )
+
+        assert self._issues(run_checker(make_docx(body))) == {}
+
+    def test_empty_field(self, make_docx, run_checker):
+        toc = '<w:p>' + _complex_field("TOC \\o \"1-3\"", "Элементы оглавления не найдены.") + "</w:p>"
+        body = p("Оглавление", rpr=BOLD) + toc + p("ВВЕДЕНИЕ", rpr=BOLD) + SECT_PR
+
+        issues = self._issues(run_checker(make_docx(body)))
+
+        assert list(issues) == ["В оглавлении есть строки без соответствующего заголовка",
+                                "Заголовки отсутствуют в оглавлении"]
+
+
+PAGE_BREAK = '<w:r><w:br w:type="page"/></w:r>'
+
+
+class TestAppendices:
+    """Appendices are judged from a page-break index and their first references."""
+
+    def test_page_starts(self, make_docx):
+        body = (
+            p("Титул")  # 0
+            + f"<w:p>{PAGE_BREAK}</w:p>"  # 1: empty paragraph with a break
+            + p("Первая")  # 2
+            + '<w:p><w:r><w:t>Текст</w:t><w:br w:type="page"/></w:r></w:p>'  # 3
+            + p("Вторая")  # 4
+            + p("Третья", ppr="<w:pageBreakBefore/>")  # 5
+            + '<w:p><w:r><w:t>До</w:t><w:br w:type="page"/><w:t>после</w:t></w:r></w:p>'  # 6
+            + p("", ppr='<w:sectPr><w:type w:val="nextPage"/></w:sectPr>')  # 7
+            + p("Без разрыва")  # 8: w:type of a section tells how that section starts
+            + p("", ppr='<w:sectPr><w:type w:val="continuous"/></w:sectPr>')  # 9
+            + p("Четвёртая")  # 10
+            + SECT_PR
+        )
+        with DocumentModel(make_docx(body)) as model:
+            resolver = StyleResolver.from_model(model)
+            breaks, sections = PageBreakCollector(resolver), SectionIndexBuilder()
+            BodyWalker([breaks, sections]).walk(get_body_elements(model))
+
+        assert breaks.page_starts(sections.sections) == [1, 2, 4, 5, 10]
+
+    def test_index(self, make_docx):
+        body = (
+            p("Схема приведена в приложении Б, таблицы — в приложениях А и В–Д.")  # 0
+            + p("См. прил. Ж; Приложение Альфа не ссылка.")  # 1
+            + p("ПРИЛОЖЕНИЕ А", rpr=BOLD)  # 2
+            + p("(обязательное)")  # 3
+            + f"<w:p>{PAGE_BREAK}</w:p>"  # 4
+            + p("")  # 5
+            + p("Приложение Б", rpr=BOLD)  # 6
+            + p("Текст")  # 7
+            + p("ПРИЛОЖЕНИЕ З", rpr=BOLD)  # 8
+            + SECT_PR
+        )
+        with DocumentModel(make_docx(body)) as model:
+            table = _paragraph_table(model)
+
+        index = build_appendix_index(table, [4])
+
+        assert [(a.row, a.letter, a.new_page, a.upper_case) for a in index.appendices] == [
+            (2, "А", False, True), (6, "Б", True, False), (8, "З", False, True),
+        ]
+        assert index.first_references == {"Б": 0, "А": 0, "В": 0, "Г": 0, "Д": 0, "Ж": 1}
+        assert [(a.letter, letter) for a, letter in index.letter_errors()] == [("З", "В")]
+        assert index.reference_order() == (["Б", "А"], ["А", "Б"])
+        assert [letter for letter, _ in index.dangling()] == ["В", "Г", "Д", "Ж"]
+
+    def test_issues(self, make_docx, run_checker):
+        body = (
+            p("ВВЕДЕНИЕ", rpr=BOLD)
+            + p("Код программы приведён в приложении Б, схема — в приложении А.")
+            + p("ПРИЛОЖЕНИЕ А", ppr="<w:pageBreakBefore/>", rpr=BOLD) + p("Схема", rpr=BOLD)
+            + p("ПРИЛОЖЕНИЕ Б", rpr=BOLD) + p("Код", rpr=BOLD)
+            + f"<w:p>{PAGE_BREAK}</w:p>"
+            + p("ПРИЛОЖЕНИЕ Г", rpr=BOLD) + p("Макеты", rpr=BOLD)
+            + SECT_PR
+        )
+        issues = {
+            i.description: (i.actual, i.location)
+            for i in run_checker(make_docx(body)).issues if i.category == "appendices"
+        }
+
+        assert issues == {
+            "Нарушена последовательность обозначений приложений": (
+                "«Г» вместо «В»", "раздел «ПРИЛОЖЕНИЕ Г», абзац 8"),
+            "Приложение начинается не с новой страницы": ("Б", "раздел «ПРИЛОЖЕНИЕ Б», абзац 5"),
+            "На приложения нет ссылок в тексте": ("Г", "раздел «ПРИЛОЖЕНИЕ Г», абзац 8"),
+            "Приложения расположены не в порядке первых ссылок на них": (
+                "А → Б", "раздел «ПРИЛОЖЕНИЕ А», абзац 3; раздел «ПРИЛОЖЕНИЕ Б», абзац 5"),
+        }
+
+    def test_assignment_table_is_not_a_reference(self, make_docx, run_checker):
+        body = (
+            p("ЗАДАНИЕ", rpr=BOLD)
+            + _grid(["Приложение А Текст программы"], ["Приложение Б Графический материал"])
+            + p("ВВЕДЕНИЕ", rpr=BOLD)
+            + p("Текст без приложений.")
+            + SECT_PR
+        )
+        issues = [i for i in run_checker(make_docx(body)).issues if i.category == "appendices"]
+
+        assert issues == []
+
+    def test_heading_layouts(self, make_docx, run_checker):
+        line_breaks = (
+            '<w:p><w:pPr><w:pageBreakBefore/></w:pPr><w:r><w:rPr><w:b/></w:rPr>'
+            '<w:t>ПРИЛОЖЕНИЕ А</w:t><w:br/><w:t>(обязательное)</w:t><w:br/><w:t>Схема данных</w:t></w:r></w:p>'
+        )
+        body = (
+            p("ВВЕДЕНИЕ", rpr=BOLD)
+            + p("Схема — в приложении А, код — в приложении Б, макеты — в приложении В.")
+            + p("Приложение А содержит схему данных.")
+            + line_breaks
+            + p("ПРИЛОЖЕНИЕ Б", ppr="<w:pageBreakBefore/>", rpr=BOLD)
+            + p("ПРИЛОЖЕНИЕ В Макеты интерфейса", ppr="<w:pageBreakBefore/>")
+            + SECT_PR
+        )
+        issues = [i for i in run_checker(make_docx(body)).issues if i.category == "appendices"]
+
+        assert issues == []
@@ -8,6 +8,7 @@ import pytest
 from pathlib import Path
 from docx import Document
 from tests.helpers.ooxml_utils import (
+    DocumentModel,
     get_document_xml,
     get_page_margins,
     get_page_size,
@@ -21,8 +22,9 @@ from tests.helpers.ooxml_utils import (
     half_points_to_pt,
     find_paragraph_index,
     get_paragraph_text_preview,
-    NS,
+    get_body_elements,
 )
+from tests.helpers.rules import BodyWalker
 
 
 def test_all_documents_normocontrol(any_docx, normocontrol_report):
@@ -33,7 +35,9 @@ def test_all_documents_normocontrol(any_docx, normocontrol_report):
     doc_name = any_docx.name
     normocontrol_report.add_document(doc_name)
     
-    doc_xml = get_document_xml(any_docx)
+    # One archive open/parse shared by the OOXML checks
+    with DocumentModel(any_docx) as model:
+        doc_xml = get_document_xml(model)
     doc = Document(any_docx)
     
     # Check page margins
@@ -42,14 +46,8 @@ def test_all_documents_normocontrol(any_docx, normocontrol_report):
     # Check page size
     _check_page_size(any_docx, doc_xml, normocontrol_report)
     
-    # Check paragraph formatting
-    _check_paragraph_indents(any_docx, doc_xml, normocontrol_report)
-    _check_line_spacing(any_docx, doc_xml, normocontrol_report)
-    _check_alignment(any_docx, doc_xml, normocontrol_report)
-    
-    # Check fonts
-    _check_fonts(any_docx, doc_xml, normocontrol_report)
-    _check_font_sizes(any_docx, doc_xml, normocontrol_report)
+    # Check paragraph formatting and fonts (single traversal)
+    _check_body_formatting(any_docx, doc_xml, normocontrol_report)
     
     # Check structure
     _check_document_structure(any_docx, doc, normocontrol_report)
@@ -137,63 +135,63 @@ def _check_page_size(docx_path, doc_xml, report):
         )
 
 
-def _check_paragraph_indents(docx_path, doc_xml, report):
-    """Check first-line indents."""
-    doc_name = docx_path.name
-    paragraphs = doc_xml.xpath(".//w:p", namespaces=NS)
-    
-    indent_125 = cm_to_twips(1.25)
-    indent_150 = cm_to_twips(1.5)
-    tolerance = cm_to_twips(0.1)
-    
-    invalid_indents = []
-    problem_locations = []
-    
-    for idx, p in enumerate(paragraphs):
+class _IndentRule:
+    """First-line indents (body rule)."""
+
+    def __init__(self):
+        self.indent_125 = cm_to_twips(1.25)
+        self.indent_150 = cm_to_twips(1.5)
+        self.tolerance = cm_to_twips(0.1)
+        self.invalid_indents = []
+        self.problem_locations = []
+
+    def on_paragraph(self, p, ctx):
         props = get_paragraph_properties(p)
         if 'ind' in props and props['ind'].get('firstLine'):
             try:
                 first_line = float(props['ind']['firstLine'])
                 first_line = int(round(first_line))
                 
-                diff_125 = abs(first_line - indent_125)
-                diff_150 = abs(first_line - indent_150)
+                diff_125 = abs(first_line - self.indent_125)
+                diff_150 = abs(first_line - self.indent_150)
                 
-                if diff_125 > tolerance and diff_150 > tolerance:
+                if diff_125 > self.tolerance and diff_150 > self.tolerance:
                     actual_cm = twips_to_cm(first_line)
-                    if len(invalid_indents) < 10:  # Limit collected examples
-                        invalid_indents.append(f"{actual_cm:.2f} см")
+                    if len(self.invalid_indents) < 10:  # Limit collected examples
+                        self.invalid_indents.append(f"{actual_cm:.2f} см")
                         # Get paragraph preview for location
                         preview = get_paragraph_text_preview(p, 40)
-                        problem_locations.append(f"Параграф {idx + 1}: '{preview}'")
+                        self.problem_locations.append(f"Параграф {ctx.paragraph_index + 1}: '{preview}'")
             except (ValueError, TypeError):
                 pass
-    
-    if invalid_indents:
-        location = "; ".join(problem_locations[:3])  # Show first 3 locations
-        if len(problem_locations) > 3:
-            location += f" (и ещё {len(problem_locations) - 3})"
-        
-        report.add_issue(
-            doc_name, "indents", "warning",
-            f"Найдены некорректные отступы первой строки ({len(invalid_indents)} шт.)",
-            expected="1.25 см или 1.5 см",
-            actual=", ".join(invalid_indents[:5]),
-            location=location
-        )
 
+    def add_issues(self, doc_name, report):
+        if self.invalid_indents:
+            location = "; ".join(self.problem_locations[:3])  # Show first 3 locations
+            if len(self.problem_locations) > 3:
+                location += f" (и ещё {len(self.problem_locations) - 3})"
+            
+            report.add_issue(
+                doc_name, "indents", "warning",
+                f"Найдены некорректные отступы первой строки ({len(self.invalid_indents)} шт.)",
+                expected="1.25 см или 1.5 см",
+                actual=", ".join(self.invalid_indents[:5]),
+                location=location
+            )
 
-def _check_line_spacing(docx_path, doc_xml, report):
-    """Check line spacing."""
-    doc_name = docx_path.name
-    paragraphs = doc_xml.xpath(".//w:p[w:pPr/w:spacing]", namespaces=NS)
-    
-    invalid_count = 0
-    first_problem_para = None
-    
-    for idx, p in enumerate(paragraphs):
+
+class _LineSpacingRule:
+    """Line spacing (body rule)."""
+
+    def __init__(self):
+        self.paragraphs_with_spacing = 0
+        self.invalid_count = 0
+        self.first_problem_para = None
+
+    def on_paragraph(self, p, ctx):
         props = get_paragraph_properties(p)
         if 'spacing' in props:
+            self.paragraphs_with_spacing += 1
             spacing = props['spacing']
             line = spacing.get('line')
             line_rule = spacing.get('lineRule')
@@ -202,106 +200,121 @@ def _check_line_spacing(docx_path, doc_xml, report):
                 try:
                     line_val = int(line)
                     if not (340 <= line_val <= 380):
-                        invalid_count += 1
-                        if first_problem_para is None:
-                            first_problem_para = idx + 1
+                        self.invalid_count += 1
+                        if self.first_problem_para is None:
+                            self.first_problem_para = self.paragraphs_with_spacing
                 except (ValueError, TypeError):
                     pass
-    
-    if len(paragraphs) > 0:
-        ratio = invalid_count / len(paragraphs)
-        if ratio > 0.8:
-            location = f"Начиная с параграфа {first_problem_para}" if first_problem_para else "Весь документ"
-            report.add_issue(
-                doc_name, "spacing", "warning",
-                f"Много параграфов с некорректным интервалом",
-                expected="1.5 (полуторный)",
-                actual=f"{invalid_count} из {len(paragraphs)} параграфов",
-                location=location
-            )
 
+    def add_issues(self, doc_name, report):
+        if self.paragraphs_with_spacing > 0:
+            ratio = self.invalid_count / self.paragraphs_with_spacing
+            if ratio > 0.8:
+                location = (
+                    f"Начиная с параграфа {self.first_problem_para}"
+                    if self.first_problem_para else "Весь документ"
+                )
+                report.add_issue(
+                    doc_name, "spacing", "warning",
+                    f"Много параграфов с некорректным интервалом",
+                    expected="1.5 (полуторный)",
+                    actual=f"{self.invalid_count} из {self.paragraphs_with_spacing} параграфов",
+                    location=location
+                )
 
-def _check_alignment(docx_path, doc_xml, report):
-    """Check text alignment."""
-    doc_name = docx_path.name
-    paragraphs = doc_xml.xpath(".//w:p", namespaces=NS)
-    
-    justified_count = 0
-    total_with_alignment = 0
-    
-    for p in paragraphs:
+
+class _AlignmentRule:
+    """Text alignment (body rule)."""
+
+    def __init__(self):
+        self.justified_count = 0
+        self.total_with_alignment = 0
+
+    def on_paragraph(self, p, ctx):
         props = get_paragraph_properties(p)
         if 'jc' in props:
-            total_with_alignment += 1
+            self.total_with_alignment += 1
             if props['jc'] == 'both':
-                justified_count += 1
-    
-    if total_with_alignment > 0:
-        ratio = justified_count / total_with_alignment
-        if ratio < 0.5:
-            report.add_issue(
-                doc_name, "alignment", "warning",
-                "Недостаточно параграфов с выравниванием по ширине",
-                expected="Большинство параграфов по ширине",
-                actual=f"{justified_count} из {total_with_alignment} ({ratio*100:.0f}%)"
-            )
+                self.justified_count += 1
 
+    def add_issues(self, doc_name, report):
+        if self.total_with_alignment > 0:
+            ratio = self.justified_count / self.total_with_alignment
+            if ratio < 0.5:
+                report.add_issue(
+                    doc_name, "alignment", "warning",
+                    "Недостаточно параграфов с выравниванием по ширине",
+                    expected="Большинство параграфов по ширине",
+                    actual=f"{self.justified_count} из {self.total_with_alignment} ({ratio*100:.0f}%)"
+                )
 
-def _check_fonts(docx_path, doc_xml, report):
-    """Check font usage."""
-    doc_name = docx_path.name
-    runs = doc_xml.xpath(".//w:r", namespaces=NS)
-    
-    fonts_used = set()
-    
-    for run in runs[:100]:
+
+class _FontRule:
+    """Font usage in the first 100 runs (body rule)."""
+
+    def __init__(self):
+        self.fonts_used = set()
+
+    def on_run(self, run, ctx):
+        if ctx.run_index >= 100:
+            return
         props = get_run_properties(run)
         if 'rFonts' in props:
             r_fonts = props['rFonts']
             for font_type in ['ascii', 'hAnsi', 'cs']:
                 font_name = r_fonts.get(font_type)
                 if font_name:
-                    fonts_used.add(font_name)
-    
-    if fonts_used and 'Times New Roman' not in fonts_used:
-        report.add_issue(
-            doc_name, "fonts", "info",
-            "Times New Roman не найден среди явно заданных шрифтов",
-            expected="Times New Roman",
-            actual=", ".join(sorted(fonts_used)[:3])
-        )
+                    self.fonts_used.add(font_name)
 
-
-def _check_font_sizes(docx_path, doc_xml, report):
-    """Check font sizes."""
-    doc_name = docx_path.name
-    runs = doc_xml.xpath(".//w:r[w:rPr/w:sz]", namespaces=NS)
-    
-    size_14pt = pt_to_half_points(14)
-    size_12pt = pt_to_half_points(12)
-    
-    sizes = []
-    
-    for run in runs:
-        props = get_run_properties(run)
-        if 'sz' in props:
-            sizes.append(props['sz'])
-    
-    if sizes:
-        count_14 = sizes.count(size_14pt)
-        count_12 = sizes.count(size_12pt)
-        total = len(sizes)
-        standard_ratio = (count_14 + count_12) / total
-        
-        if standard_ratio < 0.2:
+    def add_issues(self, doc_name, report):
+        if self.fonts_used and 'Times New Roman' not in self.fonts_used:
             report.add_issue(
                 doc_name, "fonts", "info",
-                "Нестандартные размеры шрифта",
-                expected="14pt (основной) или 12pt (таблицы)",
-                actual=f"14pt={count_14}, 12pt={count_12}, другие={total-count_14-count_12}"
+                "Times New Roman не найден среди явно заданных шрифтов",
+                expected="Times New Roman",
+                actual=", ".join(sorted(self.fonts_used)[:3])
             )
 
 
+class _FontSizeRule:
+    """Font sizes (body rule)."""
+
+    def __init__(self):
+        self.size_14pt = pt_to_half_points(14)
+        self.size_12pt = pt_to_half_points(12)
+        self.sizes = []
+
+    def on_run(self, run, ctx):
+        props = get_run_properties(run)
+        if 'sz' in props:
+            self.sizes.append(props['sz'])
+
+    def add_issues(self, doc_name, report):
+        sizes = self.sizes
+        if sizes:
+            count_14 = sizes.count(self.size_14pt)
+            count_12 = sizes.count(self.size_12pt)
+            total = len(sizes)
+            standard_ratio = (count_14 + count_12) / total
+            
+            if standard_ratio < 0.2:
+                report.add_issue(
+                    doc_name, "fonts", "info",
+                    "Нестандартные размеры шрифта",
+                    expected="14pt (основной) или 12pt (таблицы)",
+                    actual=f"14pt={count_14}, 12pt={count_12}, другие={total-count_14-count_12}"
+                )
+
+
+def _check_body_formatting(docx_path, doc_xml, report):
+    """Check indents, spacing, alignment and fonts in one pass over the body."""
+    doc_name = docx_path.name
+    rules = [_IndentRule(), _LineSpacingRule(), _AlignmentRule(), _FontRule(), _FontSizeRule()]
+    BodyWalker(rules).walk(get_body_elements(doc_xml))
+    for rule in rules:
+        rule.add_issues(doc_name, report)
+
+
 def _check_document_structure(docx_path, doc, report):
     """Check document structure."""
     doc_name = docx_path.name